@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_db
+from app.models.models import User, UserRole
+from app.api.deps import get_current_user
+from app.services.analytics import event_analytics, organizer_analytics
+from app.services.checkin import event_organizer
+
+router = APIRouter()
+
+# Sales dashboards, read from the rollup tables (app/services/analytics.py)
+
+@router.get("/events/{event_id}")
+async def get_event_analytics(
+    event_id: int,
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    organizer_id = await event_organizer(db, event_id)
+    if organizer_id is None:
+        raise HTTPException(404, "Event not found")
+    if organizer_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(403, "Not authorized to view this event's analytics")
+
+    return await event_analytics(db, event_id, granularity)
+
+@router.get("/organizer")
+async def get_organizer_analytics(
+    organizer_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Organizers see their own events; admins may ask for any organizer
+    if organizer_id is None:
+        organizer_id = current_user.id
+    if current_user.role not in [UserRole.ORGANIZER, UserRole.ADMIN]:
+        raise HTTPException(403, "Only organizers have sales analytics")
+    if organizer_id != current_user.id and current_user.role != UserRole.ADMIN:
+        raise HTTPException(403, "Not authorized to view this organizer's analytics")
+
+    return await organizer_analytics(db, organizer_id)
@@ -1,36 +1,49 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import hash_password, verify_and_update_password, create_access_token
 from app.schemas.schemas import UserCreate, UserLogin, UserResponse, Token
 from app.models.models import User
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == user_data.email).first():
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).filter(User.email == user_data.email))
+    if result.scalars().first():
         raise HTTPException(400, "Email already registered")
     
     user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await hash_password(user_data.password),
         full_name=user_data.full_name,
         phone=user_data.phone,
         role=user_data.role
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.password_hash):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(User).filter(User.email == user_data.email))
+    user = result.scalars().first()
+    if not user:
         raise HTTPException(401, "Incorrect email or password")
     
+    verified, new_hash = await verify_and_update_password(user_data.password, user.password_hash)
+    if not verified:
+        raise HTTPException(401, "Incorrect email or password")
+    
+    # Transparently upgrade hashes made with a different bcrypt cost
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+    
     access_token = create_access_token(data={"sub": str(user.id)})
     return {
         "access_token": access_token,
@@ -39,8 +52,18 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     }
 
 # Import the get_current_user function
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, security
+from app.services.principal_cache import get_claims, revoke_token
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+    return current_user
+
+@router.post("/logout")
+async def logout(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    claims = await get_claims(credentials.credentials)
+    if not claims:
+        raise HTTPException(401, "Invalid token")
+    
+    await revoke_token(credentials.credentials, claims)
+    return {"message": "Logged out successfully"}
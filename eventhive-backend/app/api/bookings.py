@@ -1,118 +1,530 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, insert, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+import json
+from typing import List, Optional, Tuple
 from app.core.database import get_db
-from app.schemas.schemas import BookingCreate, BookingResponse
+from app.schemas.schemas import BookingCreate, BookingResponse, BookingPage, OrderCreate, CheckInBatch, TicketVerify, HoldConfirm
 from app.models.models import Booking, Event, TicketType, User
 from app.api.deps import get_current_user
-from app.services.qr_service import generate_booking_id, generate_qr_code
+from app.api.pagination import MAX_PAGE_SIZE, keyset_filter, next_cursor
+from app.api.serialization import BOOKING_COLUMNS, booking_items, page_body
+from app.services.qr_service import (
+    generate_booking_id, generate_order_id, get_qr_image, verify_qr_payload, QR_MEDIA_TYPES, ACTIVE_KID
+)
+from app.services.analytics import record_check_ins, record_sales
+from app.services.availability import publish_availability
+from app.services.export import EXPORT_MEDIA_TYPES, export_csv, export_ndjson
+from app.services.holds import HELD, confirm_hold, hold_expiry, hold_statuses, payment_verified, release_hold
+from app.services.idempotency import run_idempotent
+from app.services.inventory import reserve_tickets
+from app.services.promo import apply_discount, find_promo, redeem_promo
+from app.services.checkin import (
+    MANIFEST_FIELDS, UNSTAMPED, current_version, format_version, parse_version, manifest_rows,
+    next_checkin_seq, stamp_bookings, check_in_bookings, event_organizer, mark_checked_in, sync_gate_state,
+    checked_in_bits, revoked_bits
+)
+from app.services.response_cache import invalidate_event
+from app.services.waiting_room import check_admission_token, waiting_room_rate
 
 router = APIRouter()
 
-@router.post("/", response_model=dict)
-async def create_booking(
-    booking_data: BookingCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+# Upper bound on line items in one order
+MAX_ORDER_ITEMS = 20
+
+async def place_order(
+    db: AsyncSession,
+    current_user: User,
+    event_id: int,
+    items: List[Tuple[int, int]],
+    attendee: dict,
+    order_id: Optional[str] = None,
+    admission_token: Optional[str] = None,
+    promo_code: Optional[str] = None
 ):
+    # Books every (ticket_type_id, quantity) line in one transaction: one ticket
+    # type query, one conditional UPDATE per line, one bulk INSERT, one commit.
+    # Either every line is reserved or none is, and a promo code is redeemed
+    # (one use per order) in the same transaction.
+    # Events with a waiting room only take bookings from admitted buyers; the
+    # token is checked before any inventory work.
+    if await waiting_room_rate(db, event_id) and not check_admission_token(admission_token, event_id, current_user.id):
+        raise HTTPException(403, "Admission token required")
+    
+    quantities = {}
+    for ticket_type_id, quantity in items:
+        if quantity < 1:
+            raise HTTPException(400, "Quantity must be at least 1")
+        quantities[ticket_type_id] = quantities.get(ticket_type_id, 0) + quantity
+    
     # Validate event
-    event = db.query(Event).filter(Event.id == booking_data.event_id).first()
+    event = await db.get(Event, event_id)
     if not event or event.status != "published":
         raise HTTPException(400, "Event not available")
     
-    # Validate ticket type
-    ticket_type = db.query(TicketType).filter(
+    # Validate ticket types
+    result = await db.execute(select(TicketType).filter(
         and_(
-            TicketType.id == booking_data.ticket_type_id,
-            TicketType.event_id == booking_data.event_id,
+            TicketType.id.in_(quantities),
+            TicketType.event_id == event_id,
             TicketType.is_active == True
         )
-    ).first()
+    ))
+    ticket_types = {ticket_type.id: ticket_type for ticket_type in result.scalars()}
     
-    if not ticket_type:
+    if len(ticket_types) != len(quantities):
         raise HTTPException(400, "Ticket type not found")
     
-    # Check availability
-    available = ticket_type.max_quantity - ticket_type.sold_quantity
-    if booking_data.quantity > available:
-        raise HTTPException(400, f"Only {available} tickets available")
-    
-    # Calculate total
-    total_amount = float(ticket_type.price) * booking_data.quantity
-    
-    # Create booking
-    booking_id = generate_booking_id()
-    qr_code = generate_qr_code(booking_id, booking_data.event_id)
-    
-    booking = Booking(
-        booking_id=booking_id,
-        user_id=current_user.id,
-        event_id=booking_data.event_id,
-        ticket_type_id=booking_data.ticket_type_id,
-        quantity=booking_data.quantity,
-        total_amount=total_amount,
-        attendee_name=booking_data.attendee_name,
-        attendee_email=booking_data.attendee_email,
-        attendee_phone=booking_data.attendee_phone,
-        qr_code=qr_code,
-        payment_status="paid"  # For demo purposes
-    )
+    # Unknown and expired codes are rejected from the cache, before any writes
+    promo = None
+    if promo_code:
+        promo = await find_promo(db, promo_code, event_id)
+        if not promo:
+            raise HTTPException(400, "Invalid promo code")
+    
+    # Reserve inventory atomically in the database; a fixed row order keeps
+    # concurrent multi-line orders from deadlocking each other
+    remaining = {}
+    for ticket_type_id in sorted(quantities):
+        remaining[ticket_type_id] = await reserve_tickets(db, ticket_type_id, event_id, quantities[ticket_type_id])
+        if remaining[ticket_type_id] is None:
+            await db.rollback()
+            ticket_type = ticket_types[ticket_type_id]
+            await db.refresh(ticket_type)
+            available = max(ticket_type.max_quantity - ticket_type.sold_quantity, 0)
+            if len(quantities) == 1:
+                raise HTTPException(400, f"Only {available} tickets available")
+            raise HTTPException(400, f"Only {available} {ticket_type.name} tickets available")
     
-    db.add(booking)
-    ticket_type.sold_quantity += booking_data.quantity
-    db.commit()
+    amounts = {
+        ticket_type_id: ticket_types[ticket_type_id].price * quantity
+        for ticket_type_id, quantity in quantities.items()
+    }
+    full_price = sum(amounts.values())
+    if promo:
+        if not await redeem_promo(db, promo, event_id):
+            await db.rollback()
+            raise HTTPException(400, "Promo code is no longer available")
+        amounts = apply_discount(promo, amounts)
     
+    # With seat holds on, the tickets stay taken while the buyer pays and the
+    # sale is recorded when the hold is confirmed (app/services/holds.py)
+    expires_at = hold_expiry()
+    bookings = [
+        {
+            "booking_id": generate_booking_id(),
+            "order_id": order_id,
+            "user_id": current_user.id,
+            "event_id": event_id,
+            "ticket_type_id": ticket_type_id,
+            "quantity": quantity,
+            "total_amount": float(amounts[ticket_type_id]),
+            "payment_status": "pending" if expires_at else "paid",  # Paid right away for demo purposes
+            "booking_status": HELD if expires_at else "confirmed",
+            "hold_expires_at": expires_at,
+            # One use per order, so recorded on its first line only
+            "promo_code_id": promo.id if promo and index == 0 else None,
+            # Stamped for check-in manifests once committed, off the ticket type locks
+            "checkin_version": UNSTAMPED,
+            **attendee
+        }
+        for index, (ticket_type_id, quantity) in enumerate(quantities.items())
+    ]
+    await db.execute(insert(Booking), bookings)
+    await db.commit()
+    if not expires_at:
+        record_sales(event_id, {
+            ticket_type_id: (quantity, amounts[ticket_type_id]) for ticket_type_id, quantity in quantities.items()
+        })
+    await stamp_bookings(db, event_id, Booking.booking_id.in_([booking["booking_id"] for booking in bookings]))
+    await invalidate_event(event_id)
+    await publish_availability(event_id, remaining)
+    return event, bookings, float(full_price - sum(amounts.values()))
+
+def _hold_fields(booking: dict) -> dict:
+    # A held booking is confirmed with POST /holds/{hold_id}/confirm, where the
+    # hold id is the order id for orders and the booking id otherwise
+    expires_at = booking["hold_expires_at"]
     return {
-        "booking_id": booking_id,
-        "total_amount": total_amount,
-        "qr_code": qr_code,
-        "event_title": event.title,
-        "message": "Booking created successfully"
+        "status": booking["booking_status"],
+        "hold_id": (booking["order_id"] or booking["booking_id"]) if expires_at else None,
+        "hold_expires_at": expires_at.isoformat() if expires_at else None,
     }
 
-@router.get("/my-bookings", response_model=List[BookingResponse])
+@router.post("/", response_model=dict)
+async def create_booking(
+    booking_data: BookingCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    admission_token: Optional[str] = Header(None, alias="X-Admission-Token"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    async def book():
+        event, bookings, discount = await place_order(
+            db, current_user, booking_data.event_id,
+            [(booking_data.ticket_type_id, booking_data.quantity)],
+            booking_data.model_dump(include={"attendee_name", "attendee_email", "attendee_phone"}),
+            admission_token=admission_token, promo_code=booking_data.promo_code
+        )
+        booking = bookings[0]
+        
+        return {
+            "booking_id": booking["booking_id"],
+            "total_amount": booking["total_amount"],
+            "discount_amount": discount,
+            "qr_url": f"/api/bookings/{booking['booking_id']}/qr",
+            "event_title": event.title,
+            **_hold_fields(booking),
+            "message": "Booking created successfully"
+        }
+    
+    # A retry with the same Idempotency-Key gets the first booking back
+    return await run_idempotent(idempotency_key, current_user.id, "booking",
+                                booking_data.model_dump(mode="json"), book)
+
+@router.post("/orders", response_model=dict)
+async def create_order(
+    order_data: OrderCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    admission_token: Optional[str] = Header(None, alias="X-Admission-Token"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    if not order_data.items:
+        raise HTTPException(400, "Order has no items")
+    if len(order_data.items) > MAX_ORDER_ITEMS:
+        raise HTTPException(400, f"An order can have at most {MAX_ORDER_ITEMS} items")
+    
+    async def order():
+        order_id = generate_order_id()
+        event, bookings, discount = await place_order(
+            db, current_user, order_data.event_id,
+            [(item.ticket_type_id, item.quantity) for item in order_data.items],
+            order_data.model_dump(include={"attendee_name", "attendee_email", "attendee_phone"}),
+            order_id=order_id, admission_token=admission_token, promo_code=order_data.promo_code
+        )
+        
+        return {
+            "order_id": order_id,
+            "total_amount": sum(booking["total_amount"] for booking in bookings),
+            "discount_amount": discount,
+            "event_title": event.title,
+            "bookings": [
+                {
+                    "booking_id": booking["booking_id"],
+                    "ticket_type_id": booking["ticket_type_id"],
+                    "quantity": booking["quantity"],
+                    "total_amount": booking["total_amount"],
+                    "qr_url": f"/api/bookings/{booking['booking_id']}/qr"
+                }
+                for booking in bookings
+            ],
+            **_hold_fields(bookings[0]),
+            "message": "Order created successfully"
+        }
+    
+    return await run_idempotent(idempotency_key, current_user.id, "order",
+                                order_data.model_dump(mode="json"), order)
+
+@router.post("/holds/{hold_id}/confirm")
+async def confirm_booking_hold(
+    hold_id: str,
+    payment: Optional[HoldConfirm] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    payment = payment or HoldConfirm()
+    if not payment_verified(hold_id, payment.payment_id, payment.payment_signature):
+        raise HTTPException(400, "Payment could not be verified")
+    
+    booking_ids = await confirm_hold(db, hold_id, current_user.id)
+    if booking_ids is None:
+        statuses = await hold_statuses(db, hold_id, current_user.id)
+        if not statuses:
+            raise HTTPException(404, "Hold not found")
+        # Retried confirmation of a hold that already went through
+        if not all(status in ("confirmed", "checked_in") for status in statuses):
+            raise HTTPException(409, "Hold has expired or was released")
+    return {"hold_id": hold_id, "status": "confirmed", "message": "Booking confirmed"}
+
+@router.post("/holds/{hold_id}/release")
+async def release_booking_hold(
+    hold_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # The buyer gives up before paying; the tickets go back on sale right away
+    if not await release_hold(db, hold_id, current_user.id):
+        if not await hold_statuses(db, hold_id, current_user.id):
+            raise HTTPException(404, "Hold not found")
+        raise HTTPException(409, "Hold is no longer active")
+    return {"hold_id": hold_id, "status": "cancelled", "message": "Hold released"}
+
+@router.get("/my-bookings", response_model=BookingPage)
 async def get_my_bookings(
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(Booking).filter(
-        Booking.user_id == current_user.id
-    ).order_by(Booking.created_at.desc()).all()
+    # Response columns only; the QR blob stays in the database
+    query = select(*BOOKING_COLUMNS).filter(Booking.user_id == current_user.id)
+    if cursor:
+        query = query.filter(keyset_filter((Booking.created_at, Booking.id), cursor, db.get_bind().dialect.name))
+    
+    result = await db.execute(query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1))
+    rows = result.all()
+    body = page_body(BookingPage, booking_items(rows[:limit]),
+                     next_cursor(rows, limit, lambda b: b.created_at, lambda b: b.id))
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(
     booking_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    booking = db.query(Booking).filter(
+    result = await db.execute(select(Booking).filter(
         and_(
             Booking.booking_id == booking_id,
             Booking.user_id == current_user.id
         )
-    ).first()
+    ))
+    booking = result.scalars().first()
     
     if not booking:
         raise HTTPException(404, "Booking not found")
     
     return booking
 
+@router.get("/{booking_id}/qr")
+async def get_booking_qr(
+    booking_id: str,
+    request: Request,
+    format: str = Query("png", pattern="^(png|svg)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    result = await db.execute(select(
+        Booking.id, Booking.event_id, Booking.user_id, Booking.booking_status, Event.organizer_id
+    ).join(Event, Booking.event_id == Event.id).filter(Booking.booking_id == booking_id))
+    row = result.first()
+    
+    if not row or (
+        row.user_id != current_user.id
+        and row.organizer_id != current_user.id
+        and current_user.role != "admin"
+    ):
+        raise HTTPException(404, "Booking not found")
+    
+    # No ticket for a hold until it is paid for, or for a released one
+    if row.booking_status == HELD:
+        raise HTTPException(409, "Booking is awaiting payment")
+    if row.booking_status not in ("confirmed", "checked_in"):
+        raise HTTPException(409, f"Booking is {row.booking_status}")
+    
+    # The QR payload only changes when the signing key rotates, so clients may
+    # cache it forever under an ETag that names the key
+    etag = f'"{booking_id}-{row.event_id}-{ACTIVE_KID}-{format}"'
+    headers = {"Cache-Control": "private, max-age=31536000, immutable", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    
+    image = await get_qr_image(row.id, booking_id, row.event_id, format)
+    return Response(content=image, media_type=QR_MEDIA_TYPES[format], headers=headers)
+
+# Upper bound on scans applied by one batch check-in
+MAX_CHECKIN_BATCH = 5000
+# Keeps IN lists under SQLite's bound-parameter limit
+IN_CHUNK = 900
+
+def _chunks(values: list, size: int = IN_CHUNK):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+async def _require_event_staff(db: AsyncSession, event_id: int, current_user: User):
+    organizer_id = await event_organizer(db, event_id)
+    if organizer_id is None:
+        raise HTTPException(404, "Event not found")
+    if organizer_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(403, "Not authorized to check in for this event")
+
+@router.post("/verify")
+async def verify_ticket(
+    data: TicketVerify,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Signature, event match and this worker's checked-in/revoked bitmaps; no
+    # per-ticket database lookup. Does not check the attendee in.
+    await _require_event_staff(db, data.event_id, current_user)
+    claims = verify_qr_payload(data.payload)
+    if claims is None:
+        return {"valid": False, "status": "invalid_signature"}
+    if claims.event_id != data.event_id:
+        return {"valid": False, "status": "wrong_event", "booking_id": claims.booking_id}
+    
+    # Anything not confirmed (held, released, cancelled) is in revoked_bits
+    await sync_gate_state(db, data.event_id)
+    if claims.booking_pk in revoked_bits:
+        status = "revoked"
+    elif claims.booking_pk in checked_in_bits:
+        status = "already_checked_in"
+    else:
+        status = "valid"
+    return {"valid": status == "valid", "status": status, "booking_id": claims.booking_id}
+
+@router.get("/check-in/manifest/{event_id}")
+async def get_checkin_manifest(
+    event_id: int,
+    request: Request,
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Compact attendee list for gate scanners. Pass the last version as ?since=
+    # for only what changed, or send If-None-Match to skip an unchanged download.
+    await _require_event_staff(db, event_id, current_user)
+    
+    seq = await current_version(db, event_id)
+    version = format_version(seq)
+    etag = f'"manifest-{event_id}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag or since == version:
+        return Response(status_code=304, headers=headers)
+    
+    since_version = None
+    if since:
+        since_version = parse_version(since)
+        if since_version is None:
+            raise HTTPException(400, "Invalid manifest version")
+        if since_version > seq:
+            since_version = None  # not a version we issued; send everything
+    
+    rows = await manifest_rows(db, event_id, since_version)
+    result = await db.execute(select(TicketType.id, TicketType.name).filter(TicketType.event_id == event_id))
+    body = {
+        "event_id": event_id,
+        "version": version,
+        "full": since_version is None,
+        "fields": MANIFEST_FIELDS,
+        "ticket_types": {str(ticket_id): name for ticket_id, name in result},
+        "bookings": rows
+    }
+    return Response(json.dumps(body, separators=(",", ":")), media_type="application/json", headers=headers)
+
+@router.get("/export/{event_id}")
+async def export_attendees(
+    event_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Attendee list for venue security, streamed (see app/services/export.py)
+    organizer_id = await event_organizer(db, event_id)
+    if organizer_id is None:
+        raise HTTPException(404, "Event not found")
+    if organizer_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(403, "Not authorized to export attendees for this event")
+    
+    result = await db.execute(select(TicketType.id, TicketType.name).filter(TicketType.event_id == event_id))
+    ticket_types = dict(result.all())
+    # The export streams on its own session; give this one's connection back
+    # rather than holding it until the download finishes
+    await db.close()
+    
+    stream = export_csv if format == "csv" else export_ndjson
+    return StreamingResponse(
+        stream(event_id, ticket_types),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="event-{event_id}-attendees.{format}"'}
+    )
+
+@router.post("/check-in/batch")
+async def batch_check_in(
+    batch: CheckInBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Applies queued scans from a gate device in one transaction and reports
+    # each one: checked_in, already_checked_in, duplicate (repeated in this
+    # batch), not_found, wrong_event, or the booking status that blocked it
+    if len(batch.booking_ids) > MAX_CHECKIN_BATCH:
+        raise HTTPException(400, f"A batch can have at most {MAX_CHECKIN_BATCH} scans")
+    await _require_event_staff(db, batch.event_id, current_user)
+    
+    unique_ids = list(dict.fromkeys(batch.booking_ids))
+    found = {}
+    for chunk in _chunks(unique_ids):
+        result = await db.execute(select(
+            Booking.id, Booking.booking_id, Booking.event_id, Booking.booking_status
+        ).filter(Booking.booking_id.in_(chunk)))
+        found.update({row.booking_id: row for row in result})
+    
+    pending = [row.id for row in found.values()
+               if row.event_id == batch.event_id and row.booking_status == "confirmed"]
+    checked_in = {}
+    seq = None
+    if pending:
+        seq = await next_checkin_seq(db, batch.event_id)
+        for chunk in _chunks(pending):
+            checked_in.update(await check_in_bookings(db, batch.event_id, chunk, seq))
+        await record_check_ins(db, batch.event_id, checked_in)
+    await db.commit()
+    mark_checked_in(checked_in)
+    
+    results = []
+    seen = set()
+    for booking_id in batch.booking_ids:
+        row = found.get(booking_id)
+        if booking_id in seen:
+            status = "duplicate"
+        elif row is None:
+            status = "not_found"
+        elif row.event_id != batch.event_id:
+            status = "wrong_event"
+        elif row.id in checked_in:
+            status = "checked_in"
+        elif row.booking_status in ("confirmed", "checked_in"):
+            status = "already_checked_in"
+        else:
+            status = row.booking_status
+        seen.add(booking_id)
+        results.append({"booking_id": booking_id, "status": status})
+    
+    summary = {}
+    for item in results:
+        summary[item["status"]] = summary.get(item["status"], 0) + 1
+    return {"event_id": batch.event_id, "checkin_seq": seq, "summary": summary, "results": results}
+
 @router.post("/check-in/{booking_id}")
 async def check_in_attendee(
     booking_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    booking = db.query(Booking).filter(Booking.booking_id == booking_id).first()
-    if not booking:
+    result = await db.execute(select(Booking.id, Booking.event_id, Booking.booking_status, Event.organizer_id).join(
+        Event, Booking.event_id == Event.id
+    ).filter(Booking.booking_id == booking_id))
+    row = result.first()
+    if not row:
         raise HTTPException(404, "Booking not found")
     
     # Check if current user is organizer of the event
-    if booking.event.organizer_id != current_user.id and current_user.role != "admin":
+    if row.organizer_id != current_user.id and current_user.role != "admin":
         raise HTTPException(403, "Not authorized to check in for this event")
     
-    booking.booking_status = "checked_in"
-    db.commit()
+    if row.booking_status not in ("confirmed", "checked_in"):
+        raise HTTPException(400, f"Booking is {row.booking_status}")
+    
+    seq = await next_checkin_seq(db, row.event_id)
+    checked_in = await check_in_bookings(db, row.event_id, [row.id], seq)
+    if not checked_in:
+        await db.rollback()
+        return {"message": "Attendee already checked in"}
+    await record_check_ins(db, row.event_id, checked_in)
+    await db.commit()
+    mark_checked_in([row.id])
     
-    return {"message": "Attendee checked in successfully"}
\ No newline at end of file
+    return {"message": "Attendee checked in successfully"}
@@ -1,17 +1,18 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import decode_token
 from app.models.models import User
+from app.services.principal_cache import get_claims, get_user
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    payload = decode_token(credentials.credentials)
+# Token-only authentication for hot endpoints that need the caller's id but
+# not their user row (no database round trip)
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> int:
+    payload = await get_claims(credentials.credentials)
     if not payload:
         raise HTTPException(401, "Invalid token")
     
@@ -19,7 +20,13 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(401, "Invalid token payload")
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    return int(user_id)
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    user = await get_user(db, user_id)
     if not user:
         raise HTTPException(401, "User not found")
     
@@ -1,120 +1,376 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select, and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
 from typing import List, Optional
+import csv
+import json
 from datetime import datetime
-from app.core.database import get_db
-from app.schemas.schemas import EventCreate, EventResponse, CategoryResponse
-from app.models.models import Event, Category, TicketType, User, UserRole, EventStatus
-from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.database import get_db, get_async_session_local
+from app.schemas.schemas import EventCreate, EventResponse, EventPage, CategoryResponse, WaitingRoomConfig, PromoCodeCreate
+from app.models.models import Event, Category, TicketType, User, UserRole, EventStatus, PromoCode
+from app.api.deps import get_current_user, get_current_user_id
+from app.api.pagination import MAX_PAGE_SIZE, keyset_filter, next_cursor
+from app.api.serialization import EVENT_COLUMNS, event_items, page_body
+from app.services.response_cache import event_cache, invalidate_event, dump_json
+from app.services.availability import availability_stream
+from app.services.event_import import import_events, parse_csv, parse_json
+from app.services.promo import invalidate_promo_codes, normalize_code
+from app.services.search import search_subquery
+from app.services.waiting_room import forget_config, join_queue, queue_stats, waiting_room_rate
 
 router = APIRouter()
 
 @router.get("/categories", response_model=List[CategoryResponse])
-async def get_categories(db: Session = Depends(get_db)):
-    return db.query(Category).filter(Category.is_active == True).all()
+async def get_categories(db: AsyncSession = Depends(get_db)):
+    key = event_cache.make_key("categories", {})
+    body = await event_cache.get(key)
+    if body is None:
+        result = await db.execute(select(Category).filter(Category.is_active == True))
+        body = dump_json(List[CategoryResponse], result.scalars().all())
+        await event_cache.set(key, body, tags=["categories"])
+    return Response(content=body, media_type="application/json")
 
 @router.post("/", response_model=EventResponse)
 async def create_event(
     event_data: EventCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.ORGANIZER, UserRole.ADMIN]:
         raise HTTPException(403, "Only organizers can create events")
-    
+
     event = Event(
         **event_data.dict(exclude={'tickets'}),
         organizer_id=current_user.id
     )
-    
+
     db.add(event)
-    db.flush()
-    
-    for ticket_data in event_data.tickets:
-        ticket = TicketType(**ticket_data.dict(), event_id=event.id)
-        db.add(ticket)
-    
-    db.commit()
-    db.refresh(event)
-    return event
+    await db.flush()
+
+    # One executemany rather than an INSERT ... RETURNING per ticket type
+    if event_data.tickets:
+        await db.execute(insert(TicketType), [
+            {**ticket_data.dict(), "event_id": event.id} for ticket_data in event_data.tickets
+        ])
+
+    await db.commit()
+    await invalidate_event(event.id, listed=event.status == EventStatus.PUBLISHED)
 
-@router.get("/", response_model=List[EventResponse])
+    result = await db.execute(
+        select(Event).options(selectinload(Event.tickets)).filter(Event.id == event.id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().one()
+
+# Bulk create from a JSON list of events (same shape as POST /) or CSV
+# (Content-Type: text/csv, layout in app/services/event_import.py). Invalid rows
+# are reported per row; the valid ones are still created.
+@router.post("/import")
+async def bulk_import_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.ORGANIZER, UserRole.ADMIN]:
+        raise HTTPException(403, "Only organizers can create events")
+
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("text/csv"):
+            rows = parse_csv(body.decode("utf-8-sig"))
+        else:
+            rows = parse_json(json.loads(body))
+    except (UnicodeDecodeError, csv.Error, ValueError) as e:
+        raise HTTPException(400, f"Invalid import file: {e}")
+    if not rows:
+        raise HTTPException(400, "No events to import")
+    if len(rows) > settings.IMPORT_MAX_EVENTS:
+        raise HTTPException(400, f"Too many events (max {settings.IMPORT_MAX_EVENTS} per import)")
+
+    return await import_events(db, current_user.id, rows)
+
+@router.get("/", response_model=EventPage)
 async def get_events(
     category: Optional[str] = None,
     location: Optional[str] = None,
     featured: Optional[bool] = None,
     search: Optional[str] = None,
-    limit: int = Query(20, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
 ):
-    query = db.query(Event).options(joinedload(Event.tickets)).filter(
-        Event.status == EventStatus.PUBLISHED
-    )
-    
+    key = event_cache.make_key("list", {
+        "category": category, "location": location, "featured": featured, "search": search,
+        "cursor": cursor, "limit": limit
+    }, text=("category", "location", "search"))
+    body = await event_cache.get(key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    query = select(*EVENT_COLUMNS, Event.created_at).filter(Event.status == EventStatus.PUBLISHED)
+
     if category:
-        query = query.join(Category).filter(Category.name.ilike(f"%{category}%"))
-    if location:
-        query = query.filter(Event.location.ilike(f"%{location}%"))
+        # Resolved to ids first (categories is small) so the listing walks the
+        # (status, category_id, created_at) index instead of every published event
+        category_ids = (await db.execute(
+            select(Category.id).filter(Category.name.ilike(f"%{category}%"))
+        )).scalars().all()
+        query = query.filter(Event.category_id.in_(category_ids))
     if featured is not None:
         query = query.filter(Event.featured == featured)
-    if search:
-        query = query.filter(or_(
-            Event.title.ilike(f"%{search}%"),
-            Event.description.ilike(f"%{search}%")
-        ))
-    
-    return query.order_by(Event.created_at.desc()).limit(limit).all()
 
-@router.get("/featured", response_model=List[EventResponse])
+    # Full-text search (FTS5 / tsvector) ranked by relevance, then newest first
+    keyset = [Event.created_at, Event.id]
+    matches = await search_subquery(db, search=search, location=location)
+    if matches is not None:
+        query = query.join(matches, matches.c.id == Event.id).add_columns(matches.c.rank)
+        keyset.insert(0, matches.c.rank)
+    else:
+        if location:
+            query = query.filter(Event.location.ilike(f"%{location}%"))
+        if search:
+            query = query.filter(or_(
+                Event.title.ilike(f"%{search}%"),
+                Event.description.ilike(f"%{search}%")
+            ))
+
+    if cursor:
+        query = query.filter(keyset_filter(tuple(keyset), cursor, db.get_bind().dialect.name))
+
+    result = await db.execute(query.order_by(*[column.desc() for column in keyset]).limit(limit + 1))
+    rows = result.all()
+    events = await event_items(db, rows[:limit])
+    cursor_keys = [lambda row: row.created_at, lambda row: row.id]
+    if matches is not None:
+        cursor_keys.insert(0, lambda row: row.rank)
+    body = page_body(EventPage, events, next_cursor(rows, limit, *cursor_keys))
+    await event_cache.set(key, body, tags=["events:list"] + [f"event:{e.id}" for e in events])
+    return Response(content=body, media_type="application/json")
+
+@router.get("/featured", response_model=EventPage)
 async def get_featured_events(
-    limit: int = Query(10, le=50),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db)
 ):
-    return db.query(Event).options(joinedload(Event.tickets)).filter(
+    key = event_cache.make_key("featured", {"cursor": cursor, "limit": limit})
+    body = await event_cache.get(key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+
+    query = select(*EVENT_COLUMNS, Event.created_at).filter(
         and_(Event.status == EventStatus.PUBLISHED, Event.featured == True)
-    ).order_by(Event.created_at.desc()).limit(limit).all()
+    )
+    if cursor:
+        query = query.filter(keyset_filter((Event.created_at, Event.id), cursor, db.get_bind().dialect.name))
+
+    result = await db.execute(query.order_by(Event.created_at.desc(), Event.id.desc()).limit(limit + 1))
+    rows = result.all()
+    events = await event_items(db, rows[:limit])
+    body = page_body(EventPage, events, next_cursor(rows, limit, lambda e: e.created_at, lambda e: e.id))
+    await event_cache.set(key, body, tags=["events:list"] + [f"event:{e.id}" for e in events])
+    return Response(content=body, media_type="application/json")
 
-@router.get("/my-events", response_model=List[EventResponse])
+@router.get("/my-events", response_model=EventPage)
 async def get_my_events(
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(Event).options(joinedload(Event.tickets)).filter(
-        Event.organizer_id == current_user.id
-    ).order_by(Event.created_at.desc()).all()
+    query = select(*EVENT_COLUMNS, Event.created_at).filter(Event.organizer_id == current_user.id)
+    if cursor:
+        query = query.filter(keyset_filter((Event.created_at, Event.id), cursor, db.get_bind().dialect.name))
+
+    result = await db.execute(query.order_by(Event.created_at.desc(), Event.id.desc()).limit(limit + 1))
+    rows = result.all()
+    events = await event_items(db, rows[:limit])
+    body = page_body(EventPage, events, next_cursor(rows, limit, lambda e: e.created_at, lambda e: e.id))
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
-    event = db.query(Event).options(joinedload(Event.tickets)).filter(
-        Event.id == event_id
-    ).first()
-    
+async def get_event(event_id: int, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(Event).options(joinedload(Event.tickets)).filter(
+            Event.id == event_id
+        )
+    )
+    event = result.unique().scalars().first()
+
     if not event:
         raise HTTPException(404, "Event not found")
-    
+
     return event
 
+# Live availability as Server-Sent Events: a snapshot of tickets left per
+# ticket type, then updates as bookings land. The event check uses a session of
+# its own; a request-scoped one would stay open for the life of the stream.
+@router.get("/{event_id}/availability")
+async def stream_availability(event_id: int):
+    async with get_async_session_local()() as db:
+        result = await db.execute(select(Event.id).filter(
+            and_(Event.id == event_id, Event.status == EventStatus.PUBLISHED)
+        ))
+        if result.scalar() is None:
+            raise HTTPException(404, "Event not found")
+
+    return StreamingResponse(
+        availability_stream(event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.put("/{event_id}/publish")
 async def publish_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    event = db.query(Event).filter(
-        and_(Event.id == event_id, Event.organizer_id == current_user.id)
-    ).first()
-    
+    result = await db.execute(
+        select(Event).filter(
+            and_(Event.id == event_id, Event.organizer_id == current_user.id)
+        )
+    )
+    event = result.scalars().first()
+
     if not event:
         raise HTTPException(404, "Event not found or not authorized")
-    
+
     event.status = EventStatus.PUBLISHED
-    db.commit()
+    await db.commit()
+    await invalidate_event(event.id, listed=True)
     return {"message": "Event published successfully"}
-async def get_my_events(
-    db: Session = Depends(get_db),
+
+async def _owned_event(db: AsyncSession, event_id: int, user: User) -> Event:
+    result = await db.execute(
+        select(Event).filter(
+            and_(Event.id == event_id, Event.organizer_id == user.id)
+        )
+    )
+    event = result.scalars().first()
+
+    if not event:
+        raise HTTPException(404, "Event not found or not authorized")
+    return event
+
+@router.put("/{event_id}/waiting-room")
+async def configure_waiting_room(
+    config: WaitingRoomConfig,
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    return db.query(Event).options(joinedload(Event.tickets)).filter(
-        Event.organizer_id == current_user.id
-    ).order_by(Event.created_at.desc()).all()
\ No newline at end of file
+    if config.enabled and not 1 <= (config.admit_rate or 0) <= settings.WAITING_ROOM_MAX_RATE:
+        raise HTTPException(400, f"admit_rate must be between 1 and {settings.WAITING_ROOM_MAX_RATE}")
+
+    event = await _owned_event(db, event_id, current_user)
+    event.waiting_room_rate = config.admit_rate if config.enabled else None
+    await db.commit()
+    forget_config(event.id)
+    await invalidate_event(event.id, listed=event.status == EventStatus.PUBLISHED)
+    return {"enabled": config.enabled, "admit_rate": event.waiting_room_rate}
+
+# Join the waiting room, or poll for a place in it. Returns an admission token
+# for the booking endpoints (X-Admission-Token) once the buyer is admitted.
+@router.post("/{event_id}/queue")
+async def join_waiting_room(
+    event_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    rate = await waiting_room_rate(db, event_id)
+    if rate is None:
+        raise HTTPException(404, "Event has no waiting room")
+
+    status = await join_queue(event_id, user_id, rate)
+    if not status["admitted"]:
+        response.headers["Retry-After"] = str(status["retry_after"])
+    return status
+
+@router.get("/{event_id}/queue/stats")
+async def get_waiting_room_stats(event_id: int, db: AsyncSession = Depends(get_db)):
+    rate = await waiting_room_rate(db, event_id)
+    if rate is None:
+        raise HTTPException(404, "Event has no waiting room")
+    return await queue_stats(event_id, rate)
+
+def _promo_dict(promo: PromoCode) -> dict:
+    return {
+        "code": promo.code,
+        "discount_percent": promo.discount_percent,
+        "discount_amount": float(promo.discount_amount or 0),
+        "max_uses": promo.max_uses,
+        "used_count": promo.used_count,
+        "valid_until": promo.valid_until,
+        "is_active": promo.is_active
+    }
+
+@router.post("/{event_id}/promo-codes")
+async def create_promo_code(
+    promo_data: PromoCodeCreate,
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if (promo_data.discount_percent > 0) == (promo_data.discount_amount > 0):
+        raise HTTPException(400, "Set either discount_percent or discount_amount")
+    if promo_data.discount_percent > 100 or promo_data.discount_percent < 0 or promo_data.discount_amount < 0:
+        raise HTTPException(400, "Invalid discount")
+    if promo_data.max_uses < 1:
+        raise HTTPException(400, "max_uses must be at least 1")
+
+    await _owned_event(db, event_id, current_user)
+    promo = PromoCode(
+        event_id=event_id,
+        code=normalize_code(promo_data.code),
+        discount_percent=promo_data.discount_percent,
+        discount_amount=promo_data.discount_amount,
+        max_uses=promo_data.max_uses,
+        used_count=0,
+        valid_until=promo_data.valid_until,
+        is_active=True
+    )
+    db.add(promo)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(400, "Promo code already exists")
+    invalidate_promo_codes(event_id)
+    return _promo_dict(promo)
+
+@router.get("/{event_id}/promo-codes")
+async def get_promo_codes(
+    event_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await _owned_event(db, event_id, current_user)
+    result = await db.execute(select(PromoCode).filter(PromoCode.event_id == event_id).order_by(PromoCode.id))
+    return [_promo_dict(promo) for promo in result.scalars()]
+
+@router.delete("/{event_id}/promo-codes/{code}")
+async def deactivate_promo_code(
+    event_id: int,
+    code: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await _owned_event(db, event_id, current_user)
+    result = await db.execute(select(PromoCode).filter(
+        and_(PromoCode.code == normalize_code(code), PromoCode.event_id == event_id)
+    ))
+    promo = result.scalars().first()
+
+    if not promo:
+        raise HTTPException(404, "Promo code not found")
+
+    promo.is_active = False
+    await db.commit()
+    invalidate_promo_codes(event_id)
+    return {"message": "Promo code deactivated"}
@@ -1,57 +1,74 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from sqlalchemy import text
+import asyncio
 import os
-import redis
-from app.core.database import Base, engine
+from app.core.database import get_async_engine, dispose_engines
 from app.core.config import settings
-from app.api import auth, events, bookings
+from app.core.metrics import registry
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.core.redis import connect_redis, close_redis
+from app.core.security import PasswordHasherBusy, shutdown_hash_pool
+from app.api import auth, events, bookings, analytics
+from app.services.analytics import flush_sales, run_sales_flusher
+from app.services.availability import shutdown_availability
+from app.services.holds import run_hold_sweeper
+from app.services.qr_service import shutdown_qr_pool
+from app.services.response_cache import event_cache
 
-# Redis connection for Railway
-def get_redis_client():
+async def probe_dependencies(app: FastAPI):
+    # Connect Redis and check the database without holding up startup; until
+    # Redis answers, the caches run in memory
+    timeout = settings.STARTUP_PROBE_TIMEOUT_SECONDS
     try:
-        if settings.REDIS_URL:
-            redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-            # Test connection
-            redis_client.ping()
-            print("Redis connection successful!")
-            return redis_client
+        app.state.redis = await asyncio.wait_for(connect_redis(), timeout)
+    except asyncio.TimeoutError:
+        print(f"Redis did not answer within {timeout}s, continuing without Redis cache...")
+    try:
+        async def ping_database():
+            async with get_async_engine().connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        await asyncio.wait_for(ping_database(), timeout)
+        print("Database connection successful!")
     except Exception as e:
-        print(f"Redis connection failed: {e}")
-        print("Continuing without Redis cache...")
-        return None
+        print(f"Database probe failed: {e!r}")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables
-    try:
-        print("Creating database tables...")
-        Base.metadata.create_all(bind=engine)
-        print("Database tables created successfully!")
-        
-        # Test Redis connection
-        redis_client = get_redis_client()
-        app.state.redis = redis_client
-        
-        # Create seed data
-        from seed import create_seed_data
-        create_seed_data()
-        
-    except Exception as e:
-        print(f"Startup error: {e}")
-        print("Continuing without some services...")
+    # Migrations and seed data are applied once per deploy by
+    # `python manage.py migrate` / `python manage.py seed`, not per worker
+    probes = asyncio.create_task(probe_dependencies(app))
+    # Releases lapsed seat holds (app/services/holds.py)
+    sweeper = asyncio.create_task(run_hold_sweeper())
+    # Folds this worker's sales into the analytics rollups (app/services/analytics.py)
+    flusher = asyncio.create_task(run_sales_flusher())
     
     yield
     
     # Cleanup
-    if hasattr(app.state, 'redis') and app.state.redis:
-        app.state.redis.close()
+    probes.cancel()
+    sweeper.cancel()
+    flusher.cancel()
+    try:
+        await flush_sales()
+    except Exception as e:
+        print(f"Sales rollup flush failed: {e!r}")
+    await shutdown_availability()
+    await close_redis()
+    shutdown_qr_pool()
+    shutdown_hash_pool()
+    await dispose_engines()
 
 app = FastAPI(
     title="EventHive API",
     description="Complete Event Management Platform",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every route that returns plain data; list routes write
+    # pre-serialized bodies (app/api/serialization.py)
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration for Railway deployment
@@ -63,10 +80,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, SQL and Redis time on /metrics (app/core/request_metrics.py)
+app.add_middleware(RequestMetricsMiddleware)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(events.router, prefix="/api/events", tags=["Events"])
 app.include_router(bookings.router, prefix="/api/bookings", tags=["Bookings"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
 
 @app.get("/")
 async def root():
@@ -82,16 +111,14 @@ async def health():
     health_status = {
         "status": "healthy",
         "database": "unknown",
-        "redis": "unknown"
+        "redis": "unknown",
+        "cache": event_cache.stats()
     }
     
     # Check database
     try:
-        from app.core.database import SessionLocal
-        from sqlalchemy import text
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
         health_status["database"] = "connected"
     except Exception as e:
         health_status["database"] = f"error: {str(e)}"
@@ -99,7 +126,7 @@ async def health():
     # Check Redis
     if hasattr(app.state, 'redis') and app.state.redis:
         try:
-            app.state.redis.ping()
+            await app.state.redis.ping()
             health_status["redis"] = "connected"
         except Exception as e:
             health_status["redis"] = f"error: {str(e)}"
@@ -108,9 +135,14 @@ async def health():
     
     return health_status
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Per-worker numbers in the Prometheus text format
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     # Use Railway's PORT environment variable
     port = settings.PORT
-    uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=False)
+    uvicorn.run("app.api.main:app", host="0.0.0.0", port=port, reload=False)
     
\ No newline at end of file
@@ -0,0 +1,48 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import String, literal, tuple_
+
+# Hard cap on any page, regardless of what the client asks for
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(*values: Any) -> str:
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError
+        return values
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+def _timestamp(value: str, dialect: str):
+    try:
+        created_at = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(400, "Invalid cursor")
+    if dialect == "sqlite":
+        # SQLite stores timestamps as text; compare against the same layout the
+        # row was written with so ties on created_at fall through to the id.
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if created_at.microsecond else "%Y-%m-%d %H:%M:%S"
+        return literal(created_at.strftime(fmt), String)
+    return created_at
+
+def keyset_filter(columns: Tuple, cursor: str, dialect: str):
+    # Rows strictly after the cursor for an ORDER BY (..., created_at DESC, id DESC).
+    # The last two columns are always created_at and id; any leading column
+    # (e.g. a search rank) is compared as-is.
+    values = decode_cursor(cursor, len(columns))
+    values[-2] = _timestamp(values[-2], dialect)
+    return tuple_(*columns) < tuple_(*values)
+
+def next_cursor(rows: list, limit: int, *key_getters) -> Optional[str]:
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(*[getter(last) for getter in key_getters])
@@ -0,0 +1,47 @@
+from typing import Any, Dict, List, Type
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Booking, Event, TicketType
+from app.schemas.schemas import BookingResponse, EventResponse, TicketTypeResponse
+from app.services.response_cache import dump_constructed
+
+# Fast path for list endpoints. Validating ORM objects attribute by attribute
+# (from_attributes) costs more CPU than the query itself, so list routes select
+# just the response fields as plain rows, build the response models with
+# model_construct (our own rows need no re-validation) and write JSON with the
+# compiled pydantic serializer. The output is byte-for-byte what the
+# validating path produces.
+
+def _fields(schema: Type[BaseModel]) -> List[str]:
+    return [name for name in schema.model_fields if name != "tickets"]
+
+EVENT_COLUMNS = [getattr(Event, name) for name in _fields(EventResponse)]
+TICKET_COLUMNS = [getattr(TicketType, name) for name in _fields(TicketTypeResponse)]
+BOOKING_COLUMNS = [getattr(Booking, name) for name in _fields(BookingResponse)]
+
+_TICKET_FIELDS = _fields(TicketTypeResponse)
+_EVENT_FIELDS = _fields(EventResponse)
+_BOOKING_FIELDS = _fields(BookingResponse)
+
+def construct(schema: Type[BaseModel], row: Any, names: List[str], **extra) -> BaseModel:
+    mapping = row._mapping
+    return schema.model_construct(**{name: mapping[name] for name in names}, **extra)
+
+async def event_items(db: AsyncSession, rows: list) -> List[EventResponse]:
+    # rows: selected with EVENT_COLUMNS; tickets come from one IN query, as
+    # selectinload would issue
+    tickets: Dict[int, list] = {row.id: [] for row in rows}
+    if tickets:
+        result = await db.execute(
+            select(TicketType.event_id, *TICKET_COLUMNS).filter(TicketType.event_id.in_(list(tickets)))
+        )
+        for ticket in result:
+            tickets[ticket.event_id].append(construct(TicketTypeResponse, ticket, _TICKET_FIELDS))
+    return [construct(EventResponse, row, _EVENT_FIELDS, tickets=tickets[row.id]) for row in rows]
+
+def booking_items(rows: list) -> List[BookingResponse]:
+    return [construct(BookingResponse, row, _BOOKING_FIELDS) for row in rows]
+
+def page_body(page_type: Type[BaseModel], items: list, next_cursor) -> bytes:
+    return dump_constructed(page_type, page_type.model_construct(items=items, next_cursor=next_cursor))
@@ -10,6 +10,15 @@ class Settings(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-jwt-key-make-it-very-long-and-random")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
     
+    # Password hashing
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_QUEUE_LIMIT: int = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+    
+    # Principal cache (decoded tokens and users for get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    
     # Optional
     RAZORPAY_KEY_ID: str = os.getenv("RAZORPAY_KEY_ID", "")
     RAZORPAY_KEY_SECRET: str = os.getenv("RAZORPAY_KEY_SECRET", "")
@@ -18,6 +27,80 @@ class Settings(BaseSettings):
     SMTP_USER: str = os.getenv("SMTP_USER", "")
     SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
     
+    # Response cache for public event listings
+    EVENT_CACHE_SIZE: int = int(os.getenv("EVENT_CACHE_SIZE", "2048"))
+    EVENT_CACHE_TTL_SECONDS: int = int(os.getenv("EVENT_CACHE_TTL_SECONDS", "300"))
+    
+    # QR code rendering
+    QR_CACHE_SIZE: int = int(os.getenv("QR_CACHE_SIZE", "1024"))
+    QR_REDIS_TTL_SECONDS: int = int(os.getenv("QR_REDIS_TTL_SECONDS", "2592000"))
+    QR_RENDER_WORKERS: int = int(os.getenv("QR_RENDER_WORKERS", "2"))
+    # "kid:secret,kid:secret" - the first key signs, all of them verify (rotation).
+    # Empty derives a single key from SECRET_KEY.
+    QR_SIGNING_KEYS: str = os.getenv("QR_SIGNING_KEYS", "")
+    # How stale a worker's checked-in/revoked view of an event may get for /verify
+    QR_VERIFY_REFRESH_SECONDS: float = float(os.getenv("QR_VERIFY_REFRESH_SECONDS", "2"))
+    
+    # Database connection pool (per worker process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "300"))
+    # Behind PgBouncer in transaction mode: no app-side pool, no prepared statement caches
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    # Development only: use a local SQLite file when the configured database is unreachable
+    DB_ALLOW_SQLITE_FALLBACK: bool = os.getenv("DB_ALLOW_SQLITE_FALLBACK", "false").lower() == "true"
+    
+    # Startup dependency probes (run in the background, never block startup)
+    STARTUP_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("STARTUP_PROBE_TIMEOUT_SECONDS", "5"))
+    
+    # Waiting room for flash sales (enabled per event by its organizer)
+    WAITING_ROOM_TOKEN_TTL_SECONDS: int = int(os.getenv("WAITING_ROOM_TOKEN_TTL_SECONDS", "300"))
+    WAITING_ROOM_TTL_SECONDS: int = int(os.getenv("WAITING_ROOM_TTL_SECONDS", "86400"))
+    WAITING_ROOM_MAX_RATE: int = int(os.getenv("WAITING_ROOM_MAX_RATE", "1000"))
+    
+    # Active promo codes cached per worker
+    PROMO_CACHE_SIZE: int = int(os.getenv("PROMO_CACHE_SIZE", "10000"))
+    PROMO_CACHE_TTL_SECONDS: int = int(os.getenv("PROMO_CACHE_TTL_SECONDS", "30"))
+    
+    # Live availability streams (Server-Sent Events)
+    AVAILABILITY_MAX_UPDATES_PER_SECOND: float = float(os.getenv("AVAILABILITY_MAX_UPDATES_PER_SECOND", "2"))
+    AVAILABILITY_HEARTBEAT_SECONDS: float = float(os.getenv("AVAILABILITY_HEARTBEAT_SECONDS", "15"))
+    AVAILABILITY_STREAM_MAX_SECONDS: float = float(os.getenv("AVAILABILITY_STREAM_MAX_SECONDS", "300"))
+    AVAILABILITY_RETRY_MS: int = int(os.getenv("AVAILABILITY_RETRY_MS", "2000"))
+    
+    # Attendee exports: rows fetched per round trip from the server-side cursor
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+    
+    # Bulk event import: events accepted per request
+    IMPORT_MAX_EVENTS: int = int(os.getenv("IMPORT_MAX_EVENTS", "5000"))
+    
+    # Request telemetry: log requests slower than this with their SQL (0 = off)
+    SLOW_REQUEST_LOG_MS: int = int(os.getenv("SLOW_REQUEST_LOG_MS", "0"))
+    
+    # Idempotency-Key on booking and order creation: how long a response is
+    # replayed, how long a duplicate waits for the first request (also how long
+    # a crashed request holds its key), and keys kept per worker without Redis
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_LOCK_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "30"))
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "100000"))
+    
+    # Seat holds: with BOOKING_HOLD_SECONDS > 0, bookings and orders hold their
+    # tickets (payment pending) until confirmed through
+    # /api/bookings/holds/{id}/confirm; the sweeper releases lapsed holds in
+    # batches. 0 confirms bookings as paid right away.
+    # Confirmation is a demo payment flow with no gateway behind it (see
+    # payment_verified in app/services/holds.py); keep holds off in production.
+    BOOKING_HOLD_SECONDS: int = int(os.getenv("BOOKING_HOLD_SECONDS", "0"))
+    HOLD_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", "5"))
+    HOLD_SWEEP_BATCH_SIZE: int = int(os.getenv("HOLD_SWEEP_BATCH_SIZE", "500"))
+    # Shared with the service that reports payments; empty takes any confirmation
+    HOLD_CONFIRM_SECRET: str = os.getenv("HOLD_CONFIRM_SECRET", "")
+    
+    # Sales analytics: each worker folds the sales it recorded into the rollup
+    # tables this often, so dashboards lag by up to this long
+    ANALYTICS_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("ANALYTICS_FLUSH_INTERVAL_SECONDS", "2"))
+    
     # Railway deployment
     PORT: int = int(os.getenv("PORT", "8000"))
     RAILWAY_ENVIRONMENT: str = os.getenv("RAILWAY_ENVIRONMENT", "development")
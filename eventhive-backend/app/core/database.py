@@ -1,56 +1,177 @@
-from sqlalchemy import create_engine
+import time
+from uuid import uuid4
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from .config import settings
-import os
+from .metrics import registry
+from .request_metrics import instrument_sql
 
-# Handle Railway DATABASE_URL format (postgres:// vs postgresql://)
-database_url = settings.DATABASE_URL
+Base = declarative_base()
+
+SQLITE_FALLBACK_URL = "sqlite:///./eventhive.db"
+
+# Engines and session factories are built on first use, so importing the app
+# (or a model) never opens a connection
+_database_url = None
+_engine = None
+_async_engine = None
+_session_local = None
+_async_session_local = None
+
+# Pool telemetry for the API engine (per worker)
+pool_checked_out = registry.gauge("db_pool_checked_out", "Connections currently checked out of the pool")
+pool_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+pool_connections_created = registry.counter("db_pool_connections_created_total", "New DBAPI connections opened")
+pool_connections_recycled = registry.counter(
+    "db_pool_connections_recycled_total", "Connections replaced after recycle or invalidation"
+)
+pool_checkout_timeouts = registry.counter("db_pool_checkout_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT")
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    # Records how long each checkout waits for a free (or newly opened) connection
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_checkout_timeouts.inc()
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - start)
+
+def _instrument(engine) -> None:
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_connections_created.inc()
+        if connection_record.record_info.get("connected"):
+            pool_connections_recycled.inc()
+        connection_record.record_info["connected"] = True
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_checked_out.inc()
 
-# Railway sometimes provides postgres:// but SQLAlchemy 2.0 requires postgresql://
-if database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        pool_checked_out.dec()
 
-print(f"Database URL: {database_url[:50]}...")  # Log for debugging
+def _normalize(url: str) -> str:
+    # Railway sometimes provides postgres:// but SQLAlchemy 2.0 requires postgresql://
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
 
-# Connection arguments based on database type
-connect_args = {}
-if "sqlite" in database_url:
-    connect_args = {"check_same_thread": False}
-else:
-    # PostgreSQL connection pool settings for Railway
-    connect_args = {
+def get_database_url() -> str:
+    global _database_url
+    if _database_url is None:
+        # An empty DATABASE_URL (as in .env.example) means the local SQLite file
+        database_url = _normalize(settings.DATABASE_URL or SQLITE_FALLBACK_URL)
+        if settings.DB_ALLOW_SQLITE_FALLBACK and "sqlite" not in database_url:
+            if settings.RAILWAY_ENVIRONMENT == "production":
+                print("DB_ALLOW_SQLITE_FALLBACK is ignored in production")
+            else:
+                # Blocking probe, once per process; acceptable for local development only
+                try:
+                    with create_engine(database_url, poolclass=NullPool,
+                                       connect_args={"connect_timeout": 5}).connect():
+                        pass
+                except Exception as e:
+                    print(f"Database connection failed: {e}")
+                    print(f"DB_ALLOW_SQLITE_FALLBACK is set, using {SQLITE_FALLBACK_URL}")
+                    database_url = SQLITE_FALLBACK_URL
+        _database_url = database_url
+    return _database_url
+
+def get_async_url(url: str) -> str:
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+# Sync engine, kept for scripts (seed.py, migrations)
+def get_engine():
+    global _engine
+    if _engine is None:
+        database_url = get_database_url()
+        if "sqlite" in database_url:
+            _engine = create_engine(database_url, connect_args={"check_same_thread": False})
+        else:
+            _engine = create_engine(database_url, pool_pre_ping=True, connect_args={"connect_timeout": 60})
+    return _engine
+
+def _async_engine_options(database_url: str) -> dict:
+    if database_url in ("sqlite://", "sqlite:///:memory:"):
+        return {}
+    if "sqlite" in database_url:
+        return {
+            "poolclass": TimedQueuePool,
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+        }
+    if settings.DB_PGBOUNCER:
+        # PgBouncer (transaction pooling) owns the pool and may hand each
+        # transaction a different server connection, so prepared statements
+        # must not be cached or reused by name
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "timeout": 60,
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4().hex}__",
+            },
+        }
+    return {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
         "pool_pre_ping": True,
-        "pool_recycle": 300,
-        "connect_timeout": 60,
+        "connect_args": {"timeout": 60},
     }
 
-try:
-    engine = create_engine(
-        database_url, 
-        **connect_args,
-        echo=False  # Set to True for SQL query logging
-    )
-    
-    # Test the connection
-    with engine.connect() as conn:
-        print("Database connection successful!")
-        
-except Exception as e:
-    print(f"Database connection failed: {e}")
-    # Fallback to SQLite for local development
-    print("Falling back to SQLite...")
-    engine = create_engine(
-        "sqlite:///./eventhive.db", 
-        connect_args={"check_same_thread": False}
-    )
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+# Async engine used by the API
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        database_url = get_database_url()
+        _async_engine = create_async_engine(get_async_url(database_url), **_async_engine_options(database_url))
+        _instrument(_async_engine.sync_engine)
+        instrument_sql(_async_engine.sync_engine)
+    return _async_engine
+
+def get_session_local():
+    global _session_local
+    if _session_local is None:
+        _session_local = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_local
+
+def get_async_session_local():
+    global _async_session_local
+    if _async_session_local is None:
+        _async_session_local = async_sessionmaker(
+            get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_local
+
+async def dispose_engines():
+    global _engine, _async_engine, _session_local, _async_session_local
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+    _engine = _async_engine = _session_local = _async_session_local = None
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with get_async_session_local()() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,17 @@
+import os
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def alembic_config(database_url: Optional[str] = None) -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    if database_url:
+        # ConfigParser interpolation: a literal % in the password must be doubled
+        config.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    return config
+
+def upgrade_database(database_url: Optional[str] = None, revision: str = "head") -> None:
+    command.upgrade(alembic_config(database_url), revision)
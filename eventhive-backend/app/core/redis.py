@@ -0,0 +1,29 @@
+import redis.asyncio as redis
+from .config import settings
+from .request_metrics import instrument_redis
+
+redis_client = None
+
+async def connect_redis():
+    global redis_client
+    try:
+        if settings.REDIS_URL:
+            client = redis.from_url(settings.REDIS_URL)
+            instrument_redis(client)
+            # Test connection
+            await client.ping()
+            print("Redis connection successful!")
+            redis_client = client
+    except Exception as e:
+        print(f"Redis connection failed: {e}")
+        print("Continuing without Redis cache...")
+    return redis_client
+
+async def close_redis():
+    global redis_client
+    if redis_client is not None:
+        await redis_client.close()
+        redis_client = None
+
+def get_redis():
+    return redis_client
@@ -0,0 +1,147 @@
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from .config import settings
+from .metrics import registry
+
+# Per-request telemetry: latency by route template, SQL statements and time
+# (SQLAlchemy cursor events) and time spent on Redis (the client's connection
+# class). The middleware puts a RequestStats in a context variable for each
+# request; the hooks add to whatever is current, so work outside a request
+# (startup, background tasks, CLI) is not counted.
+
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SLOW_LOG_STATEMENT_CHARS = 500
+
+request_seconds = registry.histogram("http_request_duration_seconds", "Request latency by route")
+request_sql_statements = registry.histogram(
+    "http_request_sql_statements", "SQL statements issued per request", buckets=SQL_STATEMENT_BUCKETS
+)
+request_sql_seconds = registry.histogram("http_request_sql_seconds", "Time in SQL statements per request")
+request_redis_seconds = registry.histogram("http_request_redis_seconds", "Time waiting on Redis per request")
+slow_requests = registry.counter("http_slow_requests_total", "Requests over SLOW_REQUEST_LOG_MS")
+
+class RequestStats:
+    __slots__ = ("sql_count", "sql_seconds", "redis_seconds", "statements")
+
+    def __init__(self, capture_sql: bool = False):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.redis_seconds = 0.0
+        # (seconds, statement) per statement, kept only for the slow-request log
+        self.statements: Optional[List[Tuple[float, str]]] = [] if capture_sql else None
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+def instrument_sql(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current.get() is not None:
+            context._request_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current.get()
+        start = getattr(context, "_request_query_start", None)
+        if stats is None or start is None:
+            return
+        elapsed = time.perf_counter() - start
+        stats.sql_count += 1
+        stats.sql_seconds += elapsed
+        if stats.statements is not None:
+            stats.statements.append((elapsed, statement))
+
+class _TimedConnection:
+    # Mixed into the Redis pool's connection class: writing commands and waiting
+    # for replies count toward the current request's Redis time
+    async def send_packed_command(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().send_packed_command(*args, **kwargs)
+        finally:
+            _add_redis_time(start)
+
+    async def read_response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().read_response(*args, **kwargs)
+        finally:
+            _add_redis_time(start)
+
+def _add_redis_time(start: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.redis_seconds += time.perf_counter() - start
+
+def instrument_redis(client) -> None:
+    # Before the first connection is made; keeps whatever class from_url picked
+    # (plain, SSL, unix socket)
+    pool = client.connection_pool
+    base = pool.connection_class
+    if not issubclass(base, _TimedConnection):
+        pool.connection_class = type(f"Timed{base.__name__}", (_TimedConnection, base), {})
+
+def _route_template(app, endpoint) -> str:
+    # Route paths by endpoint, built on first use and again if routes were
+    # added since
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None or endpoint not in templates:
+        templates = app.state.route_templates = {
+            route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")
+        }
+    return templates.get(endpoint, "unmatched")
+
+def _log_slow_request(method: str, route: str, status: int, elapsed: float, stats: RequestStats) -> None:
+    slow_requests.inc(route=route)
+    lines = [
+        f"Slow request: {method} {route} -> {status} in {elapsed * 1000:.0f}ms; "
+        f"{stats.sql_count} SQL in {stats.sql_seconds * 1000:.0f}ms, Redis {stats.redis_seconds * 1000:.0f}ms"
+    ]
+    for seconds, statement in stats.statements or []:
+        text = " ".join(statement.split())
+        if len(text) > SLOW_LOG_STATEMENT_CHARS:
+            text = text[:SLOW_LOG_STATEMENT_CHARS] + "..."
+        lines.append(f"  {seconds * 1000:8.1f}ms  {text}")
+    print("\n".join(lines))
+
+class RequestMetricsMiddleware:
+    # Plain ASGI middleware (no BaseHTTPMiddleware): streaming responses pass
+    # straight through, and the context variable is visible to the endpoint.
+    # A streamed response is timed until its last chunk is sent.
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        slow_ms = settings.SLOW_REQUEST_LOG_MS
+        stats = RequestStats(capture_sql=slow_ms > 0)
+        token = _current.set(stats)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current.reset(token)
+            endpoint = scope.get("endpoint")
+            route = _route_template(scope["app"], endpoint) if endpoint else "unmatched"
+            method = scope["method"]
+            request_seconds.observe(elapsed, method=method, route=route, status=status)
+            request_sql_statements.observe(stats.sql_count, method=method, route=route)
+            request_sql_seconds.observe(stats.sql_seconds, method=method, route=route)
+            request_redis_seconds.observe(stats.redis_seconds, method=method, route=route)
+            if slow_ms > 0 and elapsed * 1000 >= slow_ms:
+                _log_slow_request(method, route, status, elapsed, stats)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, DECIMAL, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, DECIMAL, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -56,12 +56,24 @@ class Event(Base):
     status = Column(Enum(EventStatus), default=EventStatus.DRAFT)
     featured = Column(Boolean, default=False)
     image_url = Column(String(500))
+    checkin_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    # Waiting room admissions per second; NULL when the event has no waiting room
+    waiting_room_rate = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     organizer = relationship("User", back_populates="organized_events")
     category = relationship("Category", back_populates="events")
     tickets = relationship("TicketType", back_populates="event")
     bookings = relationship("Booking", back_populates="event")
+    
+    # Keyset pagination: (created_at, id) ordering within each list filter.
+    # Indexes are created by migrations (see migrations/versions).
+    __table_args__ = (
+        Index("ix_events_status_created_at", "status", "created_at", "id"),
+        Index("ix_events_status_featured_created_at", "status", "featured", "created_at", "id"),
+        Index("ix_events_status_category_created_at", "status", "category_id", "created_at", "id"),
+        Index("ix_events_organizer_created_at", "organizer_id", "created_at", "id"),
+    )
 
 class TicketType(Base):
     __tablename__ = "ticket_types"
@@ -78,12 +90,17 @@ class TicketType(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     event = relationship("Event", back_populates="tickets")
+    
+    __table_args__ = (
+        Index("ix_ticket_types_event_active", "event_id", "is_active"),
+    )
 
 class Booking(Base):
     __tablename__ = "bookings"
     
     id = Column(Integer, primary_key=True, index=True)
     booking_id = Column(String(50), unique=True, nullable=False, index=True)
+    order_id = Column(String(50))
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
     ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), nullable=False)
@@ -95,10 +112,28 @@ class Booking(Base):
     payment_status = Column(String(50), default="pending")
     booking_status = Column(String(50), default="confirmed")
     qr_code = Column(Text)
+    checkin_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set while the booking is a seat hold awaiting payment (booking_status
+    # "held"); cleared when it is confirmed or released
+    hold_expires_at = Column(DateTime(timezone=True))
+    # Promo code redeemed, on the first booking of an order (one use per order);
+    # the use is given back if the hold is released
+    promo_code_id = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("User", back_populates="bookings")
     event = relationship("Event", back_populates="bookings")
+    
+    __table_args__ = (
+        Index("ix_bookings_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_bookings_event_id", "event_id"),
+        Index("ix_bookings_order_id", "order_id"),
+        Index("ix_bookings_event_checkin_version", "event_id", "checkin_version"),
+        # Only live holds have an expiry, so the sweeper's index stays small
+        Index("ix_bookings_hold_expires_at", "hold_expires_at",
+              postgresql_where=text("hold_expires_at IS NOT NULL"),
+              sqlite_where=text("hold_expires_at IS NOT NULL")),
+    )
 
 class PromoCode(Base):
     __tablename__ = "promo_codes"
@@ -112,4 +147,34 @@ class PromoCode(Base):
     used_count = Column(Integer, default=0)
     valid_until = Column(DateTime(timezone=True))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index("ix_promo_codes_code_active", "code", "is_active"),
+        Index("ix_promo_codes_event_active", "event_id", "is_active"),
+    )
+
+# Sales rollups, maintained as bookings and check-ins commit (see
+# app/services/analytics.py) so dashboards never aggregate over bookings
+class TicketTypeSales(Base):
+    __tablename__ = "ticket_type_sales"
+    
+    ticket_type_id = Column(Integer, ForeignKey("ticket_types.id"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id"), nullable=False)
+    bookings = Column(Integer, nullable=False, default=0, server_default="0")
+    tickets = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0, server_default="0")
+    checked_in = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    __table_args__ = (
+        Index("ix_ticket_type_sales_event_id", "event_id"),
+    )
+
+class HourlySales(Base):
+    __tablename__ = "hourly_sales"
+    
+    event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    bookings = Column(Integer, nullable=False, default=0, server_default="0")
+    tickets = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0, server_default="0")
\ No newline at end of file
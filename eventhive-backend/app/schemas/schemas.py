@@ -69,11 +69,16 @@ class EventResponse(BaseModel):
     status: EventStatus
     featured: bool
     image_url: Optional[str]
+    waiting_room_rate: Optional[int] = None
     tickets: List[TicketTypeResponse] = []
     
     class Config:
         from_attributes = True
 
+class EventPage(BaseModel):
+    items: List[EventResponse]
+    next_cursor: Optional[str] = None
+
 class CategoryResponse(BaseModel):
     id: int
     name: str
@@ -91,6 +96,23 @@ class BookingCreate(BaseModel):
     attendee_phone: Optional[str] = None
     promo_code: Optional[str] = None
 
+class OrderItemCreate(BaseModel):
+    ticket_type_id: int
+    quantity: int
+
+class OrderCreate(BaseModel):
+    event_id: int
+    items: List[OrderItemCreate]
+    attendee_name: str
+    attendee_email: EmailStr
+    attendee_phone: Optional[str] = None
+    promo_code: Optional[str] = None
+
+class HoldConfirm(BaseModel):
+    # Required when HOLD_CONFIRM_SECRET is set (see app/services/holds.py)
+    payment_id: Optional[str] = None
+    payment_signature: Optional[str] = None
+
 class BookingResponse(BaseModel):
     id: int
     booking_id: str
@@ -99,8 +121,30 @@ class BookingResponse(BaseModel):
     total_amount: Decimal
     attendee_name: str
     payment_status: str
-    qr_code: Optional[str]
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class BookingPage(BaseModel):
+    items: List[BookingResponse]
+    next_cursor: Optional[str] = None
+
+class CheckInBatch(BaseModel):
+    event_id: int
+    booking_ids: List[str]
+
+class TicketVerify(BaseModel):
+    event_id: int
+    payload: str
+
+class WaitingRoomConfig(BaseModel):
+    enabled: bool
+    admit_rate: Optional[int] = None
+
+class PromoCodeCreate(BaseModel):
+    code: str
+    discount_percent: int = 0
+    discount_amount: Decimal = Decimal(0)
+    max_uses: int = 1
+    valid_until: Optional[datetime] = None
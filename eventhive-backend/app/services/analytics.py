@@ -0,0 +1,239 @@
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+from sqlalchemy import select, delete, func, and_, case
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import get_async_session_local
+from app.models.models import Booking, Event, HourlySales, TicketType, TicketTypeSales
+
+# Sales analytics are served from two rollup tables instead of aggregating
+# bookings: per ticket type (bookings, tickets, revenue, check-ins) and per
+# event per hour (bookings, tickets, revenue). Dashboard reads touch one row
+# per ticket type and one per hour of sales.
+#
+# Sales are kept out of the booking transaction, where the event's current
+# hour row would be one more row every booking queues on. Once a booking
+# commits, record_sales adds it to this worker's pending totals, and
+# flush_sales folds those into the rollups every
+# ANALYTICS_FLUSH_INTERVAL_SECONDS, one upsert per table with rows in key
+# order (so concurrent flushes cannot deadlock). Dashboards lag by up to that
+# interval; totals still pending in a worker that dies are lost until
+# rebuild_analytics recomputes the rollups from bookings. Check-ins only touch
+# the ticket type rows and are counted in the check-in transaction.
+
+COUNTED_STATUSES = ("confirmed", "checked_in")
+
+def _insert(db):
+    dialect = db.get_bind().dialect.name
+    return postgresql.insert if dialect == "postgresql" else sqlite.insert
+
+def _upsert(db, model, rows: list, keys: Tuple[str, ...], counters: Tuple[str, ...]):
+    stmt = _insert(db)(model).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={name: getattr(model, name) + getattr(stmt.excluded, name) for name in counters}
+    )
+
+def current_hour() -> datetime:
+    return datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+# (ticket_type_id, event_id) and (event_id, hour) -> [bookings, tickets, revenue]
+_pending_ticket_sales: Dict[Tuple[int, int], list] = {}
+_pending_hourly_sales: Dict[Tuple[int, datetime], list] = {}
+
+def _add(pending: dict, key: tuple, bookings: int, tickets: int, revenue) -> None:
+    totals = pending.setdefault(key, [0, 0, 0])
+    totals[0] += bookings
+    totals[1] += tickets
+    totals[2] += revenue
+
+def record_sales(event_id: int, lines: Dict[int, Tuple[int, Decimal]], booked_at: Optional[datetime] = None) -> None:
+    # lines: ticket_type_id -> (tickets, revenue), one booking per line; call
+    # once the bookings have committed. Counted in the hour of booked_at (the
+    # bookings' created_at, which rebuild_analytics buckets by), default now.
+    hour = _as_hour(booked_at).replace(minute=0, second=0, microsecond=0) if booked_at else current_hour()
+    for ticket_type_id, (tickets, revenue) in lines.items():
+        _add(_pending_ticket_sales, (ticket_type_id, event_id), 1, tickets, revenue)
+        _add(_pending_hourly_sales, (event_id, hour), 1, tickets, revenue)
+
+async def flush_sales() -> None:
+    if not _pending_ticket_sales and not _pending_hourly_sales:
+        return
+    ticket_sales, hourly_sales = dict(_pending_ticket_sales), dict(_pending_hourly_sales)
+    _pending_ticket_sales.clear()
+    _pending_hourly_sales.clear()
+    try:
+        async with get_async_session_local()() as db:
+            if ticket_sales:
+                await db.execute(_upsert(db, TicketTypeSales, [
+                    {"ticket_type_id": ticket_type_id, "event_id": event_id, "bookings": bookings,
+                     "tickets": tickets, "revenue": revenue, "checked_in": 0}
+                    for (ticket_type_id, event_id), (bookings, tickets, revenue) in sorted(ticket_sales.items())
+                ], ("ticket_type_id",), ("bookings", "tickets", "revenue")))
+            if hourly_sales:
+                await db.execute(_upsert(db, HourlySales, [
+                    {"event_id": event_id, "hour": hour, "bookings": bookings, "tickets": tickets, "revenue": revenue}
+                    for (event_id, hour), (bookings, tickets, revenue) in sorted(hourly_sales.items())
+                ], ("event_id", "hour"), ("bookings", "tickets", "revenue")))
+            await db.commit()
+    except Exception:
+        # Kept for the next flush
+        for key, totals in ticket_sales.items():
+            _add(_pending_ticket_sales, key, *totals)
+        for key, totals in hourly_sales.items():
+            _add(_pending_hourly_sales, key, *totals)
+        raise
+
+async def run_sales_flusher() -> None:
+    while True:
+        await asyncio.sleep(settings.ANALYTICS_FLUSH_INTERVAL_SECONDS)
+        try:
+            await flush_sales()
+        except Exception as e:
+            print(f"Sales rollup flush failed: {e!r}")
+
+async def record_check_ins(db: AsyncSession, event_id: int, ticket_type_ids: Dict[int, int]) -> None:
+    # ticket_type_ids: booking pk -> ticket_type_id for the bookings just checked in
+    counts: Dict[int, int] = {}
+    for ticket_type_id in ticket_type_ids.values():
+        counts[ticket_type_id] = counts.get(ticket_type_id, 0) + 1
+    if not counts:
+        return
+    rows = [
+        {"ticket_type_id": ticket_type_id, "event_id": event_id, "bookings": 0, "tickets": 0, "revenue": 0,
+         "checked_in": count}
+        for ticket_type_id, count in sorted(counts.items())
+    ]
+    await db.execute(_upsert(db, TicketTypeSales, rows, ("ticket_type_id",), ("checked_in",)))
+
+def _money(value) -> float:
+    return float(value or 0)
+
+async def event_analytics(db: AsyncSession, event_id: int, granularity: str = "hour") -> dict:
+    result = await db.execute(
+        select(TicketType.id, TicketType.name, TicketTypeSales.bookings, TicketTypeSales.tickets,
+               TicketTypeSales.revenue, TicketTypeSales.checked_in)
+        .outerjoin(TicketTypeSales, TicketTypeSales.ticket_type_id == TicketType.id)
+        .filter(TicketType.event_id == event_id)
+        .order_by(TicketType.id)
+    )
+    ticket_types = [
+        {"ticket_type_id": row.id, "name": row.name, "bookings": row.bookings or 0,
+         "tickets_sold": row.tickets or 0, "revenue": _money(row.revenue), "checked_in": row.checked_in or 0}
+        for row in result
+    ]
+
+    result = await db.execute(
+        select(HourlySales.hour, HourlySales.bookings, HourlySales.tickets, HourlySales.revenue)
+        .filter(HourlySales.event_id == event_id)
+        .order_by(HourlySales.hour)
+    )
+    timeline: Dict[str, dict] = {}
+    for row in result:
+        hour = row.hour if row.hour.tzinfo else row.hour.replace(tzinfo=timezone.utc)
+        period = hour.date().isoformat() if granularity == "day" else hour.isoformat()
+        bucket = timeline.setdefault(period, {"period": period, "bookings": 0, "tickets": 0, "revenue": 0.0})
+        bucket["bookings"] += row.bookings
+        bucket["tickets"] += row.tickets
+        bucket["revenue"] += _money(row.revenue)
+
+    bookings = sum(t["bookings"] for t in ticket_types)
+    checked_in = sum(t["checked_in"] for t in ticket_types)
+    return {
+        "event_id": event_id,
+        "revenue": sum(t["revenue"] for t in ticket_types),
+        "tickets_sold": sum(t["tickets_sold"] for t in ticket_types),
+        "bookings": bookings,
+        "checked_in": checked_in,
+        "checkin_rate": round(checked_in / bookings, 4) if bookings else 0.0,
+        "ticket_types": ticket_types,
+        "granularity": granularity,
+        "timeline": list(timeline.values()),
+    }
+
+async def organizer_analytics(db: AsyncSession, organizer_id: int) -> dict:
+    result = await db.execute(
+        select(Event.id, Event.title,
+               func.coalesce(func.sum(TicketTypeSales.bookings), 0),
+               func.coalesce(func.sum(TicketTypeSales.tickets), 0),
+               func.coalesce(func.sum(TicketTypeSales.revenue), 0),
+               func.coalesce(func.sum(TicketTypeSales.checked_in), 0))
+        .outerjoin(TicketTypeSales, TicketTypeSales.event_id == Event.id)
+        .filter(Event.organizer_id == organizer_id)
+        .group_by(Event.id, Event.title)
+        .order_by(Event.id)
+    )
+    events = [
+        {"event_id": event_id, "title": title, "bookings": bookings, "tickets_sold": tickets,
+         "revenue": _money(revenue), "checked_in": checked_in,
+         "checkin_rate": round(checked_in / bookings, 4) if bookings else 0.0}
+        for event_id, title, bookings, tickets, revenue, checked_in in result
+    ]
+    bookings = sum(e["bookings"] for e in events)
+    checked_in = sum(e["checked_in"] for e in events)
+    return {
+        "organizer_id": organizer_id,
+        "revenue": sum(e["revenue"] for e in events),
+        "tickets_sold": sum(e["tickets_sold"] for e in events),
+        "bookings": bookings,
+        "checked_in": checked_in,
+        "checkin_rate": round(checked_in / bookings, 4) if bookings else 0.0,
+        "events": events,
+    }
+
+def _hour_bucket(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date_trunc("hour", Booking.created_at)
+    return func.strftime("%Y-%m-%d %H:00:00", Booking.created_at)
+
+def _as_hour(value) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+def rebuild_analytics(db: Session, event_id: Optional[int] = None) -> Tuple[int, int]:
+    # Recomputes the rollups from bookings (backfill, or repair after manual
+    # edits, or after a worker died with sales pending) in one transaction.
+    # Bookings committed while it runs, or less than one flush interval
+    # before, can be counted twice or missed, so run it while sales are paused.
+    scope = [Booking.booking_status.in_(COUNTED_STATUSES)]
+    if event_id is not None:
+        scope.append(Booking.event_id == event_id)
+        db.execute(delete(TicketTypeSales).where(TicketTypeSales.event_id == event_id))
+        db.execute(delete(HourlySales).where(HourlySales.event_id == event_id))
+    else:
+        db.execute(delete(TicketTypeSales))
+        db.execute(delete(HourlySales))
+
+    ticket_rows = [
+        {"ticket_type_id": ticket_type_id, "event_id": booking_event_id, "bookings": bookings,
+         "tickets": tickets or 0, "revenue": revenue or 0, "checked_in": checked_in or 0}
+        for ticket_type_id, booking_event_id, bookings, tickets, revenue, checked_in in db.execute(
+            select(Booking.ticket_type_id, Booking.event_id, func.count(Booking.id), func.sum(Booking.quantity),
+                   func.sum(Booking.total_amount),
+                   func.sum(case((Booking.booking_status == "checked_in", 1), else_=0)))
+            .filter(and_(*scope))
+            .group_by(Booking.ticket_type_id, Booking.event_id)
+        )
+    ]
+    hour = _hour_bucket(db)
+    hour_rows = [
+        {"event_id": booking_event_id, "hour": _as_hour(bucket), "bookings": bookings, "tickets": tickets or 0,
+         "revenue": revenue or 0}
+        for booking_event_id, bucket, bookings, tickets, revenue in db.execute(
+            select(Booking.event_id, hour, func.count(Booking.id), func.sum(Booking.quantity),
+                   func.sum(Booking.total_amount))
+            .filter(and_(*scope))
+            .group_by(Booking.event_id, hour)
+        )
+    ]
+    if ticket_rows:
+        db.execute(TicketTypeSales.__table__.insert(), ticket_rows)
+    if hour_rows:
+        db.execute(HourlySales.__table__.insert(), hour_rows)
+    db.commit()
+    return len(ticket_rows), len(hour_rows)
@@ -0,0 +1,149 @@
+import asyncio
+import contextvars
+import json
+from typing import Dict, Optional, Set
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_session_local
+from app.core.metrics import registry
+from app.core.redis import get_redis
+from app.models.models import TicketType
+
+# Live ticket availability for event pages. Bookings publish the remaining
+# count of every ticket type they touched; with Redis the update goes through
+# pub/sub so subscribers on every worker see it, otherwise it is delivered
+# in-process. Each subscriber keeps only the latest value per ticket type and
+# is flushed at most AVAILABILITY_MAX_UPDATES_PER_SECOND times a second, so a
+# hot event costs the same per subscriber however fast it sells.
+
+CHANNEL_PREFIX = "availability:"
+
+availability_updates = registry.counter("availability_updates_total", "Availability changes published")
+availability_messages = registry.counter("availability_messages_total", "Availability messages sent to subscribers")
+
+class Subscriber:
+    def __init__(self):
+        self.pending: Dict[str, int] = {}
+        self.ready = asyncio.Event()
+
+    def push(self, changes: Dict[str, int]) -> None:
+        self.pending.update(changes)
+        self.ready.set()
+
+    def take(self) -> Dict[str, int]:
+        changes, self.pending = self.pending, {}
+        self.ready.clear()
+        return changes
+
+_subscribers: Dict[int, Set[Subscriber]] = {}
+_listener: Optional[asyncio.Task] = None
+
+registry.gauge("availability_subscribers", "Open availability streams on this worker",
+               callback=lambda: sum(len(subscribers) for subscribers in _subscribers.values()))
+
+def _dispatch(event_id: int, changes: Dict[str, int]) -> None:
+    for subscriber in _subscribers.get(event_id, ()):
+        subscriber.push(changes)
+
+async def _listen(redis) -> None:
+    # One pattern subscription per worker, started with the first local stream
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            async for message in pubsub.listen():
+                if message["type"] != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                event_id = int(channel[len(CHANNEL_PREFIX):])
+                _dispatch(event_id, json.loads(message["data"]))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Availability listener error: {e!r}")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.close()
+
+def subscribe(event_id: int) -> Subscriber:
+    global _listener
+    redis = get_redis()
+    if redis is not None and (_listener is None or _listener.done()):
+        # Fresh context: the listener outlives the request that starts it and
+        # must not add to that request's telemetry
+        _listener = contextvars.Context().run(asyncio.create_task, _listen(redis))
+    subscriber = Subscriber()
+    _subscribers.setdefault(event_id, set()).add(subscriber)
+    return subscriber
+
+def unsubscribe(event_id: int, subscriber: Subscriber) -> None:
+    subscribers = _subscribers.get(event_id)
+    if subscribers is not None:
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del _subscribers[event_id]
+
+async def publish_availability(event_id: int, remaining: Dict[int, int]) -> None:
+    # Called after commit with the remaining count per changed ticket type
+    if not remaining:
+        return
+    changes = {str(ticket_type_id): count for ticket_type_id, count in remaining.items()}
+    availability_updates.inc()
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.publish(f"{CHANNEL_PREFIX}{event_id}", json.dumps(changes))
+            return
+        except Exception as e:
+            print(f"Availability publish failed: {e!r}")
+    _dispatch(event_id, changes)
+
+async def shutdown_availability() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except (asyncio.CancelledError, Exception):
+            pass
+        _listener = None
+
+async def ticket_availability(db: AsyncSession, event_id: int) -> Dict[str, int]:
+    result = await db.execute(select(TicketType.id, TicketType.max_quantity - TicketType.sold_quantity).filter(
+        and_(TicketType.event_id == event_id, TicketType.is_active == True)
+    ))
+    return {str(ticket_type_id): max(remaining, 0) for ticket_type_id, remaining in result}
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+async def availability_stream(event_id: int):
+    # Server-Sent Events: a snapshot, then coalesced deltas. The snapshot is
+    # read after subscribing so no update falls between the two, on a session
+    # of its own so the stream never pins a pooled connection. The stream ends
+    # after AVAILABILITY_STREAM_MAX_SECONDS so long-lived connections do not
+    # hold up worker shutdown; EventSource reconnects (and re-syncs) on its own.
+    subscriber = subscribe(event_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.AVAILABILITY_STREAM_MAX_SECONDS
+    interval = 1 / settings.AVAILABILITY_MAX_UPDATES_PER_SECOND
+    try:
+        async with get_async_session_local()() as db:
+            snapshot = await ticket_availability(db, event_id)
+        yield f"retry: {settings.AVAILABILITY_RETRY_MS}\n\n"
+        yield _sse("snapshot", snapshot)
+        while loop.time() < deadline:
+            timeout = min(settings.AVAILABILITY_HEARTBEAT_SECONDS, deadline - loop.time())
+            try:
+                await asyncio.wait_for(subscriber.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            availability_messages.inc()
+            yield _sse("availability", subscriber.take())
+            await asyncio.sleep(interval)
+    finally:
+        unsubscribe(event_id, subscriber)
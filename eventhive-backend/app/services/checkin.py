@@ -0,0 +1,169 @@
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import select, update, and_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.models import Booking, Event
+
+# Check-in manifests are versioned by Event.checkin_seq. Every change a gate
+# needs to hear about (a new booking, a hold confirmed or released, a check-in)
+# stamps the rows it touches with Booking.checkin_version from that sequence.
+# The sequence is bumped with an UPDATE that holds the event row lock until
+# commit, so versions follow commit order: a delta sends every row stamped after
+# the version the gate holds, however late the transaction that wrote it
+# committed. (Booking ids are not commit-ordered: on PostgreSQL a lower id can
+# commit after a higher one.)
+#
+# Bookings and hold transitions must not take the event row lock while they
+# hold ticket type locks, or every ticket type of an event would queue on it.
+# They write their rows UNSTAMPED and stamp them with stamp_bookings, in a
+# short transaction of its own, after they commit. UNSTAMPED sorts after every
+# real version, so deltas take in unstamped rows and none are missed in between;
+# if the stamp never runs (the worker dies), they go out with the event's next
+# change.
+MANIFEST_FIELDS = ["booking_id", "ticket_type_id", "quantity", "status"]
+UNSTAMPED = 2**31 - 1
+
+def format_version(seq: int) -> str:
+    return str(seq)
+
+def parse_version(version: str) -> Optional[int]:
+    try:
+        return int(version)
+    except ValueError:
+        return None
+
+async def current_version(db: AsyncSession, event_id: int) -> int:
+    result = await db.execute(select(Event.checkin_seq).filter(Event.id == event_id))
+    return result.scalar() or 0
+
+async def manifest_rows(db: AsyncSession, event_id: int, since: Optional[int] = None) -> List[list]:
+    # Everything, or the bookings stamped after since (or not stamped yet). Rows
+    # committed after the version was read may be sent early; the next delta
+    # sends them again.
+    query = select(Booking.booking_id, Booking.ticket_type_id, Booking.quantity, Booking.booking_status)
+    if since is None:
+        result = await db.execute(query.filter(Booking.event_id == event_id).order_by(Booking.id))
+    else:
+        result = await db.execute(query.filter(
+            and_(Booking.event_id == event_id, Booking.checkin_version > since)
+        ).order_by(Booking.checkin_version, Booking.id))
+    return [list(row) for row in result]
+
+async def next_checkin_seq(db: AsyncSession, event_id: int) -> int:
+    result = await db.execute(
+        update(Event).where(Event.id == event_id)
+        .values(checkin_seq=Event.checkin_seq + 1)
+        .returning(Event.checkin_seq)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+async def stamp_bookings(db: AsyncSession, event_id: int, condition) -> None:
+    # Runs after the writer has committed. A booking checked in meanwhile
+    # already has a newer version and is left alone. A failure is only logged:
+    # the bookings are committed and deltas keep sending them unstamped.
+    try:
+        seq = await next_checkin_seq(db, event_id)
+        await db.execute(
+            update(Booking).where(and_(
+                condition,
+                Booking.event_id == event_id,
+                Booking.checkin_version == UNSTAMPED
+            ))
+            .values(checkin_version=seq)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        print(f"Check-in stamp failed for event {event_id}: {e!r}")
+
+async def check_in_bookings(db: AsyncSession, event_id: int, booking_pks: Sequence[int], seq: int) -> Dict[int, int]:
+    # Only confirmed bookings flip; returns primary key -> ticket type of those
+    # that did, so a concurrent check-in elsewhere shows up as a conflict
+    if not booking_pks:
+        return {}
+    result = await db.execute(
+        update(Booking).where(and_(
+            Booking.id.in_(booking_pks),
+            Booking.event_id == event_id,
+            Booking.booking_status == "confirmed"
+        ))
+        .values(booking_status="checked_in", checkin_version=seq)
+        .returning(Booking.id, Booking.ticket_type_id)
+        .execution_options(synchronize_session=False)
+    )
+    return dict(result.all())
+
+# An event's organizer never changes, so staff checks can skip the database
+_organizers = LRUCache(maxsize=10000, ttl=3600)
+
+async def event_organizer(db: AsyncSession, event_id: int) -> Optional[int]:
+    organizer_id = _organizers.get(event_id)
+    if organizer_id is None:
+        result = await db.execute(select(Event.organizer_id).filter(Event.id == event_id))
+        organizer_id = result.scalar()
+        if organizer_id is not None:
+            _organizers.set(event_id, organizer_id)
+    return organizer_id
+
+class Bitmap:
+    # Growable bit set over booking primary keys: 10M bookings fit in ~1.2MB
+    def __init__(self):
+        self._bits = bytearray()
+
+    def add(self, n: int) -> None:
+        index = n >> 3
+        if index >= len(self._bits):
+            self._bits.extend(bytes(index - len(self._bits) + 1024))
+        self._bits[index] |= 1 << (n & 7)
+
+    def discard(self, n: int) -> None:
+        index = n >> 3
+        if index < len(self._bits):
+            self._bits[index] &= ~(1 << (n & 7)) & 0xFF
+
+    def __contains__(self, n: int) -> bool:
+        index = n >> 3
+        return index < len(self._bits) and bool(self._bits[index] & (1 << (n & 7)))
+
+# This worker's view of which bookings are checked in or no longer valid, used
+# by /verify. Refreshed per event from checkin_version at most every
+# QR_VERIFY_REFRESH_SECONDS, so verification itself never waits on the database.
+checked_in_bits = Bitmap()
+revoked_bits = Bitmap()
+_gate_state: Dict[int, Tuple[int, float]] = {}  # event_id -> (checkin_seq, synced at)
+
+def mark_checked_in(booking_pks: Iterable[int]) -> None:
+    for booking_pk in booking_pks:
+        checked_in_bits.add(booking_pk)
+
+async def sync_gate_state(db: AsyncSession, event_id: int) -> None:
+    state = _gate_state.get(event_id)
+    now = time.monotonic()
+    if state and now - state[1] < settings.QR_VERIFY_REFRESH_SECONDS:
+        return
+    
+    seq = (await db.execute(select(Event.checkin_seq).filter(Event.id == event_id))).scalar() or 0
+    if state is None:
+        result = await db.execute(select(Booking.id, Booking.booking_status).filter(
+            and_(Booking.event_id == event_id, Booking.booking_status != "confirmed")
+        ))
+    elif seq != state[0]:
+        result = await db.execute(select(Booking.id, Booking.booking_status).filter(
+            and_(Booking.event_id == event_id, Booking.checkin_version > state[0])
+        ))
+    else:
+        result = []
+    for booking_pk, status in result:
+        if status == "checked_in":
+            checked_in_bits.add(booking_pk)
+        elif status == "confirmed":
+            # A seat hold that has since been paid for
+            revoked_bits.discard(booking_pk)
+        else:
+            revoked_bits.add(booking_pk)
+    _gate_state[event_id] = (seq, now)
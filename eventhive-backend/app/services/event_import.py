@@ -0,0 +1,107 @@
+import csv
+import io
+from typing import Dict, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Category, Event, TicketType
+from app.schemas.schemas import EventCreate
+
+# Bulk event import. Every row is validated before anything is written (schema,
+# date order, ticket quantities, category ids in one query); rows that fail are
+# reported and skipped, the rest are inserted in one transaction with two
+# executemany statements: events (RETURNING ids, in parameter order) and then
+# all their ticket types.
+#
+# CSV layout: one line per ticket type. A line with a title starts an event;
+# following lines with an empty title add more tickets to it:
+#
+#   title,description,location,start_date,end_date,max_attendees,category_id,ticket_name,ticket_price,ticket_max_quantity,ticket_sale_start,ticket_sale_end
+#   Jazz Night,,Pune,2030-01-01T19:00:00,2030-01-01T23:00:00,,1,GA,500,200,,
+#   ,,,,,,,VIP,1500,20,,
+#
+# Rows are numbered from 1 in JSON; in CSV, by the line the event starts on.
+
+EVENT_COLUMNS = ("title", "description", "location", "start_date", "end_date", "max_attendees", "category_id")
+TICKET_COLUMNS = ("name", "price", "max_quantity", "sale_start", "sale_end")
+
+def parse_csv(text: str) -> List[Tuple[int, dict]]:
+    rows: List[Tuple[int, dict]] = []
+    reader = csv.DictReader(io.StringIO(text))
+    for line in reader:
+        line = {key.strip(): (value or "").strip() for key, value in line.items() if key}
+        ticket = {column: line[f"ticket_{column}"] for column in TICKET_COLUMNS if line.get(f"ticket_{column}")}
+        if line.get("title"):
+            event = {column: line[column] for column in EVENT_COLUMNS if line.get(column)}
+            event["tickets"] = [ticket] if ticket else []
+            rows.append((reader.line_num, event))
+        elif ticket and rows:
+            rows[-1][1]["tickets"].append(ticket)
+        elif ticket:
+            # A ticket line before any event: surfaces as a missing-title error
+            rows.append((reader.line_num, {"tickets": [ticket]}))
+    return rows
+
+def parse_json(data) -> List[Tuple[int, dict]]:
+    events = data.get("events") if isinstance(data, dict) else data
+    if not isinstance(events, list):
+        raise ValueError("Expected a list of events")
+    return [(index, event) for index, event in enumerate(events, start=1)]
+
+def _error_messages(error: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()]
+
+async def validate_events(db: AsyncSession, rows: List[Tuple[int, dict]]):
+    valid: List[Tuple[int, EventCreate]] = []
+    errors: List[dict] = []
+    for row, data in rows:
+        try:
+            event = EventCreate.model_validate(data)
+        except ValidationError as e:
+            errors.append({"row": row, "errors": _error_messages(e)})
+            continue
+        problems = []
+        if event.end_date <= event.start_date:
+            problems.append("end_date: must be after start_date")
+        if event.max_attendees is not None and event.max_attendees < 1:
+            problems.append("max_attendees: must be at least 1")
+        for index, ticket in enumerate(event.tickets):
+            if ticket.price < 0:
+                problems.append(f"tickets.{index}.price: must not be negative")
+            if ticket.max_quantity < 1:
+                problems.append(f"tickets.{index}.max_quantity: must be at least 1")
+        if problems:
+            errors.append({"row": row, "errors": problems})
+        else:
+            valid.append((row, event))
+
+    category_ids = {event.category_id for _, event in valid}
+    if category_ids:
+        result = await db.execute(select(Category.id).filter(Category.id.in_(category_ids)))
+        known = set(result.scalars().all())
+        for row, event in [item for item in valid if item[1].category_id not in known]:
+            errors.append({"row": row, "errors": [f"category_id: unknown category {event.category_id}"]})
+        valid = [item for item in valid if item[1].category_id in known]
+    errors.sort(key=lambda error: error["row"])
+    return valid, errors
+
+async def import_events(db: AsyncSession, organizer_id: int, rows: List[Tuple[int, dict]]) -> dict:
+    valid, errors = await validate_events(db, rows)
+    created: List[Dict[str, int]] = []
+    if valid:
+        result = await db.execute(
+            insert(Event).returning(Event.id, sort_by_parameter_order=True),
+            [{**event.model_dump(exclude={"tickets"}), "organizer_id": organizer_id} for _, event in valid]
+        )
+        event_ids = result.scalars().all()
+        tickets = [
+            {**ticket.model_dump(), "event_id": event_id}
+            for event_id, (_, event) in zip(event_ids, valid)
+            for ticket in event.tickets
+        ]
+        if tickets:
+            await db.execute(insert(TicketType), tickets)
+        await db.commit()
+        # New events are drafts, so no cached page lists them yet
+        created = [{"row": row, "id": event_id} for event_id, (row, _) in zip(event_ids, valid)]
+    return {"created": len(created), "failed": len(errors), "events": created, "errors": errors}
@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.database import get_async_session_local
+from app.models.models import Booking
+
+# Attendee exports stream straight from a server-side cursor: rows are fetched
+# EXPORT_BATCH_SIZE at a time as plain tuples (no ORM objects, never the QR
+# column) and written out per batch, so memory stays flat however large the
+# event. The export runs on a session of its own, one connection for its
+# whole duration.
+
+EXPORT_FIELDS = ["booking_id", "attendee_name", "attendee_email", "attendee_phone", "ticket_type",
+                 "quantity", "booking_status"]
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Spreadsheet apps run cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _csv_safe(value):
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+async def _batches(event_id: int, ticket_types: Dict[int, str]) -> AsyncIterator[list]:
+    async with get_async_session_local()() as db:
+        result = await db.stream(
+            select(Booking.booking_id, Booking.attendee_name, Booking.attendee_email, Booking.attendee_phone,
+                   Booking.ticket_type_id, Booking.quantity, Booking.booking_status)
+            .filter(Booking.event_id == event_id)
+            .order_by(Booking.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            yield [
+                (booking_id, name, email, phone, ticket_types.get(ticket_type_id), quantity, status)
+                for booking_id, name, email, phone, ticket_type_id, quantity, status in partition
+            ]
+
+async def export_csv(event_id: int, ticket_types: Dict[int, str]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    async for rows in _batches(event_id, ticket_types):
+        writer.writerows([_csv_safe(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+async def export_ndjson(event_id: int, ticket_types: Dict[int, str]) -> AsyncIterator[str]:
+    async for rows in _batches(event_id, ticket_types):
+        yield "".join(json.dumps(dict(zip(EXPORT_FIELDS, row)), separators=(",", ":")) + "\n" for row in rows)
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, select, update, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_session_local
+from app.core.metrics import registry
+from app.models.models import Booking, PromoCode, TicketType
+from app.services.analytics import record_sales
+from app.services.availability import publish_availability
+from app.services.checkin import UNSTAMPED, stamp_bookings
+from app.services.inventory import release_ticket_counts
+from app.services.response_cache import invalidate_event
+
+# Seat holds. With BOOKING_HOLD_SECONDS set, place_order writes bookings as
+# "held" (payment pending) with hold_expires_at. Their tickets are already
+# taken from TicketType.sold_quantity, so a hold counts against availability
+# like a sale. Confirming flips a hold to confirmed/paid and records the sale
+# for the analytics rollups; releasing it (the buyer cancels, or the sweeper
+# finds it lapsed) gives its tickets and promo code use back.
+#
+# Every transition is one conditional UPDATE on booking_status, so a confirm
+# racing the sweeper, or sweepers in several workers, settle each hold once.
+# Each transition leaves the bookings unstamped and stamps them with a new
+# check-in version once committed, so /verify and the gate manifests see a
+# hold confirmed or released without the event row being locked alongside the
+# bookings and ticket types.
+# Only live holds have hold_expires_at set and a partial index covers just
+# those rows, so the sweeper reads the oldest lapsed holds in batches without
+# scanning bookings.
+
+HELD = "held"
+# generate_order_id prefix: orders are held, confirmed and released as a whole
+ORDER_PREFIX = "ORD"
+
+holds_confirmed = registry.counter("holds_confirmed_total", "Seat holds confirmed as paid")
+holds_released = registry.counter("holds_released_total", "Seat holds released, by reason")
+
+def hold_expiry() -> Optional[datetime]:
+    if settings.BOOKING_HOLD_SECONDS <= 0:
+        return None
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.BOOKING_HOLD_SECONDS)
+
+def hold_filter(hold_id: str):
+    if hold_id.startswith(ORDER_PREFIX):
+        return Booking.order_id == hold_id
+    return Booking.booking_id == hold_id
+
+def payment_verified(hold_id: str, payment_id: Optional[str], signature: Optional[str]) -> bool:
+    # Stub: no payment gateway is integrated yet, so nothing here proves a
+    # payment was taken. Without HOLD_CONFIRM_SECRET (demo mode) a confirmation
+    # is taken as paid, as bookings were before holds. With it, whatever
+    # reports the payment signs "<hold_id>|<payment_id>" with that secret.
+    # This is not Razorpay's checkout signature, which covers an order created
+    # with Razorpay and is not something this code creates.
+    secret = settings.HOLD_CONFIRM_SECRET
+    if not secret:
+        return True
+    if not payment_id or not signature:
+        return False
+    expected = hmac.new(secret.encode(), f"{hold_id}|{payment_id}".encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+async def hold_statuses(db: AsyncSession, hold_id: str, user_id: int) -> List[str]:
+    result = await db.execute(select(Booking.booking_status).filter(
+        and_(hold_filter(hold_id), Booking.user_id == user_id)
+    ))
+    return list(result.scalars())
+
+async def _stamp(db: AsyncSession, rows) -> None:
+    # After the caller's commit: gives the bookings in rows (id, event_id) a new
+    # check-in version, so gate state and manifests pick up their status change
+    booking_pks: Dict[int, List[int]] = {}
+    for row in rows:
+        booking_pks.setdefault(row.event_id, []).append(row.id)
+    for event_id, pks in sorted(booking_pks.items()):
+        await stamp_bookings(db, event_id, Booking.id.in_(pks))
+
+async def confirm_hold(db: AsyncSession, hold_id: str, user_id: int) -> Optional[List[str]]:
+    # Booking ids confirmed, or None when there is no live hold to confirm
+    result = await db.execute(
+        update(Booking).where(and_(
+            hold_filter(hold_id),
+            Booking.user_id == user_id,
+            Booking.booking_status == HELD,
+            Booking.hold_expires_at > datetime.now(timezone.utc)
+        ))
+        .values(booking_status="confirmed", payment_status="paid", hold_expires_at=None,
+                checkin_version=UNSTAMPED)
+        .returning(Booking.id, Booking.event_id, Booking.booking_id, Booking.ticket_type_id,
+                   Booking.quantity, Booking.total_amount, Booking.created_at)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    if not rows:
+        await db.rollback()
+        return None
+    await db.commit()
+    # In the hour the hold was taken, as rebuild_analytics counts it
+    record_sales(rows[0].event_id, {row.ticket_type_id: (row.quantity, row.total_amount) for row in rows},
+                 booked_at=rows[0].created_at)
+    await _stamp(db, rows)
+    holds_confirmed.inc()
+    return [row.booking_id for row in rows]
+
+async def _release(db: AsyncSession, condition, status: str) -> Tuple[list, Dict[int, Dict[int, int]]]:
+    # Moves the live holds matching condition to status and gives back their
+    # tickets and promo uses; returns the released rows (id, event_id, ...) and
+    # the tickets left per event and ticket type. The caller commits, then
+    # stamps the rows.
+    result = await db.execute(
+        update(Booking).where(and_(Booking.booking_status == HELD, condition))
+        .values(booking_status=status, hold_expires_at=None, checkin_version=UNSTAMPED)
+        .returning(Booking.id, Booking.event_id, Booking.ticket_type_id, Booking.quantity, Booking.promo_code_id)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    quantities: Dict[int, int] = {}
+    promo_uses: Dict[int, int] = {}
+    for row in rows:
+        quantities[row.ticket_type_id] = quantities.get(row.ticket_type_id, 0) + row.quantity
+        if row.promo_code_id is not None:
+            promo_uses[row.promo_code_id] = promo_uses.get(row.promo_code_id, 0) + 1
+    if not quantities:
+        return [], {}
+
+    await release_ticket_counts(db, quantities)
+    if promo_uses:
+        table = PromoCode.__table__
+        await db.execute(
+            table.update()
+            .where(and_(table.c.id == bindparam("promo"), table.c.used_count >= bindparam("uses")))
+            .values(used_count=table.c.used_count - bindparam("uses")),
+            [{"promo": promo_id, "uses": uses} for promo_id, uses in sorted(promo_uses.items())]
+        )
+    result = await db.execute(
+        select(TicketType.id, TicketType.event_id, TicketType.max_quantity - TicketType.sold_quantity)
+        .filter(TicketType.id.in_(quantities))
+    )
+    remaining: Dict[int, Dict[int, int]] = {}
+    for ticket_type_id, event_id, left in result:
+        remaining.setdefault(event_id, {})[ticket_type_id] = left
+    return rows, remaining
+
+async def _announce(remaining: Dict[int, Dict[int, int]]) -> None:
+    for event_id, counts in remaining.items():
+        await invalidate_event(event_id)
+        await publish_availability(event_id, counts)
+
+async def release_hold(db: AsyncSession, hold_id: str, user_id: int) -> int:
+    rows, remaining = await _release(db, and_(hold_filter(hold_id), Booking.user_id == user_id), "cancelled")
+    await db.commit()
+    await _stamp(db, rows)
+    released = len(rows)
+    if released:
+        holds_released.inc(released, reason="cancelled")
+    await _announce(remaining)
+    return released
+
+async def sweep_expired_holds(batch_size: Optional[int] = None) -> int:
+    # Releases lapsed holds, oldest first, one batch per transaction; returns
+    # how many were released
+    batch_size = batch_size or settings.HOLD_SWEEP_BATCH_SIZE
+    total = 0
+    async with get_async_session_local()() as db:
+        while True:
+            expired = (
+                select(Booking.id).where(Booking.hold_expires_at <= datetime.now(timezone.utc))
+                .order_by(Booking.hold_expires_at).limit(batch_size).scalar_subquery()
+            )
+            rows, remaining = await _release(db, Booking.id.in_(expired), "expired")
+            await db.commit()
+            await _stamp(db, rows)
+            released = len(rows)
+            if released:
+                holds_released.inc(released, reason="expired")
+            await _announce(remaining)
+            total += released
+            if released < batch_size:
+                return total
+
+async def run_hold_sweeper() -> None:
+    # Runs in every worker; the conditional UPDATE keeps them from releasing a
+    # hold twice
+    while True:
+        try:
+            await sweep_expired_holds()
+        except Exception as e:
+            print(f"Hold sweep failed: {e!r}")
+        await asyncio.sleep(settings.HOLD_SWEEP_INTERVAL_SECONDS)
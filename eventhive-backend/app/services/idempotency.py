@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, Response
+from redis.exceptions import RedisError
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis import get_redis
+
+# Idempotency-Key support for endpoints that create things. The first request
+# with a key claims it (a short-lived "pending" record), runs, and stores its
+# response for IDEMPOTENCY_TTL_SECONDS; a retry with the same key and the same
+# body gets that response replayed instead of running again. A duplicate that
+# arrives while the first is still running waits for it. Keys are scoped to the
+# user and the endpoint.
+#
+# A request that fails releases its key, so the client can retry it: failures
+# (sold out, no admission token, ...) have not changed anything. A worker that
+# dies mid-request leaves a pending record that expires after
+# IDEMPOTENCY_LOCK_SECONDS.
+#
+# Records live in Redis so every worker sees them; without Redis (or while it
+# is unreachable) an in-process stand-in with the same semantics is used.
+
+MAX_KEY_LENGTH = 255
+REDIS_POLL_SECONDS = 0.05
+REPLAY_HEADER = "Idempotent-Replayed"
+
+idempotent_replays = registry.counter("idempotent_replays_total", "Responses replayed for a repeated Idempotency-Key")
+idempotent_waits = registry.counter("idempotent_waits_total", "Duplicates that waited for the first request")
+
+_memory_records = LRUCache(maxsize=settings.IDEMPOTENCY_CACHE_SIZE, ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+_memory_pending: Dict[str, dict] = {}
+
+def fingerprint(payload: Any) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def _claim(key: str, digest: str) -> Tuple[Optional[dict], bool]:
+    # (None when this request now owns the key, else the record already there;
+    # whether the record is in Redis). While Redis is unreachable the key is
+    # claimed in-process, so a retry to this worker is still deduplicated.
+    redis = get_redis()
+    if redis is not None:
+        pending = json.dumps({"fingerprint": digest})
+        try:
+            while True:
+                if await redis.set(key, pending, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS):
+                    return None, True
+                raw = await redis.get(key)
+                if raw is not None:
+                    return json.loads(raw), True
+                # Expired between SET and GET; try to claim it again
+        except RedisError as e:
+            print(f"Idempotency record for {key} not claimed in Redis, using this worker: {e}")
+
+    record = _memory_records.get(key) or _memory_pending.get(key)
+    if record is None:
+        _memory_pending[key] = {"fingerprint": digest, "done": asyncio.Event()}
+    return record, False
+
+async def _wait(record: dict, deadline: float) -> None:
+    done = record.get("done")
+    if done is None:
+        await asyncio.sleep(REDIS_POLL_SECONDS)
+        return
+    try:
+        await asyncio.wait_for(done.wait(), max(deadline - time.monotonic(), 0))
+    except asyncio.TimeoutError:
+        pass
+
+async def _finish(key: str, record: Optional[dict], shared: bool) -> None:
+    # Stores the response record, or releases the key when there is none, where
+    # _claim put it
+    redis = get_redis()
+    if shared and redis is not None:
+        try:
+            if record is None:
+                await redis.delete(key)
+            else:
+                await redis.set(key, json.dumps(record), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+        except RedisError as e:
+            # Not worth failing the request over; the pending record expires
+            print(f"Idempotency record for {key} not updated: {e}")
+        return
+
+    if record is not None:
+        _memory_records.set(key, record)
+    pending = _memory_pending.pop(key, None)
+    if pending is not None:
+        pending["done"].set()
+
+def _replay(record: dict, scope: str) -> Response:
+    idempotent_replays.inc(scope=scope)
+    return Response(content=record["body"], status_code=record["status"], media_type="application/json",
+                    headers={REPLAY_HEADER: "true"})
+
+async def run_idempotent(
+    idempotency_key: Optional[str],
+    user_id: int,
+    scope: str,
+    payload: Any,
+    handler: Callable[[], Awaitable[dict]]
+):
+    # Runs handler once per (user, scope, key); returns its result, or a
+    # Response replaying the stored one
+    if not idempotency_key:
+        return await handler()
+    if len(idempotency_key) > MAX_KEY_LENGTH:
+        raise HTTPException(400, f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters")
+
+    key = f"idempotency:{scope}:{user_id}:{idempotency_key}"
+    digest = fingerprint(payload)
+    deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_SECONDS
+    waited = False
+    while True:
+        record, shared = await _claim(key, digest)
+        if record is None:
+            break
+        if record["fingerprint"] != digest:
+            raise HTTPException(422, "Idempotency-Key was already used with a different request")
+        if "body" in record:
+            return _replay(record, scope)
+        if time.monotonic() >= deadline:
+            raise HTTPException(409, "A request with this Idempotency-Key is still in progress")
+        if not waited:
+            waited = True
+            idempotent_waits.inc(scope=scope)
+        await _wait(record, deadline)
+
+    try:
+        result = await handler()
+    except BaseException:
+        await _finish(key, None, shared)
+        raise
+    await _finish(key, {"fingerprint": digest, "status": 200, "body": json.dumps(result)}, shared)
+    return result
@@ -0,0 +1,36 @@
+from typing import Dict, Optional
+from sqlalchemy import bindparam, update, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import TicketType
+
+async def reserve_tickets(db: AsyncSession, ticket_type_id: int, event_id: int, quantity: int) -> Optional[int]:
+    # Single conditional UPDATE: the availability check and the increment happen
+    # atomically inside the database, so concurrent buyers can never oversell.
+    # The row is only locked from this statement until the caller commits.
+    # Returns the tickets left afterwards, or None when there were not enough.
+    result = await db.execute(
+        update(TicketType)
+        .where(and_(
+            TicketType.id == ticket_type_id,
+            TicketType.event_id == event_id,
+            TicketType.is_active == True,
+            TicketType.sold_quantity + quantity <= TicketType.max_quantity
+        ))
+        .values(sold_quantity=TicketType.sold_quantity + quantity)
+        .returning(TicketType.max_quantity - TicketType.sold_quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar()
+
+async def release_ticket_counts(db: AsyncSession, quantities: Dict[int, int]) -> None:
+    # ticket_type_id -> tickets to give back, as one executemany in id order
+    # (the order reserve_tickets locks rows in)
+    if not quantities:
+        return
+    table = TicketType.__table__
+    await db.execute(
+        table.update()
+        .where(and_(table.c.id == bindparam("ticket_type"), table.c.sold_quantity >= bindparam("released")))
+        .values(sold_quantity=table.c.sold_quantity - bindparam("released")),
+        [{"ticket_type": ticket_type_id, "released": quantity} for ticket_type_id, quantity in sorted(quantities.items())]
+    )
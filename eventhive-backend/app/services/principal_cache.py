@@ -0,0 +1,152 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.security import decode_token
+from app.models.models import User, UserRole
+
+# Decoded JWT claims keyed by the raw token, so repeated requests with the same
+# token skip signature verification. Entries never outlive the token's exp.
+_claims_cache = LRUCache(maxsize=settings.PRINCIPAL_CACHE_SIZE)
+# Snapshots of User rows keyed by id; the Redis tier is shared by all workers.
+_user_cache = LRUCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+# Revoked token ids (jti) known to this worker.
+_revoked = LRUCache(maxsize=settings.PRINCIPAL_CACHE_SIZE)
+
+USER_FIELDS = ["id", "email", "full_name", "phone", "role", "is_active", "loyalty_points", "created_at"]
+
+def _user_key(user_id: int) -> str:
+    return f"principal:user:{user_id}"
+
+def _revoked_key(jti: str) -> str:
+    return f"principal:revoked:{jti}"
+
+def _snapshot(user: User) -> dict:
+    data = {field: getattr(user, field) for field in USER_FIELDS}
+    data["role"] = data["role"].value if data["role"] is not None else None
+    data["created_at"] = data["created_at"].isoformat() if data["created_at"] else None
+    return data
+
+def _from_snapshot(data: dict) -> User:
+    data = dict(data)
+    data["role"] = UserRole(data["role"]) if data["role"] else None
+    data["created_at"] = datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
+    user = User(**data)
+    # Detached with an identity key: attribute access works without a session,
+    # and db.merge() resolves to the real row instead of inserting a copy.
+    make_transient_to_detached(user)
+    return user
+
+async def _is_revoked(jti: Optional[str]) -> bool:
+    if not jti:
+        return False
+    if jti in _revoked:
+        return True
+    redis = get_redis()
+    if redis is not None:
+        try:
+            if await redis.exists(_revoked_key(jti)):
+                _revoked.set(jti, True)
+                return True
+        except Exception:
+            pass
+    return False
+
+async def get_claims(token: str) -> Optional[dict]:
+    now = time.time()
+    claims = _claims_cache.get(token)
+    if claims is not None:
+        if claims.get("exp", 0) <= now or claims.get("jti") in _revoked:
+            _claims_cache.delete(token)
+            return None
+        return claims
+
+    claims = decode_token(token)
+    if not claims or await _is_revoked(claims.get("jti")):
+        return None
+
+    # Revocations made on other workers are picked up once this entry expires
+    ttl = min(claims.get("exp", now) - now, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    if ttl > 0:
+        _claims_cache.set(token, claims, ttl=ttl)
+    return claims
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    data = _user_cache.get(user_id)
+    redis = get_redis()
+    if data is None and redis is not None:
+        try:
+            raw = await redis.get(_user_key(user_id))
+            data = json.loads(raw) if raw else None
+        except Exception:
+            data = None
+        if data is not None:
+            _user_cache.set(user_id, data)
+    if data is not None:
+        return _from_snapshot(data)
+
+    result = await db.execute(select(User).filter(User.id == user_id))
+    user = result.scalars().first()
+    if not user:
+        return None
+
+    data = _snapshot(user)
+    _user_cache.set(user_id, data)
+    if redis is not None:
+        try:
+            await redis.set(_user_key(user_id), json.dumps(data), ex=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+        except Exception:
+            pass
+    return user
+
+async def revoke_token(token: str, claims: dict) -> None:
+    _claims_cache.delete(token)
+    jti = claims.get("jti")
+    if not jti:
+        return
+    ttl = max(int(claims.get("exp", 0) - time.time()), 1)
+    _revoked.set(jti, True, ttl=ttl)
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.set(_revoked_key(jti), 1, ex=ttl)
+        except Exception:
+            pass
+
+async def invalidate_user(user_id: int) -> None:
+    _user_cache.delete(user_id)
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.delete(_user_key(user_id))
+        except Exception:
+            pass
+
+# Invalidate cached principals whenever a User row changes. Ids are collected
+# during flush and dropped once the transaction commits.
+@event.listens_for(User, "after_update")
+def _track_user_update(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("principal_invalidations", set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    user_ids = session.info.pop("principal_invalidations", None)
+    if not user_ids:
+        return
+    for user_id in user_ids:
+        _user_cache.delete(user_id)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for user_id in user_ids:
+        loop.create_task(invalidate_user(user_id))
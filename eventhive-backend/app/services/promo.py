@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, NamedTuple, Optional
+from sqlalchemy import select, update, and_, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.models.models import PromoCode
+
+# Active promo codes are cached per event (codes scoped to that event) and
+# globally (codes with no event). Lookups of unknown codes are answered from
+# the cache without touching the database; the redemption itself is a single
+# conditional UPDATE in the booking transaction, so a stale cache can only
+# make a code fail late, never over-redeem it. Other workers pick up changes
+# when their entries expire.
+
+class PromoTerms(NamedTuple):
+    id: int
+    event_id: Optional[int]
+    discount_percent: int
+    discount_amount: Decimal
+    valid_until: Optional[datetime]
+
+GLOBAL = "global"
+_codes = LRUCache(maxsize=settings.PROMO_CACHE_SIZE, ttl=settings.PROMO_CACHE_TTL_SECONDS)
+
+def normalize_code(code: str) -> str:
+    return code.strip().upper()
+
+async def _load_codes(db: AsyncSession, event_id: Optional[int]) -> Dict[str, PromoTerms]:
+    key = GLOBAL if event_id is None else event_id
+    codes = _codes.get(key)
+    if codes is None:
+        scope = PromoCode.event_id.is_(None) if event_id is None else PromoCode.event_id == event_id
+        result = await db.execute(select(
+            PromoCode.id, PromoCode.event_id, PromoCode.code, PromoCode.discount_percent,
+            PromoCode.discount_amount, PromoCode.valid_until
+        ).filter(and_(scope, PromoCode.is_active == True)))
+        codes = {
+            normalize_code(row.code): PromoTerms(row.id, row.event_id, row.discount_percent or 0,
+                                                 Decimal(row.discount_amount or 0), row.valid_until)
+            for row in result
+        }
+        _codes.set(key, codes)
+    return codes
+
+async def find_promo(db: AsyncSession, code: str, event_id: int) -> Optional[PromoTerms]:
+    code = normalize_code(code)
+    terms = (await _load_codes(db, event_id)).get(code) or (await _load_codes(db, None)).get(code)
+    if terms is None or terms.valid_until is None:
+        return terms
+    valid_until = terms.valid_until
+    if valid_until.tzinfo is None:
+        valid_until = valid_until.replace(tzinfo=timezone.utc)
+    return terms if valid_until > datetime.now(timezone.utc) else None
+
+def invalidate_promo_codes(event_id: Optional[int]) -> None:
+    _codes.delete(GLOBAL if event_id is None else event_id)
+
+async def redeem_promo(db: AsyncSession, terms: PromoTerms, event_id: int) -> bool:
+    # Single conditional UPDATE: usage limit, expiry, scope and the increment
+    # are checked atomically; the row stays locked until the caller commits
+    result = await db.execute(
+        update(PromoCode)
+        .where(and_(
+            PromoCode.id == terms.id,
+            PromoCode.is_active == True,
+            PromoCode.used_count < PromoCode.max_uses,
+            or_(PromoCode.valid_until.is_(None), PromoCode.valid_until > func.now()),
+            or_(PromoCode.event_id.is_(None), PromoCode.event_id == event_id)
+        ))
+        .values(used_count=PromoCode.used_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def apply_discount(terms: PromoTerms, amounts: Dict[int, Decimal]) -> Dict[int, Decimal]:
+    # Percentages apply to every line; a fixed discount is used up line by line
+    cent = Decimal("0.01")
+    if terms.discount_percent > 0:
+        return {
+            key: (amount * (100 - min(terms.discount_percent, 100)) / 100).quantize(cent, ROUND_HALF_UP)
+            for key, amount in amounts.items()
+        }
+    remaining = terms.discount_amount
+    discounted = {}
+    for key, amount in amounts.items():
+        deduction = min(remaining, amount)
+        discounted[key] = amount - deduction
+        remaining -= deduction
+    return discounted
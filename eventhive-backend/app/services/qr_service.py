@@ -1,45 +1,126 @@
+import asyncio
+import base64
+import hashlib
+import hmac
 import qrcode
+import qrcode.image.svg
 import uuid
-import base64
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from sqlalchemy.orm import Session
-from app.models.models import PromoCode
-from decimal import Decimal
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.redis import get_redis
+from typing import Dict, NamedTuple, Optional
+
+QR_MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
 
+_qr_cache = LRUCache(maxsize=settings.QR_CACHE_SIZE)
+_qr_pool = None
+
+# 64 random bits: booking ids key /verify and check-in, so they must not collide
 def generate_booking_id() -> str:
-    return f"EVT{uuid.uuid4().hex[:8].upper()}"
+    return f"EVT{uuid.uuid4().hex[:16].upper()}"
+
+def generate_order_id() -> str:
+    return f"ORD{uuid.uuid4().hex[:16].upper()}"
+
+# Signed ticket payloads: EH1.<event_id>.<booking pk>.<booking_id>.<kid>.<mac>
+# where mac is a truncated HMAC-SHA256 over everything before it. Scanners and
+# /verify check them offline; the kid selects the key so keys can be rotated.
+QR_PAYLOAD_VERSION = "EH1"
+MAC_BYTES = 16
+
+def _load_signing_keys() -> Dict[str, bytes]:
+    keys = {}
+    for entry in settings.QR_SIGNING_KEYS.split(","):
+        if entry.strip():
+            kid, _, secret = entry.strip().partition(":")
+            if not kid or not secret or "." in kid:
+                raise ValueError("QR_SIGNING_KEYS entries must look like kid:secret")
+            keys[kid] = secret.encode()
+    if not keys:
+        keys["k0"] = hashlib.sha256(b"eventhive-qr|" + settings.SECRET_KEY.encode()).digest()
+    return keys
+
+SIGNING_KEYS = _load_signing_keys()
+ACTIVE_KID = next(iter(SIGNING_KEYS))
+
+class TicketClaims(NamedTuple):
+    event_id: int
+    booking_pk: int
+    booking_id: str
+    kid: str
 
-def generate_qr_code(booking_id: str, event_id: int) -> str:
-    qr_data = f"EVENTHIVE|{event_id}|{booking_id}"
+def _mac(key: bytes, message: str) -> str:
+    digest = hmac.new(key, message.encode(), hashlib.sha256).digest()[:MAC_BYTES]
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+def qr_payload(booking_pk: int, booking_id: str, event_id: int) -> str:
+    message = f"{QR_PAYLOAD_VERSION}.{event_id}.{booking_pk}.{booking_id}.{ACTIVE_KID}"
+    return f"{message}.{_mac(SIGNING_KEYS[ACTIVE_KID], message)}"
+
+def verify_qr_payload(payload: str) -> Optional[TicketClaims]:
+    message, _, mac = payload.rpartition(".")
+    parts = message.split(".")
+    if len(parts) != 5 or parts[0] != QR_PAYLOAD_VERSION:
+        return None
+    key = SIGNING_KEYS.get(parts[4])
+    if key is None or not hmac.compare_digest(_mac(key, message), mac):
+        return None
+    try:
+        return TicketClaims(int(parts[1]), int(parts[2]), parts[3], parts[4])
+    except ValueError:
+        return None
+
+def render_qr(data: str, fmt: str = "png") -> bytes:
     qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L)
-    qr.add_data(qr_data)
+    qr.add_data(data)
     qr.make(fit=True)
     
-    img = qr.make_image(fill_color="black", back_color="white")
     buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    return base64.b64encode(buffer.getvalue()).decode()
-
-def apply_promo_code(db: Session, code: str, event_id: int, amount: Decimal) -> Decimal:
-    promo = db.query(PromoCode).filter(
-        PromoCode.code == code,
-        PromoCode.is_active == True,
-        PromoCode.used_count < PromoCode.max_uses
-    ).first()
-    
-    if not promo:
-        return amount
-    
-    if promo.event_id and promo.event_id != event_id:
-        return amount
-    
-    discount = 0
-    if promo.discount_percent > 0:
-        discount = amount * (promo.discount_percent / 100)
-    elif promo.discount_amount > 0:
-        discount = min(promo.discount_amount, amount)
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def _get_qr_pool() -> ThreadPoolExecutor:
+    global _qr_pool
+    if _qr_pool is None:
+        _qr_pool = ThreadPoolExecutor(max_workers=settings.QR_RENDER_WORKERS, thread_name_prefix="qr-render")
+    return _qr_pool
+
+def shutdown_qr_pool():
+    global _qr_pool
+    if _qr_pool is not None:
+        _qr_pool.shutdown(wait=False)
+        _qr_pool = None
+
+async def get_qr_image(booking_pk: int, booking_id: str, event_id: int, fmt: str = "png") -> bytes:
+    # In-process LRU -> Redis -> render on the pool. The payload is derived only
+    # from the booking and the signing key, so a rendered image never goes stale.
+    data = qr_payload(booking_pk, booking_id, event_id)
+    key = f"qr:{fmt}:{data}"
+    image = _qr_cache.get(key)
+    if image is not None:
+        return image
     
-    promo.used_count += 1
-    db.commit()
+    redis = get_redis()
+    if redis is not None:
+        try:
+            image = await redis.get(key)
+        except Exception:
+            image = None
+        if image is not None:
+            _qr_cache.set(key, image)
+            return image
     
-    return max(amount - discount, 0)
\ No newline at end of file
+    loop = asyncio.get_running_loop()
+    image = await loop.run_in_executor(_get_qr_pool(), render_qr, data, fmt)
+    _qr_cache.set(key, image)
+    if redis is not None:
+        try:
+            await redis.set(key, image, ex=settings.QR_REDIS_TTL_SECONDS)
+        except Exception:
+            pass
+    return image
@@ -0,0 +1,141 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from pydantic import TypeAdapter
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis import get_redis
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+cache_hits = registry.counter("response_cache_hits_total", "Response cache hits")
+cache_misses = registry.counter("response_cache_misses_total", "Response cache misses")
+
+def _adapter(response_type: Any) -> TypeAdapter:
+    adapter = _adapters.get(response_type)
+    if adapter is None:
+        adapter = _adapters[response_type] = TypeAdapter(response_type)
+    return adapter
+
+def dump_json(response_type: Any, value: Any) -> bytes:
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+def dump_constructed(response_type: Any, value: Any) -> bytes:
+    # For models already built with model_construct: serialize, skip validation
+    return _adapter(response_type).dump_json(value)
+
+# Serialized JSON responses, tagged so writes can invalidate exactly the entries
+# they affect. Uses Redis when connected, otherwise an in-process LRU.
+class ResponseCache:
+    def __init__(self, namespace: str, maxsize: int, ttl: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Local entries are (body, tags); a key leaves its tags' sets when it is
+        # evicted, expires or is invalidated, so the tag map stays bounded too
+        self._local = LRUCache(maxsize=maxsize, ttl=ttl, on_evict=self._untag)
+        self._local_tags: Dict[str, Set[str]] = {}
+
+    def make_key(self, endpoint: str, params: Dict[str, Any], text: Iterable[str] = ()) -> str:
+        # Only the free-text filters named in text are case- and
+        # whitespace-insensitive; anything else (an opaque cursor) is kept as is
+        text = set(text)
+        normalized = {}
+        for name, value in params.items():
+            if value is None:
+                continue
+            if name in text and isinstance(value, str):
+                value = value.strip().lower()
+            normalized[name] = value
+        digest = hashlib.sha1(json.dumps(normalized, sort_keys=True, default=str).encode()).hexdigest()
+        return f"cache:{self.namespace}:{endpoint}:{digest}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"cache:{self.namespace}:tag:{tag}"
+
+    def _untag(self, key: str, entry: Tuple[bytes, Tuple[str, ...]]) -> None:
+        for tag in entry[1]:
+            keys = self._local_tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._local_tags[tag]
+
+    async def get(self, key: str) -> Optional[bytes]:
+        redis = get_redis()
+        if redis is not None:
+            try:
+                body = await redis.get(key)
+            except Exception:
+                body = None
+        else:
+            entry = self._local.get(key)
+            body = entry[0] if entry is not None else None
+
+        if body is None:
+            self.misses += 1
+            cache_misses.inc(namespace=self.namespace)
+        else:
+            self.hits += 1
+            cache_hits.inc(namespace=self.namespace)
+        return body
+
+    async def set(self, key: str, body: bytes, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.set(key, body, ex=self.ttl)
+                    for tag in tags:
+                        pipe.sadd(self._tag_key(tag), key)
+                        pipe.expire(self._tag_key(tag), self.ttl)
+                    await pipe.execute()
+            except Exception:
+                pass
+            return
+
+        previous = self._local.get(key)
+        if previous is not None:
+            self._untag(key, previous)
+        self._local.set(key, (body, tags))
+        for tag in tags:
+            self._local_tags.setdefault(tag, set()).add(key)
+
+    async def invalidate(self, *tags: str) -> None:
+        redis = get_redis()
+        if redis is not None:
+            try:
+                for tag in tags:
+                    keys = await redis.smembers(self._tag_key(tag))
+                    await redis.delete(self._tag_key(tag), *keys)
+            except Exception:
+                pass
+            return
+
+        for tag in tags:
+            for key in self._local_tags.pop(tag, ()):
+                entry = self._local.get(key)
+                if entry is not None:
+                    self._untag(key, entry)
+                    self._local.delete(key)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis" if get_redis() is not None else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+event_cache = ResponseCache("events", maxsize=settings.EVENT_CACHE_SIZE, ttl=settings.EVENT_CACHE_TTL_SECONDS)
+
+async def invalidate_event(event_id: int, listed: bool = False) -> None:
+    # Pages containing the event carry its tag; a newly listed event can land on
+    # any listing page, so those are dropped as a group.
+    tags = [f"event:{event_id}"]
+    if listed:
+        tags.append("events:list")
+    await event_cache.invalidate(*tags)
@@ -0,0 +1,101 @@
+import asyncio
+import difflib
+import math
+import re
+from typing import List, Optional
+from sqlalchemy import text, Integer, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# The index itself (events_fts + events_fts_vocab on SQLite, GIN indexes on
+# SEARCH_DOCUMENT and trigrams on PostgreSQL) is created by migrations/versions/0002.
+
+# Must match the indexed expression in migration 0002 exactly
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B'))"
+)
+
+MAX_TERMS = 8
+TYPO_CANDIDATES = 3
+TYPO_CUTOFF = 0.75
+# Upper bound on vocabulary terms compared against one misspelt term, half
+# from either side of it in sort order
+TYPO_SCAN_LIMIT = 500
+
+def tokenize(value: str) -> List[str]:
+    return re.findall(r"\w+", value.lower())[:MAX_TERMS]
+
+async def _sqlite_term(db: AsyncSession, term: str) -> str:
+    # Prefix match, widened with close vocabulary terms when nothing matches the
+    # prefix (typo tolerance). Only terms sharing the first letter, of a length
+    # that can reach the cutoff, are compared, and at most TYPO_SCAN_LIMIT of
+    # them; the comparison runs off the event loop.
+    prefix = f'"{term}"*'
+    if len(term) < 3:
+        return prefix
+    hit = await db.execute(
+        text("SELECT 1 FROM events_fts_vocab WHERE term >= :t AND term < :end LIMIT 1"),
+        {"t": term, "end": term + "\uffff"}
+    )
+    if hit.first():
+        return prefix
+    # difflib's ratio is at most 2 * shorter / (both lengths), so terms outside
+    # this length window cannot reach the cutoff
+    shortest = math.ceil(len(term) * TYPO_CUTOFF / (2 - TYPO_CUTOFF))
+    longest = math.floor(len(term) * (2 - TYPO_CUTOFF) / TYPO_CUTOFF)
+    # The terms sorting nearest the typo, on either side of it
+    params = {"lo": term[0], "t": term, "hi": chr(ord(term[0]) + 1), "shortest": shortest,
+              "longest": longest, "limit": TYPO_SCAN_LIMIT // 2}
+    vocabulary = []
+    for query in (
+        "SELECT term FROM events_fts_vocab WHERE term >= :t AND term < :hi "
+        "AND length(term) BETWEEN :shortest AND :longest ORDER BY term LIMIT :limit",
+        "SELECT term FROM events_fts_vocab WHERE term >= :lo AND term < :t "
+        "AND length(term) BETWEEN :shortest AND :longest ORDER BY term DESC LIMIT :limit",
+    ):
+        result = await db.execute(text(query), params)
+        vocabulary.extend(row[0] for row in result)
+    candidates = await asyncio.get_running_loop().run_in_executor(
+        None, lambda: difflib.get_close_matches(term, vocabulary, n=TYPO_CANDIDATES, cutoff=TYPO_CUTOFF)
+    )
+    return "(" + " OR ".join([prefix] + [f'"{c}"' for c in candidates]) + ")"
+
+# Subquery of (id, rank) for events matching the search terms and location, or
+# None when there is nothing to search for or no backend. Higher rank is better.
+async def search_subquery(db: AsyncSession, search: Optional[str] = None, location: Optional[str] = None):
+    search_terms = tokenize(search or "")
+    location_terms = tokenize(location or "")
+    if not search_terms and not location_terms:
+        return None
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        clauses = []
+        if search_terms:
+            terms = [await _sqlite_term(db, term) for term in search_terms]
+            clauses.append("{title description} : (" + " AND ".join(terms) + ")")
+        if location_terms:
+            clauses.append("location : (" + " AND ".join(f'"{t}"*' for t in location_terms) + ")")
+        return text(
+            "SELECT rowid AS id, -bm25(events_fts, 10.0, 2.0, 1.0) AS rank "
+            "FROM events_fts WHERE events_fts MATCH :match"
+        ).bindparams(match=" AND ".join(clauses)).columns(id=Integer, rank=Float).subquery("search")
+
+    if dialect == "postgresql":
+        conditions = []
+        params = {}
+        rank = "0"
+        if search_terms:
+            params["tsquery"] = " & ".join(f"{t}:*" for t in search_terms)
+            params["raw"] = " ".join(search_terms)
+            conditions.append(f"({SEARCH_DOCUMENT} @@ to_tsquery('english', :tsquery) OR :raw <% title)")
+            rank = (f"ts_rank({SEARCH_DOCUMENT}, to_tsquery('english', :tsquery)) "
+                    "+ word_similarity(:raw, title)")
+        if location_terms:
+            params["location"] = f"%{' '.join(location_terms)}%"
+            conditions.append("location ILIKE :location")
+        return text(
+            f"SELECT id, {rank} AS rank FROM events WHERE {' AND '.join(conditions)}"
+        ).bindparams(**params).columns(id=Integer, rank=Float).subquery("search")
+
+    return None
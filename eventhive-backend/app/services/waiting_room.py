@@ -0,0 +1,185 @@
+import base64
+import hashlib
+import hmac
+import math
+import time
+from typing import Dict, Optional, Tuple
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.metrics import registry
+from app.core.redis import get_redis
+from app.models.models import Event
+
+# Per-event virtual waiting room. Every buyer draws a ticket number (1, 2, 3...);
+# the admitted count grows at the event's admit rate, and a buyer whose number
+# is at or below it receives a signed admission token for the booking
+# endpoints. Credit does not pile up while the queue is empty: a buyer who
+# arrives with admissions to spare is let in and restarts the clock from their
+# ticket, so a sudden rush after a quiet spell is still metered.
+#
+# State lives in Redis (a hash for the clock plus a sorted set of user ->
+# ticket number) so all workers share one queue; without Redis, or while it
+# errors, an in-process stand-in with the same semantics is used.
+
+waiting_room_joins = registry.counter("waiting_room_joins_total", "Buyers who joined a waiting room")
+waiting_room_admissions = registry.counter("waiting_room_admissions_total", "Admission tokens issued")
+waiting_room_depth = registry.gauge("waiting_room_depth", "Buyers waiting, as last observed by this worker")
+
+MAX_RETRY_AFTER = 30
+# Waiting rooms may be switched on mid-sale; cache the flag only briefly
+_configs = LRUCache(maxsize=10000, ttl=5)
+
+JOIN_SCRIPT = """
+local now = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'c', 's')
+local base_time = tonumber(state[1]) or 0
+local base_count = tonumber(state[2]) or 0
+local seq = tonumber(state[3]) or 0
+local credit = base_count + math.floor((now - base_time) * rate)
+local ticket = tonumber(redis.call('ZSCORE', KEYS[2], ARGV[1]))
+local joined = 0
+if not ticket then
+    joined = 1
+    seq = seq + 1
+    ticket = seq
+    if credit >= seq then
+        base_time = now
+        base_count = seq
+        credit = seq
+    end
+    redis.call('ZADD', KEYS[2], ticket, ARGV[1])
+    redis.call('HSET', KEYS[1], 't', tostring(base_time), 'c', base_count, 's', seq)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return {ticket, math.min(credit, seq), seq, joined}
+"""
+
+STATS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 't', 'c', 's')
+local seq = tonumber(state[3]) or 0
+local credit = (tonumber(state[2]) or 0) + math.floor((now - (tonumber(state[1]) or 0)) * rate)
+return {math.min(credit, seq), seq}
+"""
+
+class MemoryQueue:
+    def __init__(self):
+        self.base_time = 0.0
+        self.base_count = 0
+        self.seq = 0
+        self.tickets: Dict[int, int] = {}
+        # Dropped once nobody has joined for WAITING_ROOM_TTL_SECONDS, like the
+        # Redis keys, so tickets do not pile up for the life of the worker
+        self.expires_at = 0.0
+
+    def credit(self, now: float, rate: float) -> int:
+        return self.base_count + math.floor((now - self.base_time) * rate)
+
+    def join(self, user_id: int, now: float, rate: float) -> Tuple[int, int, int, int]:
+        credit = self.credit(now, rate)
+        ticket = self.tickets.get(user_id)
+        joined = 0
+        if ticket is None:
+            joined = 1
+            self.seq += 1
+            ticket = self.tickets[user_id] = self.seq
+            if credit >= self.seq:
+                self.base_time = now
+                self.base_count = credit = self.seq
+        self.expires_at = now + settings.WAITING_ROOM_TTL_SECONDS
+        return ticket, min(credit, self.seq), self.seq, joined
+
+_memory_queues: Dict[int, MemoryQueue] = {}
+
+def _memory_queue(event_id: int, now: float) -> MemoryQueue:
+    # Prunes every expired queue, then returns this event's (new if need be)
+    for expired in [key for key, queue in _memory_queues.items() if queue.expires_at <= now]:
+        del _memory_queues[expired]
+    return _memory_queues.setdefault(event_id, MemoryQueue())
+
+def _queue_keys(event_id: int) -> list:
+    return [f"waiting_room:{event_id}:state", f"waiting_room:{event_id}:tickets"]
+
+def _sign(message: str) -> str:
+    key = hashlib.sha256(b"eventhive-admission|" + settings.SECRET_KEY.encode()).digest()
+    digest = hmac.new(key, message.encode(), hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+def issue_admission_token(event_id: int, user_id: int) -> str:
+    message = f"{event_id}.{user_id}.{int(time.time()) + settings.WAITING_ROOM_TOKEN_TTL_SECONDS}"
+    return f"{message}.{_sign(message)}"
+
+def check_admission_token(token: Optional[str], event_id: int, user_id: int) -> bool:
+    if not token:
+        return False
+    message, _, mac = token.rpartition(".")
+    parts = message.split(".")
+    if len(parts) != 3 or not hmac.compare_digest(_sign(message), mac):
+        return False
+    try:
+        return int(parts[0]) == event_id and int(parts[1]) == user_id and int(parts[2]) >= time.time()
+    except ValueError:
+        return False
+
+async def waiting_room_rate(db: AsyncSession, event_id: int) -> Optional[int]:
+    # Admissions per second when the event has a waiting room, else None
+    config = _configs.get(event_id)
+    if config is None:
+        result = await db.execute(select(Event.waiting_room_rate).filter(Event.id == event_id))
+        config = (result.scalar() or 0,)
+        _configs.set(event_id, config)
+    return config[0] or None
+
+def forget_config(event_id: int) -> None:
+    _configs.delete(event_id)
+
+async def join_queue(event_id: int, user_id: int, rate: int) -> dict:
+    now = time.time()
+    redis = get_redis()
+    result = None
+    if redis is not None:
+        try:
+            result = await redis.eval(
+                JOIN_SCRIPT, 2, *_queue_keys(event_id), user_id, repr(now), rate,
+                settings.WAITING_ROOM_TTL_SECONDS
+            )
+        except RedisError as e:
+            print(f"Waiting room for event {event_id} not reached in Redis, using this worker: {e}")
+    if result is not None:
+        ticket, admitted, seq, joined = (int(value) for value in result)
+    else:
+        ticket, admitted, seq, joined = _memory_queue(event_id, now).join(user_id, now, rate)
+
+    if joined:
+        waiting_room_joins.inc(event=event_id)
+    waiting_room_depth.set(max(seq - admitted, 0), event=event_id)
+    position = ticket - admitted
+    if position <= 0:
+        waiting_room_admissions.inc(event=event_id)
+        return {"admitted": True, "admission_token": issue_admission_token(event_id, user_id),
+                "expires_in": settings.WAITING_ROOM_TOKEN_TTL_SECONDS}
+    return {"admitted": False, "position": position,
+            "retry_after": min(max(math.ceil(position / rate), 1), MAX_RETRY_AFTER)}
+
+async def queue_stats(event_id: int, rate: int) -> dict:
+    now = time.time()
+    redis = get_redis()
+    result = None
+    if redis is not None:
+        try:
+            result = await redis.eval(STATS_SCRIPT, 1, _queue_keys(event_id)[0], repr(now), rate)
+        except RedisError as e:
+            print(f"Waiting room stats for event {event_id} not read from Redis, using this worker: {e}")
+    if result is not None:
+        admitted, seq = (int(value) for value in result)
+    else:
+        queue = _memory_queue(event_id, now)
+        admitted, seq = min(queue.credit(now, rate), queue.seq), queue.seq
+    return {"event_id": event_id, "admit_rate": rate, "depth": max(seq - admitted, 0),
+            "admitted": admitted, "joined": seq}
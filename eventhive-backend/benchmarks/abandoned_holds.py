@@ -0,0 +1,160 @@
+"""Abandoned seat holds: --holds buyers hold tickets at once through the real
+POST /api/bookings/ endpoint, every --pay-every-th one pays (confirms), and
+the rest walk away. Their holds are then aged past expiry and one sweep
+releases them.
+
+Checks that the sweep released exactly the abandoned holds, that sold counts,
+the analytics rollups and the published availability all come back to the
+paid tickets, and reports the sweep's throughput and statements per batch.
+The app's own background sweeper is not running here (no lifespan), so the
+sweep is timed on its own.
+
+    python -m benchmarks.abandoned_holds --holds 10000
+    python -m benchmarks.abandoned_holds --database-url postgresql://... --batch-size 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--holds", type=int, default=10000)
+    parser.add_argument("--ticket-types", type=int, default=4)
+    parser.add_argument("--pay-every", type=int, default=10, help="every Nth buyer confirms; 0 for nobody")
+    parser.add_argument("--batch-size", type=int, default=500, help="HOLD_SWEEP_BATCH_SIZE")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/holds.db"
+os.environ["DATABASE_URL"] = args.database_url
+# Long enough for every buyer to pay under this much contention; the
+# abandoned holds are aged past their expiry afterwards
+os.environ["BOOKING_HOLD_SECONDS"] = "3600"
+os.environ["HOLD_SWEEP_BATCH_SIZE"] = str(args.batch_size)
+# Every hold is in flight at once; let them queue for a connection
+os.environ.setdefault("DB_POOL_TIMEOUT", "600")
+if args.database_url.startswith("sqlite"):
+    # SQLite has a single writer: one connection keeps transactions from
+    # failing with "database is locked" instead of waiting their turn
+    os.environ.setdefault("DB_POOL_SIZE", "1")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+
+import httpx
+from sqlalchemy import event, select, update, func
+from app.api.main import app
+from app.core.database import get_async_engine, get_session_local
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, TicketType, TicketTypeSales
+from app.services.availability import subscribe, unsubscribe
+from app.services.holds import sweep_expired_holds
+from seed import create_seed_data
+
+async def login(client, email, password):
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def setup(client, organizer):
+    # Capacity for every hold, so the sale is sold out until the sweep
+    per_type = -(-args.holds // args.ticket_types)
+    response = await client.post("/api/events/", headers=organizer, json={
+        "title": "Abandoned Carts", "location": "Bench", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": f"Tier {i}", "price": 100 * (i + 1), "max_quantity": per_type}
+                    for i in range(args.ticket_types)],
+    })
+    response.raise_for_status()
+    created = response.json()
+    (await client.put(f"/api/events/{created['id']}/publish", headers=organizer)).raise_for_status()
+    return created["id"], {ticket["id"]: per_type for ticket in created["tickets"]}
+
+async def hold(client, headers, event_id, ticket_type_id):
+    response = await client.post("/api/bookings/", headers=headers, json={
+        "event_id": event_id, "ticket_type_id": ticket_type_id, "quantity": 1,
+        "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+    })
+    response.raise_for_status()
+    return response.json()
+
+async def pay(client, headers, hold_id):
+    (await client.post(f"/api/bookings/holds/{hold_id}/confirm", headers=headers)).raise_for_status()
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=900) as client:
+        organizer = await login(client, "organizer@eventhive.com", "organizer123")
+        attendee = await login(client, "user@eventhive.com", "user123")
+        event_id, capacity = await setup(client, organizer)
+        ticket_types = sorted(capacity)
+
+        start = time.perf_counter()
+        holds = await asyncio.gather(*(hold(client, attendee, event_id, ticket_types[i % len(ticket_types)])
+                                       for i in range(args.holds)))
+        hold_elapsed = time.perf_counter() - start
+        paid = [h for i, h in enumerate(holds) if args.pay_every and i % args.pay_every == 0]
+        start = time.perf_counter()
+        await asyncio.gather(*(pay(client, attendee, h["hold_id"]) for h in paid))
+        pay_elapsed = time.perf_counter() - start
+
+    with get_session_local()() as db:
+        paid_by_type = dict(db.execute(
+            select(Booking.ticket_type_id, func.sum(Booking.quantity))
+            .filter(Booking.event_id == event_id, Booking.booking_status == "confirmed")
+            .group_by(Booking.ticket_type_id)
+        ).all())
+        # Age the abandoned holds past their expiry rather than wait it out
+        db.execute(update(Booking).where(Booking.hold_expires_at.is_not(None)).values(
+            hold_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+        ).execution_options(synchronize_session=False))
+        db.commit()
+
+    statements = 0
+    def count(*_):
+        nonlocal statements
+        statements += 1
+    event.listen(get_async_engine().sync_engine, "before_cursor_execute", count)
+    subscriber = subscribe(event_id)
+    start = time.perf_counter()
+    released = await sweep_expired_holds()
+    sweep_elapsed = time.perf_counter() - start
+    published = subscriber.take()
+    unsubscribe(event_id, subscriber)
+    event.remove(get_async_engine().sync_engine, "before_cursor_execute", count)
+    again = await sweep_expired_holds()
+
+    with get_session_local()() as db:
+        statuses = dict(db.execute(select(Booking.booking_status, func.count(Booking.id))
+                                   .filter(Booking.event_id == event_id).group_by(Booking.booking_status)).all())
+        sold = dict(db.execute(select(TicketType.id, TicketType.sold_quantity)
+                               .filter(TicketType.event_id == event_id)).all())
+        rollup = db.scalar(select(func.sum(TicketTypeSales.tickets)).filter(TicketTypeSales.event_id == event_id))
+        live = db.scalar(select(func.count(Booking.id)).filter(Booking.hold_expires_at.is_not(None)))
+
+    abandoned = args.holds - len(paid)
+    batches = -(-max(released, 1) // args.batch_size)
+    expected_left = {str(t): capacity[t] - paid_by_type.get(t, 0) for t in ticket_types}
+    print(f"database:           {args.database_url.split(':')[0]}")
+    print(f"holds:              {len(holds)} in {hold_elapsed:.2f}s ({len(holds) / hold_elapsed:.0f}/s)")
+    print(f"paid:               {len(paid)} in {pay_elapsed:.2f}s")
+    print(f"sweep:              {released} released in {sweep_elapsed:.2f}s ({released / max(sweep_elapsed, 1e-9):.0f}/s), "
+          f"{batches} batches of <= {args.batch_size}, {statements} statements")
+    print(f"second sweep:       {again} released")
+    print(f"booking statuses:   {dict(sorted(statuses.items()))}")
+    print(f"sold / rollup:      {sum(sold.values())} / {rollup or 0} (paid {len(paid)})")
+    print(f"published left:     {published}")
+    print(f"live holds left:    {live}")
+    if not (released == abandoned and again == 0 and live == 0
+            and statuses.get("expired", 0) == abandoned and statuses.get("confirmed", 0) == len(paid)
+            and sum(sold.values()) == (rollup or 0) == len(paid)
+            and published == expected_left):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
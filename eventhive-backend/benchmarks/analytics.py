@@ -0,0 +1,108 @@
+"""Sales analytics benchmark: the rollup-backed dashboard versus aggregating
+an event's bookings at request time, as the booking count grows.
+
+Loads --bookings rows for one event, backfills the rollups with
+rebuild_analytics, then times both reads.
+
+    python -m benchmarks.analytics --bookings 1000000
+    python -m benchmarks.analytics --database-url postgresql://... --bookings 200000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--bookings", type=int, default=200000)
+    parser.add_argument("--days", type=int, default=30, help="spread bookings over this many days of sales")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/analytics.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+from sqlalchemy import insert, select, func, case
+from app.core.database import get_async_session_local, get_session_local, dispose_engines
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, Event, TicketType
+from app.services.analytics import COUNTED_STATUSES, event_analytics, rebuild_analytics
+from seed import create_seed_data
+
+def load_bookings(rng):
+    with get_session_local()() as db:
+        event = db.execute(select(Event)).scalars().first()
+        ticket_types = db.execute(select(TicketType).filter(TicketType.event_id == event.id)).scalars().all()
+        start = datetime.now(timezone.utc) - timedelta(days=args.days)
+        batch = []
+        for i in range(args.bookings):
+            ticket = rng.choice(ticket_types)
+            quantity = rng.randint(1, 4)
+            batch.append({
+                "booking_id": f"BENCH{i:010d}", "user_id": event.organizer_id, "event_id": event.id,
+                "ticket_type_id": ticket.id, "quantity": quantity, "total_amount": ticket.price * quantity,
+                "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+                "booking_status": rng.choice(["confirmed", "confirmed", "checked_in", "cancelled"]),
+                "created_at": start + timedelta(seconds=rng.uniform(0, args.days * 86400)),
+            })
+            if len(batch) == 10000:
+                db.execute(insert(Booking), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Booking), batch)
+        db.commit()
+        return event.id
+
+async def aggregate_bookings(db, event_id):
+    # What a dashboard without rollups would run on every load
+    scope = (Booking.event_id == event_id, Booking.booking_status.in_(COUNTED_STATUSES))
+    await db.execute(select(
+        Booking.ticket_type_id, func.count(Booking.id), func.sum(Booking.quantity), func.sum(Booking.total_amount),
+        func.sum(case((Booking.booking_status == "checked_in", 1), else_=0))
+    ).filter(*scope).group_by(Booking.ticket_type_id))
+    day = func.date(Booking.created_at)
+    return (await db.execute(select(day, func.count(Booking.id), func.sum(Booking.total_amount))
+                             .filter(*scope).group_by(day))).all()
+
+async def timed(fn, *fn_args):
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        await fn(*fn_args)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+async def main():
+    rng = random.Random(args.seed)
+    upgrade_database()
+    create_seed_data()
+    event_id = load_bookings(rng)
+
+    start = time.perf_counter()
+    with get_session_local()() as db:
+        ticket_rows, hour_rows = rebuild_analytics(db, event_id)
+    rebuild_seconds = time.perf_counter() - start
+
+    async with get_async_session_local()() as db:
+        rollup_ms = await timed(event_analytics, db, event_id, "day")
+        aggregate_ms = await timed(aggregate_bookings, db, event_id)
+        summary = await event_analytics(db, event_id, "day")
+    await dispose_engines()
+
+    print(f"bookings: {args.bookings} over {args.days} days; rollups: {ticket_rows} ticket type rows, "
+          f"{hour_rows} hourly rows (rebuilt in {rebuild_seconds:.1f}s)")
+    print(f"dashboard from rollups:     {rollup_ms:>10.2f}ms")
+    print(f"aggregating bookings:       {aggregate_ms:>10.2f}ms")
+    print(f"revenue {summary['revenue']:.2f}, tickets {summary['tickets_sold']}, "
+          f"check-in rate {summary['checkin_rate']:.2%}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
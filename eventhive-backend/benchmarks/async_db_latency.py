@@ -0,0 +1,124 @@
+"""Event-loop blocking benchmark: sync Session vs AsyncSession inside async handlers.
+
+Runs a mix of slow and fast queries concurrently against one worker and reports
+the latency of the fast requests. "before" is the old pattern (a blocking
+Session used from an async def route); "after" uses the AsyncSession dependency.
+
+    python -m benchmarks.async_db_latency
+    python -m benchmarks.async_db_latency --database-url postgresql://... --slow 20 --fast 200
+
+Requires httpx.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--slow", type=int, default=10, help="concurrent slow requests")
+    parser.add_argument("--fast", type=int, default=100, help="fast requests issued while the slow ones run")
+    parser.add_argument("--slow-ms", type=int, default=200, help="approximate duration of one slow query")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/latency.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker, Session
+from app.core.database import get_async_url
+
+sync_engine = create_engine(args.database_url)
+async_engine = create_async_engine(get_async_url(args.database_url))
+SyncSession = sessionmaker(bind=sync_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine)
+
+if sync_engine.dialect.name == "sqlite":
+    # A recursive CTE is the simplest way to make SQLite spend wall-clock time
+    SLOW_QUERY = text("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < :n) "
+                      "SELECT count(*) FROM c").bindparams(n=args.slow_ms * 2000)
+else:
+    SLOW_QUERY = text("SELECT pg_sleep(:s)").bindparams(s=args.slow_ms / 1000)
+FAST_QUERY = text("SELECT 1")
+
+def get_sync_db():
+    db = SyncSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+app = FastAPI()
+
+@app.get("/before/slow")
+async def before_slow(db: Session = Depends(get_sync_db)):
+    return {"result": db.execute(SLOW_QUERY).scalar()}
+
+@app.get("/before/fast")
+async def before_fast(db: Session = Depends(get_sync_db)):
+    return {"result": db.execute(FAST_QUERY).scalar()}
+
+@app.get("/after/slow")
+async def after_slow(db: AsyncSession = Depends(get_async_db)):
+    return {"result": (await db.execute(SLOW_QUERY)).scalar()}
+
+@app.get("/after/fast")
+async def after_fast(db: AsyncSession = Depends(get_async_db)):
+    return {"result": (await db.execute(FAST_QUERY)).scalar()}
+
+async def timed_get(client, path):
+    start = time.perf_counter()
+    response = await client.get(path)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+async def run(client, mode):
+    async def fast_stream():
+        latencies = []
+        for _ in range(args.fast):
+            latencies.append(await timed_get(client, f"/{mode}/fast"))
+            await asyncio.sleep(0.005)
+        return latencies
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        fast_stream(),
+        *[timed_get(client, f"/{mode}/slow") for _ in range(args.slow)]
+    )
+    elapsed = time.perf_counter() - start
+    fast = sorted(results[0])
+    return {
+        "fast_p50_ms": statistics.median(fast) * 1000,
+        "fast_p95_ms": fast[int(len(fast) * 0.95) - 1] * 1000,
+        "fast_max_ms": fast[-1] * 1000,
+        "wall_s": elapsed,
+    }
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up connections and code paths
+        for mode in ("before", "after"):
+            await timed_get(client, f"/{mode}/fast")
+        print(f"database: {sync_engine.dialect.name}, slow={args.slow} x ~{args.slow_ms}ms, fast={args.fast}")
+        print(f"{'mode':<8}{'fast p50':>12}{'fast p95':>12}{'fast max':>12}{'wall':>10}")
+        for mode in ("before", "after"):
+            stats = await run(client, mode)
+            print(f"{mode:<8}{stats['fast_p50_ms']:>10.1f}ms{stats['fast_p95_ms']:>10.1f}ms"
+                  f"{stats['fast_max_ms']:>10.1f}ms{stats['wall_s']:>9.2f}s")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
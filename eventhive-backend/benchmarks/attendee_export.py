@@ -0,0 +1,104 @@
+"""Attendee export benchmark: peak Python memory and throughput of the
+streaming CSV/NDJSON export as the event grows.
+
+Loads one event per --sizes entry (bookings carry a --qr-bytes QR payload,
+which the export must never read), then drains export_csv and export_ndjson
+under tracemalloc. With --naive it also times loading the same bookings as
+ORM objects, what a non-streaming export would hold in memory at once.
+
+    python -m benchmarks.attendee_export --sizes 100,500000
+    python -m benchmarks.attendee_export --database-url postgresql://... --sizes 100,500000 --naive
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--sizes", default="100,500000", help="bookings per event, comma separated")
+    parser.add_argument("--qr-bytes", type=int, default=512)
+    parser.add_argument("--naive", action="store_true", help="also load every booking as an ORM object")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/export.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+from sqlalchemy import insert, select
+from app.core.database import get_async_session_local, get_session_local, dispose_engines
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, Event, TicketType
+from app.services.export import export_csv, export_ndjson
+from seed import create_seed_data
+
+def load_bookings(event, offset, count):
+    with get_session_local()() as db:
+        ticket_types = db.execute(select(TicketType).filter(TicketType.event_id == event.id)).scalars().all()
+        qr_code = "Q" * args.qr_bytes
+        batch = []
+        for i in range(offset, offset + count):
+            ticket = ticket_types[i % len(ticket_types)]
+            batch.append({
+                "booking_id": f"BENCH{i:010d}", "user_id": event.organizer_id, "event_id": event.id,
+                "ticket_type_id": ticket.id, "quantity": 1, "total_amount": ticket.price,
+                "attendee_name": f"Attendee {i}", "attendee_email": f"attendee{i}@eventhive.com",
+                "attendee_phone": "+910000000000", "booking_status": "confirmed", "qr_code": qr_code,
+            })
+            if len(batch) == 10000:
+                db.execute(insert(Booking), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Booking), batch)
+        db.commit()
+        return {ticket.id: ticket.name for ticket in ticket_types}
+
+async def measure(consume):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = await consume()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, size
+
+async def drain(stream):
+    size = 0
+    async for chunk in stream:
+        size += len(chunk)
+    return size
+
+async def load_orm(event_id):
+    async with get_async_session_local()() as db:
+        bookings = (await db.execute(select(Booking).filter(Booking.event_id == event_id))).scalars().all()
+        return len(bookings)
+
+async def main():
+    sizes = [int(size) for size in args.sizes.split(",")]
+    upgrade_database()
+    create_seed_data()
+    with get_session_local()() as db:
+        events = db.execute(select(Event).order_by(Event.id)).scalars().all()
+    if len(sizes) > len(events):
+        raise SystemExit(f"at most {len(events)} sizes (one seeded event each)")
+
+    offset = 0
+    for event, count in zip(events, sizes):
+        ticket_types = load_bookings(event, offset, count)
+        offset += count
+        print(f"{count} bookings:")
+        for name, stream in (("csv", export_csv), ("ndjson", export_ndjson)):
+            elapsed, peak, size = await measure(lambda: drain(stream(event.id, ticket_types)))
+            print(f"  {name:<7} peak {peak:>8.2f} MiB  {count / elapsed:>10.0f} rows/s  "
+                  f"{size / 1024 / 1024:>8.1f} MiB out")
+        if args.naive:
+            elapsed, peak, _ = await measure(lambda: load_orm(event.id))
+            print(f"  {'orm':<7} peak {peak:>8.2f} MiB  {count / elapsed:>10.0f} rows/s  (all rows at once)")
+    await dispose_engines()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+"""Live availability benchmark: SSE subscribers on one event while bookings
+land as fast as the server takes them.
+
+Starts a uvicorn worker, opens --subscribers streams on
+GET /api/events/{id}/availability, books --bookings tickets and reports how
+many messages each subscriber received (capped by
+AVAILABILITY_MAX_UPDATES_PER_SECOND) and whether every stream converged on
+the final count.
+
+    python -m benchmarks.availability_stream --subscribers 200 --bookings 300
+    python -m benchmarks.availability_stream --database-url postgresql://... --redis-url redis://...
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.startup import BACKEND_DIR, child_env, free_port
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--redis-url", default="", help="empty uses the in-process broker")
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--bookings", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10, help="bookings in flight at once")
+    parser.add_argument("--max-updates", type=float, default=2, help="AVAILABILITY_MAX_UPDATES_PER_SECOND")
+    return parser.parse_args()
+
+async def wait_ready(client, timeout=60):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            (await client.get("/health")).raise_for_status()
+            return
+        except httpx.HTTPError:
+            await asyncio.sleep(0.05)
+    raise SystemExit("server did not start")
+
+async def subscribe(client, event_id, ticket_id, results, connected):
+    # Runs until the stream reports the event sold out (the last booking)
+    messages, last = 0, None
+    async with client.stream("GET", f"/api/events/{event_id}/availability") as response:
+        connected.release()
+        event = None
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                data = json.loads(line[6:])
+                if event == "availability":
+                    messages += 1
+                last = data.get(str(ticket_id), last)
+                if last == 0:
+                    break
+    results.append((messages, last))
+
+async def main():
+    args = parse_args()
+    if not args.database_url:
+        args.database_url = f"sqlite:///{tempfile.mkdtemp()}/availability.db"
+    env = child_env(args)
+    env["AVAILABILITY_MAX_UPDATES_PER_SECOND"] = str(args.max_updates)
+    for command in ("migrate", "seed"):
+        subprocess.run([sys.executable, os.path.join(BACKEND_DIR, "manage.py"), command], env=env,
+                       check=True, capture_output=True)
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    limits = httpx.Limits(max_connections=args.subscribers + args.concurrency + 10)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=120, limits=limits) as client:
+            await wait_ready(client)
+            login = lambda email, password: client.post("/api/auth/login", json={"email": email, "password": password})
+            organizer = {"Authorization": f"Bearer {(await login('organizer@eventhive.com', 'organizer123')).json()['access_token']}"}
+            attendee = {"Authorization": f"Bearer {(await login('user@eventhive.com', 'user123')).json()['access_token']}"}
+            created = (await client.post("/api/events/", headers=organizer, json={
+                "title": "Live Availability", "location": "Bench", "category_id": 1,
+                "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+                "tickets": [{"name": "GA", "price": 10, "max_quantity": args.bookings}],
+            })).json()
+            event_id, ticket_id = created["id"], created["tickets"][0]["id"]
+            (await client.put(f"/api/events/{event_id}/publish", headers=organizer)).raise_for_status()
+
+            results, connected = [], asyncio.Semaphore(0)
+            streams = [asyncio.create_task(subscribe(client, event_id, ticket_id, results, connected))
+                       for _ in range(args.subscribers)]
+            for _ in range(args.subscribers):
+                await connected.acquire()
+
+            pending = asyncio.Semaphore(args.concurrency)
+            async def book():
+                async with pending:
+                    (await client.post("/api/bookings/", headers=attendee, json={
+                        "event_id": event_id, "ticket_type_id": ticket_id, "quantity": 1,
+                        "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+                    })).raise_for_status()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(book() for _ in range(args.bookings)))
+            elapsed = time.perf_counter() - start
+            await asyncio.wait_for(asyncio.gather(*streams), timeout=30)
+    finally:
+        server.terminate()
+        server.wait()
+
+    messages = [count for count, _ in results]
+    converged = sum(1 for _, last in results if last == 0)
+    print(f"subscribers: {args.subscribers}, bookings: {args.bookings} in {elapsed:.1f}s "
+          f"({args.bookings / elapsed:.0f}/s), cap: {args.max_updates}/s per subscriber")
+    print(f"messages per subscriber: median {statistics.median(messages):.0f}, max {max(messages)} "
+          f"(vs {args.bookings} uncoalesced; the cap allows ~{1 + elapsed * args.max_updates:.0f})")
+    print(f"streams that saw the final count: {converged}/{args.subscribers}")
+    if converged != args.subscribers:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
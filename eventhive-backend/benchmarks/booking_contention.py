@@ -0,0 +1,130 @@
+"""Flash-sale contention benchmark for ticket inventory.
+
+Runs hundreds of parallel buyers against a single TicketType and reports
+bookings/sec and whether the ticket type was oversold.
+
+    python -m benchmarks.booking_contention --buyers 500 --capacity 200
+    python -m benchmarks.booking_contention --database-url postgresql://... --mode naive
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--buyers", type=int, default=500)
+    parser.add_argument("--capacity", type=int, default=200)
+    parser.add_argument("--quantity", type=int, default=1)
+    parser.add_argument("--mode", choices=["atomic", "naive"], default="atomic",
+                        help="naive replays the old read-check-write path for comparison")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/contention.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.database import Base, get_async_url
+from app.models.models import User, Category, Event, TicketType, Booking, EventStatus, UserRole
+from app.services.inventory import reserve_tickets
+from app.services.qr_service import generate_booking_id
+
+def make_engine():
+    url = get_async_url(args.database_url)
+    if url.startswith("sqlite"):
+        # SQLite has a single writer; a small pool avoids busy-handler thrash
+        return create_async_engine(url, poolclass=AsyncAdaptedQueuePool, pool_size=5, max_overflow=0,
+                                   pool_timeout=120, connect_args={"timeout": 60})
+    return create_async_engine(url, pool_size=50, max_overflow=50, pool_timeout=120)
+
+async def setup(Session):
+    db = Session()
+    buyer = User(email=f"buyer-{time.time_ns()}@bench.local", password_hash="x", full_name="Bench Buyer",
+                 role=UserRole.ATTENDEE)
+    category = Category(name=f"Bench {time.time_ns()}")
+    db.add_all([buyer, category])
+    await db.flush()
+    event = Event(organizer_id=buyer.id, category_id=category.id, title="Flash Sale", location="Bench",
+                  start_date=datetime.now() + timedelta(days=1), end_date=datetime.now() + timedelta(days=2),
+                  status=EventStatus.PUBLISHED)
+    db.add(event)
+    await db.flush()
+    ticket = TicketType(event_id=event.id, name="GA", price=100, max_quantity=args.capacity, sold_quantity=0)
+    db.add(ticket)
+    await db.commit()
+    ids = (buyer.id, event.id, ticket.id)
+    await db.close()
+    return ids
+
+async def book(Session, user_id, event_id, ticket_type_id):
+    db = Session()
+    try:
+        if args.mode == "atomic":
+            if await reserve_tickets(db, ticket_type_id, event_id, args.quantity) is None:
+                await db.rollback()
+                return False
+        else:
+            ticket = await db.get(TicketType, ticket_type_id)
+            if ticket.max_quantity - ticket.sold_quantity < args.quantity:
+                await db.rollback()
+                return False
+            ticket.sold_quantity += args.quantity
+        db.add(Booking(booking_id=generate_booking_id(), user_id=user_id, event_id=event_id,
+                       ticket_type_id=ticket_type_id, quantity=args.quantity, total_amount=100 * args.quantity,
+                       attendee_name="Bench", attendee_email="bench@bench.local", payment_status="paid"))
+        await db.commit()
+        return True
+    except OperationalError:
+        await db.rollback()
+        return None
+    finally:
+        await db.close()
+
+async def main():
+    engine = make_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    user_id, event_id, ticket_type_id = await setup(Session)
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*[
+        book(Session, user_id, event_id, ticket_type_id) for _ in range(args.buyers)
+    ])
+    elapsed = time.perf_counter() - start
+    results = {True: outcomes.count(True), False: outcomes.count(False), None: outcomes.count(None)}
+
+    async with Session() as db:
+        sold = await db.scalar(select(TicketType.sold_quantity).filter(TicketType.id == ticket_type_id))
+        booked = await db.scalar(select(func.coalesce(func.sum(Booking.quantity), 0)).filter(
+            Booking.ticket_type_id == ticket_type_id))
+    await engine.dispose()
+
+    print(f"mode:            {args.mode}")
+    print(f"database:        {engine.dialect.name}")
+    print(f"buyers:          {args.buyers}")
+    print(f"capacity:        {args.capacity}")
+    print(f"bookings:        {results[True]}")
+    print(f"sold out:        {results[False]}")
+    print(f"errors:          {results[None]}")
+    print(f"elapsed:         {elapsed:.3f}s")
+    print(f"bookings/sec:    {results[True] / elapsed:.1f}")
+    print(f"sold_quantity:   {sold}")
+    print(f"booked tickets:  {booked}")
+    oversold = max(booked - args.capacity, 0)
+    lost_updates = booked - sold
+    print(f"oversold:        {oversold}")
+    print(f"lost updates:    {lost_updates}")
+    if oversold or lost_updates:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Bulk event import benchmark: POST /api/events/import versus looping over
+POST /api/events/ for the same events.
+
+Drives the app in-process with --events events of --tickets ticket types each,
+once per path (JSON loop, JSON import, CSV import), and reports wall time and
+events/sec.
+
+    python -m benchmarks.event_import --events 500
+    python -m benchmarks.event_import --database-url postgresql://... --events 2000
+"""
+import argparse
+import asyncio
+import csv
+import io
+import os
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=3, help="ticket types per event")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/import.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+import httpx
+from app.api.main import app
+from app.core.database import dispose_engines
+from app.core.migrations import upgrade_database
+from app.services.event_import import EVENT_COLUMNS, TICKET_COLUMNS
+from seed import create_seed_data
+
+def tour(label):
+    return [{
+        "title": f"{label} Tour Night {i}", "description": "Touring show", "location": f"City {i % 50}",
+        "start_date": f"2030-{1 + i % 12:02d}-{1 + i % 28:02d}T19:00:00",
+        "end_date": f"2030-{1 + i % 12:02d}-{1 + i % 28:02d}T23:00:00",
+        "category_id": 1 + i % 6,
+        "tickets": [{"name": f"Tier {t}", "price": 100 * (t + 1), "max_quantity": 200} for t in range(args.tickets)],
+    } for i in range(args.events)]
+
+def as_csv(events):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(list(EVENT_COLUMNS) + [f"ticket_{column}" for column in TICKET_COLUMNS])
+    for event in events:
+        for index, ticket in enumerate(event["tickets"]):
+            head = [event.get(column, "") for column in EVENT_COLUMNS] if index == 0 else [""] * len(EVENT_COLUMNS)
+            writer.writerow(head + [ticket.get(column, "") for column in TICKET_COLUMNS])
+    return out.getvalue()
+
+async def timed(coroutine):
+    start = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - start
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        login = await client.post("/api/auth/login", json={"email": "organizer@eventhive.com", "password": "organizer123"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        async def loop(events):
+            for event in events:
+                (await client.post("/api/events/", headers=headers, json=event)).raise_for_status()
+
+        async def bulk(**kwargs):
+            response = await client.post("/api/events/import", headers={**headers, **kwargs.pop("headers", {})}, **kwargs)
+            response.raise_for_status()
+            result = response.json()
+            if result["created"] != args.events:
+                raise SystemExit(f"import created {result['created']} of {args.events}: {result['errors'][:3]}")
+
+        results = [
+            ("loop over POST /api/events/", await timed(loop(tour("Loop")))),
+            ("POST /api/events/import (JSON)", await timed(bulk(json=tour("Json")))),
+            ("POST /api/events/import (CSV)", await timed(bulk(content=as_csv(tour("Csv")),
+                                                              headers={"Content-Type": "text/csv"}))),
+        ]
+    await dispose_engines()
+
+    print(f"events: {args.events}, ticket types per event: {args.tickets}")
+    for label, seconds in results:
+        print(f"{label:<32} {seconds:>8.2f}s  {args.events / seconds:>8.0f} events/s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,208 @@
+"""Query-plan check for the API endpoints.
+
+Migrates and seeds a database, drives every endpoint in-process, captures the
+SQL each one issues and EXPLAINs it. Exits non-zero if any statement does a
+sequential scan on one of the large tables, or if a call made with expect=
+never uses the index it names (a walk of some other index is not a scan, but
+still reads every row the filter does not narrow).
+
+    python -m benchmarks.explain_check
+    python -m benchmarks.explain_check --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not just violations")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/explain.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+import httpx
+from sqlalchemy import event
+from app.api.main import app
+from app.core.config import settings
+from app.core.database import get_async_engine
+from app.core.migrations import upgrade_database
+from app.services.holds import sweep_expired_holds
+from seed import create_seed_data
+
+LARGE_TABLES = {"users", "events", "ticket_types", "bookings", "promo_codes", "ticket_type_sales", "hourly_sales"}
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+captured = []
+current_endpoint = None
+# endpoint -> index its plans must use, from call(..., expect=...)
+expected = {}
+
+async_engine = get_async_engine()
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def capture(conn, cursor, statement, parameters, context, executemany):
+    if current_endpoint and not executemany and statement.lstrip().upper().startswith(EXPLAINABLE):
+        captured.append((current_endpoint, statement, parameters))
+
+async def call(client, method, url, expect=None, **kwargs):
+    global current_endpoint
+    current_endpoint = f"{method} {url.split('?')[0]}"
+    if expect:
+        # Labelled by the query string so its statements are checked on their own
+        current_endpoint = f"{method} {url}"
+        expected[current_endpoint] = expect
+    response = await client.request(method, url, **kwargs)
+    current_endpoint = None
+    if response.status_code >= 400:
+        raise SystemExit(f"{method} {url} -> {response.status_code}: {response.text}")
+    return response
+
+async def login(client, email, password):
+    response = await call(client, "POST", "/api/auth/login", json={"email": email, "password": password})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def exercise(client):
+    attendee = await login(client, "user@eventhive.com", "user123")
+    organizer = await login(client, "organizer@eventhive.com", "organizer123")
+    admin = await login(client, "admin@eventhive.com", "admin123")
+    await call(client, "GET", "/api/auth/me", headers=attendee)
+
+    await call(client, "GET", "/api/events/categories")
+    page = (await call(client, "GET", "/api/events/?limit=1")).json()
+    await call(client, "GET", f"/api/events/?limit=1&cursor={page['next_cursor']}")
+    await call(client, "GET", "/api/events/?category=workshop", expect="ix_events_status_category_created_at")
+    await call(client, "GET", "/api/events/?featured=true")
+    await call(client, "GET", "/api/events/?search=music")
+    await call(client, "GET", "/api/events/?location=mumbai")
+    await call(client, "GET", "/api/events/featured")
+    await call(client, "GET", "/api/events/my-events", headers=organizer)
+
+    event_data = page["items"][0]
+    await call(client, "GET", f"/api/events/{event_data['id']}")
+    created = (await call(client, "POST", "/api/events/", headers=organizer, json={
+        "title": "Explain Check", "description": "Plan check", "location": "Pune", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": "General", "price": 10, "max_quantity": 100}],
+    })).json()
+    await call(client, "POST", "/api/events/import", headers=organizer, json=[{
+        "title": "Explain Import", "location": "Pune", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": "General", "price": 10, "max_quantity": 100}],
+    }])
+    await call(client, "PUT", f"/api/events/{created['id']}/publish", headers=organizer)
+    await call(client, "POST", f"/api/events/{created['id']}/promo-codes", headers=organizer,
+               json={"code": "PLANCHECK", "discount_percent": 10, "max_uses": 5})
+    await call(client, "GET", f"/api/events/{created['id']}/promo-codes", headers=organizer)
+    await call(client, "POST", "/api/bookings/", headers=attendee, json={
+        "event_id": created["id"], "ticket_type_id": created["tickets"][0]["id"], "quantity": 1,
+        "attendee_name": "Plan Check", "attendee_email": "user@eventhive.com", "promo_code": "PLANCHECK",
+    })
+
+    booking = (await call(client, "POST", "/api/bookings/", headers=attendee, json={
+        "event_id": event_data["id"], "ticket_type_id": event_data["tickets"][0]["id"], "quantity": 1,
+        "attendee_name": "Plan Check", "attendee_email": "user@eventhive.com",
+    })).json()
+    await call(client, "POST", "/api/bookings/orders", headers=attendee, json={
+        "event_id": event_data["id"], "items": [{"ticket_type_id": t["id"], "quantity": 1} for t in event_data["tickets"]],
+        "attendee_name": "Plan Check", "attendee_email": "user@eventhive.com",
+    })
+    await call(client, "GET", "/api/bookings/my-bookings", headers=attendee)
+    await call(client, "GET", f"/api/bookings/{booking['booking_id']}", headers=attendee)
+    await call(client, "GET", f"/api/bookings/{booking['booking_id']}/qr", headers=admin)
+    await call(client, "POST", "/api/bookings/verify", headers=admin, json={
+        "event_id": event_data["id"], "payload": "EH1.0.0.EVT0000000000000000.k0.invalid",
+    })
+    manifest = (await call(client, "GET", f"/api/bookings/check-in/manifest/{event_data['id']}", headers=admin)).json()
+    await call(client, "POST", f"/api/bookings/check-in/{booking['booking_id']}", headers=admin)
+    await call(client, "POST", "/api/bookings/check-in/batch", headers=admin, json={
+        "event_id": event_data["id"], "booking_ids": [row[0] for row in manifest["bookings"]],
+    })
+    await call(client, "GET", f"/api/bookings/check-in/manifest/{event_data['id']}?since={manifest['version']}",
+               headers=admin)
+    await call(client, "GET", f"/api/bookings/export/{event_data['id']}?format=ndjson", headers=admin)
+    await call(client, "GET", f"/api/analytics/events/{event_data['id']}?granularity=day", headers=admin)
+    await call(client, "GET", "/api/analytics/organizer", headers=organizer)
+
+    # Seat holds: hold, confirm, release, then the sweeper's batch release
+    global current_endpoint
+    settings.BOOKING_HOLD_SECONDS = 600
+    holds = [(await call(client, "POST", "/api/bookings/", headers=attendee, json={
+        "event_id": event_data["id"], "ticket_type_id": event_data["tickets"][0]["id"], "quantity": 1,
+        "attendee_name": "Plan Check", "attendee_email": "user@eventhive.com",
+    })).json() for _ in range(2)]
+    settings.BOOKING_HOLD_SECONDS = 0
+    await call(client, "POST", f"/api/bookings/holds/{holds[0]['hold_id']}/confirm", headers=attendee)
+    await call(client, "POST", f"/api/bookings/holds/{holds[1]['hold_id']}/release", headers=attendee)
+    current_endpoint = "hold sweeper"
+    await sweep_expired_holds()
+    current_endpoint = None
+
+def sqlite_violations(plan):
+    # EXPLAIN QUERY PLAN rows: (id, parent, notused, detail); a full table or
+    # full index walk reads "SCAN <table or alias> ..." rather than "SEARCH"
+    for row in plan:
+        match = re.match(r"SCAN (\w+)", row[-1])
+        if match and "VIRTUAL TABLE" not in row[-1] and re.sub(r"_\d+$", "", match.group(1)) in LARGE_TABLES:
+            yield row[-1]
+
+def postgres_violations(plan):
+    for (line,) in plan:
+        match = re.search(r"Seq Scan on (\w+)", line)
+        if match and match.group(1) in LARGE_TABLES:
+            yield line.strip()
+
+async def explain_all():
+    violations = 0
+    seen = set()
+    used = set()
+    async with async_engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            # Seed data is tiny; make the planner show what it would do at scale
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+        for endpoint, statement, parameters in captured:
+            if (endpoint, statement) in seen:
+                continue
+            seen.add((endpoint, statement))
+            if dialect == "sqlite":
+                plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+                problems = list(sqlite_violations(plan))
+            else:
+                plan = (await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).all()
+                problems = list(postgres_violations(plan))
+            if endpoint in expected and any(expected[endpoint] in str(row[-1]) for row in plan):
+                used.add(endpoint)
+            if problems or args.verbose:
+                print(f"{'FAIL' if problems else 'ok  '} {endpoint}")
+                print("     " + " ".join(statement.split())[:200])
+                for row in plan:
+                    print("       " + str(row[-1]))
+            violations += len(problems)
+        await conn.rollback()
+    for endpoint in expected.keys() - used:
+        print(f"FAIL {endpoint}\n     never uses {expected[endpoint]}")
+        violations += 1
+    return len(seen), violations
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://explain") as client:
+        await exercise(client)
+    statements, violations = await explain_all()
+    endpoints = len({endpoint for endpoint, _, _ in captured})
+    print(f"{async_engine.dialect.name}: {statements} statements across {endpoints} endpoints, "
+          f"{violations} plan violations (scans of large tables or missed expected indexes)")
+    await async_engine.dispose()
+    return 1 if violations else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
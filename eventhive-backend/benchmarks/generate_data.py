@@ -0,0 +1,189 @@
+"""Synthetic data generator for load and scaling tests.
+
+Migrates and seeds the database, then bulk-loads --users users (the first
+--organizers of them organizers), --events events with --tickets-per-event
+ticket types each, and --bookings bookings. Booking popularity is skewed:
+events are ranked in a random order and drawn with Zipf weights 1/rank^--skew,
+so a few events sell out their (raised) capacity while most sell a handful.
+Ticket type sold counts and the sales rollups are brought in line at the end.
+
+Every generated user has the password --password and the email
+loadtest{N}@eventhive.dev, which is what benchmarks.load_driver logs in with.
+
+    python -m benchmarks.generate_data --users 100000 --events 1000000 --bookings 10000000
+    python -m benchmarks.generate_data --database-url postgresql://... --users 10000 --events 100000
+"""
+import argparse
+import itertools
+import os
+import random
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///loadtest.db")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--organizers", type=int, default=None, help="defaults to 1%% of --users")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--tickets-per-event", type=int, default=3)
+    parser.add_argument("--bookings", type=int, default=1000000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for event popularity")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--skip-analytics", action="store_true", help="do not rebuild the sales rollups")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+args = parse_args()
+os.environ["DATABASE_URL"] = args.database_url
+
+from sqlalchemy import bindparam, case, func, insert, select, update
+from app.core.database import get_engine, get_session_local
+from app.core.migrations import upgrade_database
+from app.core.security import get_password_hash
+from app.models.models import Booking, Category, Event, EventStatus, TicketType, User, UserRole
+from app.services.analytics import rebuild_analytics
+from seed import create_seed_data
+
+TOPICS = ["python", "jazz", "marathon", "hackathon", "startup", "photography", "yoga", "robotics",
+          "comedy", "cricket", "design", "blockchain", "poetry", "cooking", "astronomy", "chess"]
+FORMATS = ["Meetup", "Conference", "Workshop", "Festival", "Night", "Summit", "Bootcamp", "Showcase"]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Pune", "Chennai", "Kolkata", "Hyderabad", "Jaipur",
+          "Ahmedabad", "Goa", "Kochi", "Chandigarh"]
+TIERS = [("General", 499, 500, 70), ("Premium", 1499, 100, 20), ("VIP", 4999, 20, 10)]
+
+def batches(rows):
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, args.batch_size))
+        if not batch:
+            return
+        yield batch
+
+def report(label, count, start):
+    elapsed = time.perf_counter() - start
+    print(f"{label:<14} {count:>10} rows in {elapsed:>7.1f}s ({count / max(elapsed, 1e-9):>9.0f}/s)", flush=True)
+
+def load_users(conn, organizers, now):
+    password_hash = get_password_hash(args.password)
+    user_ids = array("q")
+    rows = ({
+        "email": f"loadtest{i}@eventhive.dev", "password_hash": password_hash, "full_name": f"Load Test {i}",
+        "role": UserRole.ORGANIZER if i < organizers else UserRole.ATTENDEE, "is_active": True,
+        "loyalty_points": 0, "created_at": now - timedelta(minutes=args.users - i),
+    } for i in range(args.users))
+    for batch in batches(rows):
+        user_ids.extend(conn.execute(insert(User).returning(User.id, sort_by_parameter_order=True), batch).scalars())
+    return user_ids
+
+def load_events(conn, rng, organizer_ids, category_ids, now):
+    event_ids, ticket_ids = array("q"), array("q")
+    def rows():
+        for i in range(args.events):
+            start = now + timedelta(days=rng.uniform(-30, 365))
+            yield {
+                "organizer_id": rng.choice(organizer_ids), "category_id": rng.choice(category_ids),
+                "title": f"{rng.choice(TOPICS).title()} {rng.choice(FORMATS)} {i}",
+                "description": f"A {rng.choice(TOPICS)} and {rng.choice(TOPICS)} event for the community.",
+                "location": rng.choice(CITIES), "start_date": start, "end_date": start + timedelta(hours=rng.randint(2, 10)),
+                "status": EventStatus.PUBLISHED if rng.random() < 0.9 else EventStatus.DRAFT,
+                "featured": rng.random() < 0.01, "checkin_seq": 0,
+                "created_at": now - timedelta(seconds=args.events - i),
+            }
+    for batch in batches(rows()):
+        ids = conn.execute(insert(Event).returning(Event.id, sort_by_parameter_order=True), batch).scalars().all()
+        event_ids.extend(ids)
+        tickets = [
+            {"event_id": event_id, "name": name, "price": price, "max_quantity": capacity, "sold_quantity": 0,
+             "is_active": True}
+            for event_id in ids for name, price, capacity, _ in TIERS[:args.tickets_per_event]
+        ]
+        ticket_ids.extend(conn.execute(
+            insert(TicketType).returning(TicketType.id, sort_by_parameter_order=True), tickets
+        ).scalars().all())
+    return event_ids, ticket_ids
+
+def load_bookings(conn, rng, event_ids, ticket_ids, attendee_ids, now):
+    ranks = list(range(len(event_ids)))
+    rng.shuffle(ranks)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** args.skew for rank in ranks))
+    tiers = TIERS[:args.tickets_per_event]
+    tier_weights = list(itertools.accumulate(weight for *_, weight in tiers))
+    sold = {}
+    def rows():
+        for start in range(0, args.bookings, args.batch_size):
+            count = min(args.batch_size, args.bookings - start)
+            events = rng.choices(range(len(event_ids)), cum_weights=cum_weights, k=count)
+            picked_tiers = rng.choices(range(len(tiers)), cum_weights=tier_weights, k=count)
+            for offset, (event, tier) in enumerate(zip(events, picked_tiers)):
+                i = start + offset
+                user_id = rng.choice(attendee_ids)
+                quantity = rng.randint(1, 4)
+                ticket_type_id = ticket_ids[event * len(tiers) + tier]
+                status = "confirmed" if rng.random() < 0.95 else "cancelled"
+                if status == "confirmed":
+                    sold[ticket_type_id] = sold.get(ticket_type_id, 0) + quantity
+                yield {
+                    "booking_id": f"GEN{i:011d}", "user_id": user_id, "event_id": event_ids[event],
+                    "ticket_type_id": ticket_type_id, "quantity": quantity,
+                    "total_amount": tiers[tier][1] * quantity, "attendee_name": f"Load Test {user_id}",
+                    "attendee_email": f"attendee{user_id}@eventhive.dev", "payment_status": "paid",
+                    "booking_status": status, "checkin_version": 0,
+                    "created_at": now - timedelta(seconds=rng.uniform(0, 90 * 86400)),
+                }
+    for batch in batches(rows()):
+        conn.execute(insert(Booking), batch)
+
+    # Sold counts match the confirmed bookings; capacity grows where a popular
+    # event drew more than it had
+    stmt = update(TicketType).where(TicketType.id == bindparam("ticket_type_id")).values(
+        sold_quantity=bindparam("sold"),
+        max_quantity=case((TicketType.max_quantity < bindparam("sold"), bindparam("sold")),
+                          else_=TicketType.max_quantity),
+    )
+    for batch in batches({"ticket_type_id": key, "sold": value} for key, value in sold.items()):
+        conn.execute(stmt, batch)
+    return len(sold)
+
+def main():
+    rng = random.Random(args.seed)
+    upgrade_database()
+    create_seed_data()
+    now = datetime.now(timezone.utc)
+    organizers = args.organizers if args.organizers is not None else max(1, args.users // 100)
+    if not 0 < organizers < args.users:
+        raise SystemExit("--organizers must leave at least one attendee")
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(User).filter(User.email.like("loadtest%"))).scalar():
+            raise SystemExit("database already has generated data; use a fresh one")
+        category_ids = conn.execute(select(Category.id)).scalars().all()
+
+        start = time.perf_counter()
+        user_ids = load_users(conn, organizers, now)
+        report("users", len(user_ids), start)
+        organizer_ids, attendee_ids = user_ids[:organizers], user_ids[organizers:]
+
+        start = time.perf_counter()
+        event_ids, ticket_ids = load_events(conn, rng, organizer_ids, category_ids, now)
+        report("events", len(event_ids), start)
+        report("ticket types", len(ticket_ids), start)
+
+        start = time.perf_counter()
+        touched = load_bookings(conn, rng, event_ids, ticket_ids, attendee_ids, now)
+        report("bookings", args.bookings, start)
+        print(f"{touched} ticket types sold at least one ticket")
+
+    if not args.skip_analytics:
+        start = time.perf_counter()
+        with get_session_local()() as db:
+            ticket_rows, hour_rows = rebuild_analytics(db)
+        report("rollups", ticket_rows + hour_rows, start)
+    engine.dispose()
+    print(f"password for loadtest0..{args.users - 1}@eventhive.dev: {args.password}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Idempotent booking retries: --keys bookings, each sent --duplicates times at
+once with the same Idempotency-Key, through the real POST /api/bookings/
+endpoint (and POST /api/bookings/orders with --orders).
+
+Checks that each key created exactly one booking and sold its tickets once,
+that every duplicate got the same booking_id back, and that a key reused with
+a different body is rejected.
+
+    python -m benchmarks.idempotent_retries --keys 200 --duplicates 5
+    python -m benchmarks.idempotent_retries --database-url postgresql://... --orders
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--duplicates", type=int, default=5, help="concurrent requests per key")
+    parser.add_argument("--orders", action="store_true", help="two-item orders instead of single bookings")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/idempotency.db"
+os.environ["DATABASE_URL"] = args.database_url
+# Every attempt is in flight at once; let them queue for a connection
+os.environ.setdefault("DB_POOL_TIMEOUT", "300")
+if args.database_url.startswith("sqlite"):
+    # SQLite has a single writer: one connection keeps transactions from
+    # failing with "database is locked" instead of waiting their turn
+    os.environ.setdefault("DB_POOL_SIZE", "1")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+
+import httpx
+from sqlalchemy import select, func
+from app.api.main import app
+from app.core.database import get_session_local
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, TicketType
+from seed import create_seed_data
+
+async def login(client, email, password):
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def setup(client, organizer):
+    response = await client.post("/api/events/", headers=organizer, json={
+        "title": "Retry Storm", "location": "Bench", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": "GA", "price": 100, "max_quantity": args.keys * args.duplicates},
+                    {"name": "VIP", "price": 300, "max_quantity": args.keys * args.duplicates}],
+    })
+    response.raise_for_status()
+    created = response.json()
+    (await client.put(f"/api/events/{created['id']}/publish", headers=organizer)).raise_for_status()
+    return created["id"], [ticket["id"] for ticket in created["tickets"]]
+
+def request_for(event_id, ticket_ids):
+    attendee = {"attendee_name": "Bench", "attendee_email": "bench@eventhive.com"}
+    if args.orders:
+        return "/api/bookings/orders", {
+            "event_id": event_id, "items": [{"ticket_type_id": ticket_id, "quantity": 1} for ticket_id in ticket_ids],
+            **attendee,
+        }
+    return "/api/bookings/", {"event_id": event_id, "ticket_type_id": ticket_ids[0], "quantity": 1, **attendee}
+
+async def attempt(client, headers, key, url, body):
+    response = await client.post(url, headers={**headers, "Idempotency-Key": key}, json=body)
+    if response.status_code != 200:
+        return key, f"HTTP {response.status_code}", False
+    data = response.json()
+    return key, data.get("order_id") or data["booking_id"], response.headers.get("idempotent-replayed") == "true"
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        organizer = await login(client, "organizer@eventhive.com", "organizer123")
+        attendee = await login(client, "user@eventhive.com", "user123")
+        event_id, ticket_ids = await setup(client, organizer)
+        url, body = request_for(event_id, ticket_ids)
+
+        keys = [str(uuid.uuid4()) for _ in range(args.keys)]
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(attempt(client, attendee, key, url, body)
+                                          for key in keys for _ in range(args.duplicates)))
+        elapsed = time.perf_counter() - start
+
+        # Same key, different request
+        mismatch = await client.post(url, headers={**attendee, "Idempotency-Key": keys[0]},
+                                     json={**body, "attendee_name": "Someone Else"})
+
+    results = {}
+    replayed = 0
+    for key, result, was_replayed in outcomes:
+        results.setdefault(key, set()).add(result)
+        replayed += was_replayed
+    consistent = sum(1 for key in keys if len(results[key]) == 1 and not next(iter(results[key])).startswith("HTTP"))
+
+    with get_session_local()() as db:
+        booked = db.scalar(select(func.count(Booking.id)).filter(Booking.event_id == event_id))
+        sold = db.scalar(select(func.sum(TicketType.sold_quantity)).filter(TicketType.event_id == event_id))
+
+    lines = len(ticket_ids) if args.orders else 1
+    print(f"database:               {args.database_url.split(':')[0]}")
+    print(f"requests:               {len(outcomes)} ({args.keys} keys x {args.duplicates}) in {elapsed:.2f}s")
+    print(f"keys, one result each:  {consistent} / {args.keys}")
+    print(f"replayed responses:     {replayed}")
+    print(f"bookings / sold:        {booked} / {sold} (expected {args.keys * lines})")
+    print(f"reused key, new body:   HTTP {mismatch.status_code}")
+    if not (consistent == args.keys and booked == sold == args.keys * lines and mismatch.status_code == 422):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""List serialization benchmark: requests/sec per core on the event and
+booking list endpoints, column rows + model_construct versus the previous
+ORM-object path.
+
+Loads --events published events (3 ticket types each) and --bookings bookings
+with a --qr-bytes QR payload for one user, then drives each endpoint in-process
+and sequentially for --seconds, so wall time is the CPU of one core. The
+response cache is disabled (TTL 0) to time the miss path. The "orm" rows
+re-create the old handlers: select(Event) with selectinload, and the
+response_model validating objects from attributes, with the stdlib JSON
+response.
+
+    python -m benchmarks.list_serialization --events 1000 --bookings 1000
+    python -m benchmarks.list_serialization --database-url postgresql://... --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--qr-bytes", type=int, default=2048)
+    parser.add_argument("--limit", type=int, default=100, help="page size requested")
+    parser.add_argument("--seconds", type=float, default=5, help="per endpoint")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/serialization.db"
+os.environ["DATABASE_URL"] = args.database_url
+os.environ["EVENT_CACHE_TTL_SECONDS"] = "0"
+
+import httpx
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+from app.api.deps import get_current_user
+from app.api.main import app
+from app.api.pagination import next_cursor
+from app.core.database import get_db, get_session_local, dispose_engines
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, Event, EventStatus, TicketType, User
+from app.schemas.schemas import BookingPage, EventPage
+from app.services.response_cache import dump_json
+from seed import create_seed_data
+
+baseline = APIRouter()
+
+@baseline.get("/events")
+async def orm_events(limit: int, db=Depends(get_db)):
+    result = await db.execute(
+        select(Event).options(selectinload(Event.tickets)).filter(Event.status == EventStatus.PUBLISHED)
+        .order_by(Event.created_at.desc(), Event.id.desc()).limit(limit + 1)
+    )
+    events = result.scalars().all()
+    page = {"items": events[:limit], "next_cursor": next_cursor(events, limit, lambda e: e.created_at, lambda e: e.id)}
+    return Response(content=dump_json(EventPage, page), media_type="application/json")
+
+@baseline.get("/my-events", response_model=EventPage, response_class=JSONResponse)
+async def orm_my_events(limit: int, db=Depends(get_db), current_user: User = Depends(get_current_user)):
+    result = await db.execute(
+        select(Event).options(selectinload(Event.tickets)).filter(Event.organizer_id == current_user.id)
+        .order_by(Event.created_at.desc(), Event.id.desc()).limit(limit + 1)
+    )
+    events = result.scalars().all()
+    return {"items": events[:limit], "next_cursor": next_cursor(events, limit, lambda e: e.created_at, lambda e: e.id)}
+
+@baseline.get("/my-bookings", response_model=BookingPage, response_class=JSONResponse)
+async def orm_my_bookings(limit: int, db=Depends(get_db), current_user: User = Depends(get_current_user)):
+    result = await db.execute(
+        select(Booking).filter(Booking.user_id == current_user.id)
+        .order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1)
+    )
+    bookings = result.scalars().all()
+    return {"items": bookings[:limit],
+            "next_cursor": next_cursor(bookings, limit, lambda b: b.created_at, lambda b: b.id)}
+
+app.include_router(baseline, prefix="/bench/orm")
+
+def load_data():
+    with get_session_local()() as db:
+        organizer = db.execute(select(User).filter(User.email == "organizer@eventhive.com")).scalars().one()
+        attendee = db.execute(select(User).filter(User.email == "user@eventhive.com")).scalars().one()
+        event_ids = db.execute(insert(Event).returning(Event.id, sort_by_parameter_order=True), [{
+            "organizer_id": organizer.id, "category_id": 1 + i % 6, "title": f"Bench Event {i}",
+            "description": "A benchmark event with a description of ordinary length for a listing page.",
+            "location": f"City {i % 50}", "start_date": datetime(2030, 1, 1, 10), "end_date": datetime(2030, 1, 1, 18),
+            "status": EventStatus.PUBLISHED, "featured": i % 10 == 0,
+        } for i in range(args.events)]).scalars().all()
+        db.execute(insert(TicketType), [
+            {"event_id": event_id, "name": name, "price": price, "max_quantity": 500}
+            for event_id in event_ids for name, price in (("GA", 499), ("Premium", 999.5), ("VIP", 2499))
+        ])
+        db.execute(insert(Booking), [{
+            "booking_id": f"BENCH{i:010d}", "user_id": attendee.id, "event_id": event_ids[i % len(event_ids)],
+            "ticket_type_id": 1, "quantity": 1, "total_amount": 499, "attendee_name": "Bench",
+            "attendee_email": "bench@eventhive.com", "booking_status": "confirmed", "qr_code": "Q" * args.qr_bytes,
+        } for i in range(args.bookings)])
+        db.commit()
+
+async def rate(client, url, headers):
+    (await client.get(url, headers=headers)).raise_for_status()
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < args.seconds:
+        (await client.get(url, headers=headers)).raise_for_status()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    load_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login(email, password):
+            response = await client.post("/api/auth/login", json={"email": email, "password": password})
+            return {"Authorization": f"Bearer {response.json()['access_token']}"}
+        organizer = await login("organizer@eventhive.com", "organizer123")
+        attendee = await login("user@eventhive.com", "user123")
+
+        print(f"events: {args.events}, bookings: {args.bookings}, page size {args.limit}, "
+              f"{os.cpu_count()} CPU(s), sequential requests")
+        for label, path, headers in (("GET /api/events/", "events/", None),
+                                     ("GET /api/events/my-events", "events/my-events", organizer),
+                                     ("GET /api/bookings/my-bookings", "bookings/my-bookings", attendee)):
+            fast = await rate(client, f"/api/{path}?limit={args.limit}", headers)
+            orm = await rate(client, f"/bench/orm/{path.split('/')[-1] or 'events'}?limit={args.limit}", headers)
+            print(f"{label:<30} rows {fast:>7.1f} req/s   orm {orm:>7.1f} req/s   {fast / orm:>5.2f}x")
+    await dispose_engines()
+
+if __name__ == "__main__":
+    asyncio.run(main())
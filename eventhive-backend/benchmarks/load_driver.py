@@ -0,0 +1,261 @@
+"""Scripted load driver: a weighted mix of user journeys against a running
+app, reporting latency percentiles and throughput per endpoint as JSON.
+
+Starts a uvicorn server on --database-url (the benchmarks.generate_data
+output by default) unless --base-url points at one already running. Then
+--concurrency virtual users run journeys for --duration seconds, picking each
+one by the --mix weights:
+
+    browse   GET /api/events/ (sometimes the next page), then GET /api/events/{id}
+    search   GET /api/events/?search=<word from a browsed title>
+    login    POST /api/auth/login as a generated user
+    book     POST /api/bookings/ on a browsed event with tickets left
+    checkin  POST /api/bookings/check-in/{booking_id} (as admin) on a booking made here
+
+Prints one JSON document (also written to --output) with p50/p95/p99 latency,
+request count, errors by status and requests/sec per endpoint template, so
+runs can be diffed across releases.
+
+    python -m benchmarks.generate_data --users 10000 --events 100000 --bookings 1000000
+    python -m benchmarks.load_driver --duration 60 --concurrency 50 --output release.json
+    python -m benchmarks.load_driver --base-url http://127.0.0.1:8000 --mix browse=80,book=20
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict, deque
+
+import httpx
+
+from benchmarks.startup import child_env, free_port
+
+JOURNEYS = ("browse", "search", "login", "book", "checkin")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///loadtest.db")
+    parser.add_argument("--redis-url", default="", help="empty runs without Redis")
+    parser.add_argument("--base-url", default=None, help="drive this server instead of starting one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers when starting the server")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--mix", default="browse=55,search=15,login=5,book=20,checkin=5")
+    parser.add_argument("--users", type=int, default=1000, help="log in as loadtest0..N-1@eventhive.dev")
+    parser.add_argument("--password", default="loadtest123")
+    parser.add_argument("--admin", default="admin@eventhive.com:admin123", help="email:password for check-ins")
+    parser.add_argument("--output", default=None, help="also write the JSON report here")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in JOURNEYS:
+            raise SystemExit(f"unknown journey {name!r}; choose from {', '.join(JOURNEYS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    async def call(self, client, name, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            response, status = None, type(e).__name__
+        if self.recording:
+            self.latencies[name].append(time.perf_counter() - start)
+            self.statuses[name][status] += 1
+        return response
+
+    def report(self, elapsed):
+        endpoints = {}
+        for name, samples in sorted(self.latencies.items()):
+            samples.sort()
+            pick = lambda q: samples[min(int(len(samples) * q), len(samples) - 1)] * 1000
+            statuses = self.statuses[name]
+            endpoints[name] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / elapsed, 2),
+                "p50_ms": round(statistics.median(samples) * 1000, 2),
+                "p95_ms": round(pick(0.95), 2),
+                "p99_ms": round(pick(0.99), 2),
+                "max_ms": round(samples[-1] * 1000, 2),
+                "errors": sum(count for status, count in statuses.items()
+                              if not isinstance(status, int) or status >= 400),
+                "status": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+            }
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {"requests": total, "throughput_rps": round(total / elapsed, 2), "endpoints": endpoints}
+
+class Driver:
+    def __init__(self, args, client, recorder):
+        self.args = args
+        self.client = client
+        self.recorder = recorder
+        self.events = {}
+        self.words = set()
+        self.bookings = deque(maxlen=10000)
+        self.admin = None
+
+    def remember(self, page):
+        for event in page.get("items", []):
+            tickets = [t["id"] for t in event["tickets"] if t["is_active"] and t["sold_quantity"] < t["max_quantity"]]
+            if tickets:
+                self.events[event["id"]] = tickets
+            self.words.update(word for word in re.findall(r"[a-z]+", event["title"].lower()) if len(word) > 3)
+
+    async def login(self, email, password):
+        response = await self.recorder.call(self.client, "POST /api/auth/login", "POST", "/api/auth/login",
+                                            json={"email": email, "password": password})
+        if response is None or response.status_code != 200:
+            return None
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def browse(self, rng, headers):
+        response = await self.recorder.call(self.client, "GET /api/events/", "GET", "/api/events/?limit=20")
+        if response is None or response.status_code != 200:
+            return
+        page = response.json()
+        self.remember(page)
+        if page["next_cursor"] and rng.random() < 0.3:
+            response = await self.recorder.call(self.client, "GET /api/events/?cursor", "GET",
+                                                f"/api/events/?limit=20&cursor={page['next_cursor']}")
+            if response is not None and response.status_code == 200:
+                page = response.json()
+                self.remember(page)
+        if page["items"]:
+            event_id = rng.choice(page["items"])["id"]
+            await self.recorder.call(self.client, "GET /api/events/{id}", "GET", f"/api/events/{event_id}")
+
+    async def search(self, rng, headers):
+        if not self.words:
+            return await self.browse(rng, headers)
+        response = await self.recorder.call(self.client, "GET /api/events/?search", "GET", "/api/events/",
+                                            params={"search": rng.choice(sorted(self.words)), "limit": 20})
+        if response is not None and response.status_code == 200:
+            self.remember(response.json())
+
+    async def relogin(self, rng, headers):
+        await self.login(f"loadtest{rng.randrange(self.args.users)}@eventhive.dev", self.args.password)
+
+    async def book(self, rng, headers):
+        if not self.events:
+            return await self.browse(rng, headers)
+        event_id = rng.choice(list(self.events))
+        response = await self.recorder.call(self.client, "POST /api/bookings/", "POST", "/api/bookings/",
+                                            headers=headers, json={
+            "event_id": event_id, "ticket_type_id": rng.choice(self.events[event_id]), "quantity": 1,
+            "attendee_name": "Load Test", "attendee_email": "loadtest@eventhive.dev",
+        })
+        if response is None:
+            return
+        if response.status_code == 200:
+            self.bookings.append(response.json()["booking_id"])
+        elif response.status_code == 400:
+            # Sold out (or sales closed): stop picking it
+            self.events.pop(event_id, None)
+
+    async def checkin(self, rng, headers):
+        if not self.bookings:
+            return await self.book(rng, headers)
+        booking_id = self.bookings.popleft()
+        await self.recorder.call(self.client, "POST /api/bookings/check-in/{booking_id}", "POST",
+                                 f"/api/bookings/check-in/{booking_id}", headers=self.admin)
+
+    async def user(self, index, weights, deadline):
+        rng = random.Random(self.args.seed + index)
+        headers = await self.login(f"loadtest{index % self.args.users}@eventhive.dev", self.args.password)
+        if headers is None:
+            raise SystemExit(f"cannot log in as loadtest{index % self.args.users}@eventhive.dev; "
+                             "load data with benchmarks.generate_data first")
+        journeys = {"browse": self.browse, "search": self.search, "login": self.relogin,
+                    "book": self.book, "checkin": self.checkin}
+        names, cum_weights = list(weights), []
+        for name in names:
+            cum_weights.append((cum_weights[-1] if cum_weights else 0) + weights[name])
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, cum_weights=cum_weights)[0]
+            await journeys[name](rng, headers)
+
+async def wait_ready(client, server, timeout=120):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"uvicorn exited with {server.returncode}")
+        try:
+            (await client.get("/health")).raise_for_status()
+            return
+        except httpx.HTTPError:
+            await asyncio.sleep(0.1)
+    raise SystemExit("server did not start")
+
+async def drive(args, base_url, server):
+    weights = parse_mix(args.mix)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await wait_ready(client, server)
+        driver = Driver(args, client, recorder)
+        email, _, password = args.admin.partition(":")
+        driver.admin = await driver.login(email, password)
+        if driver.admin is None:
+            raise SystemExit(f"cannot log in as {email}")
+        # Warm-up: a few pages of events to book and words to search for
+        await driver.browse(random.Random(args.seed), None)
+        recorder.recording = True
+        start = time.perf_counter()
+        await asyncio.gather(*(driver.user(i, weights, start + args.duration) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "config": {"base_url": base_url, "duration_s": args.duration, "concurrency": args.concurrency,
+                   "mix": weights, "workers": None if args.base_url else args.workers},
+        "elapsed_s": round(elapsed, 2),
+        **recorder.report(elapsed),
+    }
+
+def main():
+    args = parse_args()
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        env = child_env(args)
+        if args.database_url.startswith("sqlite"):
+            # SQLite has a single writer: one connection keeps transactions from
+            # failing with "database is locked" instead of waiting their turn
+            env.setdefault("DB_POOL_SIZE", "1")
+            env.setdefault("DB_MAX_OVERFLOW", "0")
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.api.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+    try:
+        report = asyncio.run(drive(args, base_url, server))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(body + "\n")
+    print(body)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Login throughput vs. browsing latency benchmark.
+
+Fires a burst of concurrent logins at the app while a browser keeps
+requesting /api/events, and reports logins/sec, shed (503) logins and the
+/api/events latency with and without the login burst.
+
+    python -m benchmarks.login_throughput --logins 200 --concurrency 50
+    BCRYPT_ROUNDS=10 PASSWORD_HASH_WORKERS=4 python -m benchmarks.login_throughput
+
+Requires httpx.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--logins", type=int, default=200, help="total login attempts")
+    parser.add_argument("--concurrency", type=int, default=50, help="logins in flight at once")
+    parser.add_argument("--browse", type=int, default=100, help="/api/events requests per phase")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/login.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+import httpx
+from app.core.config import settings
+from app.api.main import app
+from app.core.migrations import upgrade_database
+from seed import create_seed_data
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    return (statistics.median(latencies) * 1000,
+            latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+            latencies[-1] * 1000)
+
+async def browse(client, count):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/api/events/")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return latencies
+
+async def login_storm(client):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    statuses = []
+
+    async def attempt():
+        async with semaphore:
+            response = await client.post("/api/auth/login",
+                                         json={"email": "user@eventhive.com", "password": "user123"})
+            statuses.append(response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[attempt() for _ in range(args.logins)])
+    return statuses, time.perf_counter() - start
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        await browse(client, 5)
+        idle = summarize(await browse(client, args.browse))
+        browsing, (statuses, elapsed) = await asyncio.gather(browse(client, args.browse), login_storm(client))
+        loaded = summarize(browsing)
+
+    ok = statuses.count(200)
+    print(f"bcrypt rounds: {settings.BCRYPT_ROUNDS}, hash workers: {settings.PASSWORD_HASH_WORKERS}, "
+          f"queue limit: {settings.PASSWORD_HASH_QUEUE_LIMIT}")
+    print(f"logins:        {ok} ok, {statuses.count(503)} shed (503), {len(statuses) - ok - statuses.count(503)} other")
+    print(f"logins/sec:    {ok / elapsed:.1f}")
+    print(f"{'/api/events':<15}{'p50':>10}{'p95':>10}{'max':>10}")
+    print(f"{'idle':<15}{idle[0]:>8.1f}ms{idle[1]:>8.1f}ms{idle[2]:>8.1f}ms")
+    print(f"{'during logins':<15}{loaded[0]:>8.1f}ms{loaded[1]:>8.1f}ms{loaded[2]:>8.1f}ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
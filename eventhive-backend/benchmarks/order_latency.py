@@ -0,0 +1,108 @@
+"""Multi-item order benchmark: one POST /api/bookings/orders with N line items
+versus N sequential POST /api/bookings/ calls.
+
+Runs the real app in-process against a migrated, seeded database and reports
+per-order latency and SQL statements issued.
+
+    python -m benchmarks.order_latency --items 4 --orders 50
+    python -m benchmarks.order_latency --database-url postgresql://... --items 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--items", type=int, default=4, help="ticket types (line items) per order")
+    parser.add_argument("--orders", type=int, default=50)
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/orders.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+import httpx
+from sqlalchemy import event
+from app.api.main import app
+from app.core.database import get_async_engine
+from app.core.migrations import upgrade_database
+from seed import create_seed_data
+
+statements = 0
+
+@event.listens_for(get_async_engine().sync_engine, "before_cursor_execute")
+def count(*_):
+    global statements
+    statements += 1
+
+async def login(client, email, password):
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def create_event(client, organizer):
+    capacity = args.orders * 2 + 1
+    response = await client.post("/api/events/", headers=organizer, json={
+        "title": "Order Benchmark", "location": "Bench", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": f"Tier {i}", "price": 100 + i, "max_quantity": capacity} for i in range(args.items)],
+    })
+    response.raise_for_status()
+    created = response.json()
+    (await client.put(f"/api/events/{created['id']}/publish", headers=organizer)).raise_for_status()
+    return created["id"], [ticket["id"] for ticket in created["tickets"]]
+
+async def sequential(client, headers, event_id, ticket_ids):
+    for ticket_id in ticket_ids:
+        response = await client.post("/api/bookings/", headers=headers, json={
+            "event_id": event_id, "ticket_type_id": ticket_id, "quantity": 1,
+            "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+        })
+        response.raise_for_status()
+
+async def order(client, headers, event_id, ticket_ids):
+    response = await client.post("/api/bookings/orders", headers=headers, json={
+        "event_id": event_id, "items": [{"ticket_type_id": t, "quantity": 1} for t in ticket_ids],
+        "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+    })
+    response.raise_for_status()
+
+async def measure(fn, *fn_args):
+    global statements
+    latencies, queries = [], []
+    for _ in range(args.orders):
+        statements = 0
+        start = time.perf_counter()
+        await fn(*fn_args)
+        latencies.append(time.perf_counter() - start)
+        queries.append(statements)
+    latencies.sort()
+    return (statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            statistics.mean(queries))
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        organizer = await login(client, "organizer@eventhive.com", "organizer123")
+        attendee = await login(client, "user@eventhive.com", "user123")
+        event_id, ticket_ids = await create_event(client, organizer)
+        await order(client, attendee, event_id, ticket_ids)
+
+        rows = [
+            (f"{args.items} x POST /api/bookings/", await measure(sequential, client, attendee, event_id, ticket_ids)),
+            (f"1 x POST /orders ({args.items} items)", await measure(order, client, attendee, event_id, ticket_ids)),
+        ]
+    print(f"database: {get_async_engine().dialect.name}, orders: {args.orders}, items per order: {args.items}")
+    print(f"{'':<32}{'p50':>10}{'p95':>10}{'SQL/order':>12}")
+    for label, (p50, p95, queries) in rows:
+        print(f"{label:<32}{p50:>8.1f}ms{p95:>8.1f}ms{queries:>12.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
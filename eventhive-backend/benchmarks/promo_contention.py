@@ -0,0 +1,108 @@
+"""Promo code redemption under contention: many parallel bookings racing for a
+limited-use code through the real POST /api/bookings/ endpoint.
+
+Checks that the code is redeemed exactly max_uses times, that used_count
+matches, and that every losing booking was rolled back.
+
+    python -m benchmarks.promo_contention --attempts 1000 --max-uses 100
+    python -m benchmarks.promo_contention --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--attempts", type=int, default=1000)
+    parser.add_argument("--max-uses", type=int, default=100)
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/promo.db"
+os.environ["DATABASE_URL"] = args.database_url
+# Every attempt is in flight at once; let them queue for a connection
+os.environ.setdefault("DB_POOL_TIMEOUT", "300")
+if args.database_url.startswith("sqlite"):
+    # SQLite has a single writer: one connection keeps transactions from
+    # failing with "database is locked" instead of waiting their turn
+    os.environ.setdefault("DB_POOL_SIZE", "1")
+    os.environ.setdefault("DB_MAX_OVERFLOW", "0")
+
+import httpx
+from sqlalchemy import select, func
+from app.api.main import app
+from app.core.database import get_session_local
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, PromoCode, TicketType
+from seed import create_seed_data
+
+async def login(client, email, password):
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def setup(client, organizer):
+    response = await client.post("/api/events/", headers=organizer, json={
+        "title": "Promo Rush", "location": "Bench", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": "GA", "price": 100, "max_quantity": args.attempts}],
+    })
+    response.raise_for_status()
+    created = response.json()
+    (await client.put(f"/api/events/{created['id']}/publish", headers=organizer)).raise_for_status()
+    (await client.post(f"/api/events/{created['id']}/promo-codes", headers=organizer, json={
+        "code": "RUSH", "discount_percent": 25, "max_uses": args.max_uses,
+    })).raise_for_status()
+    return created["id"], created["tickets"][0]["id"]
+
+async def attempt(client, headers, event_id, ticket_id):
+    response = await client.post("/api/bookings/", headers=headers, json={
+        "event_id": event_id, "ticket_type_id": ticket_id, "quantity": 1, "promo_code": "RUSH",
+        "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+    })
+    if response.status_code == 200:
+        return "redeemed"
+    return response.json().get("detail", str(response.status_code))
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        organizer = await login(client, "organizer@eventhive.com", "organizer123")
+        attendee = await login(client, "user@eventhive.com", "user123")
+        event_id, ticket_id = await setup(client, organizer)
+
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(*(attempt(client, attendee, event_id, ticket_id)
+                                          for _ in range(args.attempts)))
+        elapsed = time.perf_counter() - start
+
+    with get_session_local()() as db:
+        used = db.scalar(select(PromoCode.used_count).filter(PromoCode.code == "RUSH"))
+        sold = db.scalar(select(TicketType.sold_quantity).filter(TicketType.id == ticket_id))
+        discounted = db.scalar(select(func.count(Booking.id)).filter(
+            Booking.event_id == event_id, Booking.total_amount < 100))
+        booked = db.scalar(select(func.count(Booking.id)).filter(Booking.event_id == event_id))
+
+    counts = {}
+    for outcome in outcomes:
+        counts[outcome] = counts.get(outcome, 0) + 1
+    print(f"database:            {args.database_url.split(':')[0]}")
+    print(f"attempts:            {args.attempts} in {elapsed:.2f}s")
+    for outcome, count in sorted(counts.items()):
+        print(f"  {outcome + ':':<34}{count}")
+    print(f"max_uses:            {args.max_uses}")
+    print(f"used_count:          {used}")
+    print(f"discounted bookings: {discounted}")
+    print(f"bookings / sold:     {booked} / {sold}")
+    expected = min(args.max_uses, args.attempts)
+    if not (counts.get("redeemed", 0) == used == discounted == booked == sold == expected):
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    asyncio.run(main())
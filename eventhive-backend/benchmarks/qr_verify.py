@@ -0,0 +1,110 @@
+"""QR verification benchmark: signed payload + bitmap check versus a Booking
+lookup by booking_id (the old way to validate a plain QR string).
+
+    python -m benchmarks.qr_verify --bookings 100000 --verifications 200000
+    python -m benchmarks.qr_verify --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--verifications", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=5000, help="database lookups to time")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/qr.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+from sqlalchemy import insert, select
+from app.core.database import get_async_session_local, get_session_local, dispose_engines
+from app.core.migrations import upgrade_database
+from app.models.models import Booking, Event, TicketType
+from app.services.checkin import checked_in_bits, revoked_bits, mark_checked_in
+from app.services.qr_service import qr_payload, verify_qr_payload
+from seed import create_seed_data
+
+def load_bookings(rng):
+    with get_session_local()() as db:
+        event = db.execute(select(Event)).scalars().first()
+        ticket = db.execute(select(TicketType).filter(TicketType.event_id == event.id)).scalars().first()
+        user_id = event.organizer_id
+        batch = []
+        # Deterministic ids, as generate_data uses: random ones can collide at this size
+        for i in range(args.bookings):
+            batch.append({
+                "booking_id": f"QRV{i:011d}", "user_id": user_id, "event_id": event.id,
+                "ticket_type_id": ticket.id, "quantity": 1, "total_amount": 1,
+                "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+                "booking_status": rng.choice(["confirmed", "confirmed", "confirmed", "checked_in"]),
+            })
+            if len(batch) == 10000:
+                db.execute(insert(Booking), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Booking), batch)
+        db.commit()
+        rows = db.execute(select(Booking.id, Booking.booking_id, Booking.booking_status)
+                          .filter(Booking.event_id == event.id)).all()
+    return event.id, rows
+
+def bench_signed(event_id, rows, rng):
+    payloads = [qr_payload(pk, booking_id, event_id) for pk, booking_id, _ in rows]
+    # One in ten scans is a forgery: a valid-looking payload with a tampered booking
+    forged = [p.replace("QRV", "QRX", 1) for p in rng.sample(payloads, max(len(payloads) // 10, 1))]
+    scans = [rng.choice(payloads) for _ in range(args.verifications)]
+    scans[::10] = [rng.choice(forged) for _ in scans[::10]]
+
+    outcomes = {"valid": 0, "already_checked_in": 0, "revoked": 0, "invalid_signature": 0}
+    start = time.perf_counter()
+    for payload in scans:
+        claims = verify_qr_payload(payload)
+        if claims is None or claims.event_id != event_id:
+            outcomes["invalid_signature"] += 1
+        elif claims.booking_pk in revoked_bits:
+            outcomes["revoked"] += 1
+        elif claims.booking_pk in checked_in_bits:
+            outcomes["already_checked_in"] += 1
+        else:
+            outcomes["valid"] += 1
+    return time.perf_counter() - start, outcomes
+
+async def bench_lookup(rows, rng):
+    booking_ids = [rng.choice(rows)[1] for _ in range(args.lookups)]
+    async with get_async_session_local()() as db:
+        start = time.perf_counter()
+        for booking_id in booking_ids:
+            result = await db.execute(select(Booking.event_id, Booking.booking_status)
+                                      .filter(Booking.booking_id == booking_id))
+            result.first()
+        return time.perf_counter() - start
+
+async def main():
+    rng = random.Random(args.seed)
+    upgrade_database()
+    create_seed_data()
+    event_id, rows = load_bookings(rng)
+    mark_checked_in(pk for pk, _, status in rows if status == "checked_in")
+
+    signed_elapsed, outcomes = bench_signed(event_id, rows, rng)
+    lookup_elapsed = await bench_lookup(rows, rng)
+    await dispose_engines()
+
+    print(f"bookings: {len(rows)}, scans: {args.verifications} (10% forged)")
+    print(f"signed payload + bitmap: {args.verifications / signed_elapsed:>12,.0f} verifications/sec "
+          f"({signed_elapsed / args.verifications * 1e6:.1f}us each)")
+    print(f"booking_id DB lookup:    {args.lookups / lookup_elapsed:>12,.0f} lookups/sec "
+          f"({lookup_elapsed / args.lookups * 1e6:.1f}us each)")
+    print("outcomes: " + ", ".join(f"{k}={v}" for k, v in outcomes.items()))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+"""SQL statement budgets per endpoint, to catch N+1 regressions.
+
+Migrates and seeds a database, creates an event with several ticket types and
+several bookings (so a per-row lazy load would show up as extra statements),
+then drives the endpoints in-process and counts the SQL each request issues.
+Exits non-zero if any endpoint goes over its budget.
+
+    python -m benchmarks.query_budget
+    python -m benchmarks.query_budget --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--rows", type=int, default=5, help="ticket types and bookings per list")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/budget.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+import httpx
+from sqlalchemy import event
+from app.api.main import app
+from app.core.config import settings
+from app.core.database import get_async_engine
+from app.core.migrations import upgrade_database
+from seed import create_seed_data
+
+class QueryBudget:
+    # Counts the statements each request issues and records the ones over budget
+    def __init__(self, engine):
+        self.statements = 0
+        self.results = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._count)
+
+    def _count(self, *_):
+        self.statements += 1
+
+    async def check(self, client, budget, method, url, **kwargs):
+        self.statements = 0
+        response = await client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            raise SystemExit(f"{method} {url} -> {response.status_code}: {response.text}")
+        self.results.append((f"{method} {url.split('?')[0]}", self.statements, budget))
+        return response
+
+    def violations(self):
+        return [result for result in self.results if result[1] > result[2]]
+
+async def login(client, email, password):
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def exercise(client, budget):
+    attendee = await login(client, "user@eventhive.com", "user123")
+    organizer = await login(client, "organizer@eventhive.com", "organizer123")
+    admin = await login(client, "admin@eventhive.com", "admin123")
+
+    # Budgets are the statements each endpoint needs today; only orders grow with --rows
+    await budget.check(client, 1, "GET", "/api/auth/me", headers=attendee)
+    event_data = (await budget.check(client, 5, "POST", "/api/events/", headers=organizer, json={
+        "title": "Budget Check", "location": "Pune", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": f"Tier {i}", "price": 10 + i, "max_quantity": 100} for i in range(args.rows)],
+    })).json()
+    event_id = event_data["id"]
+    await budget.check(client, 2, "PUT", f"/api/events/{event_id}/publish", headers=organizer)
+    bookings = []
+    # The first booking also looks up the event's waiting-room rate, cached after
+    for ticket in event_data["tickets"]:
+        bookings.append((await budget.check(client, 7, "POST", "/api/bookings/", headers=attendee, json={
+            "event_id": event_id, "ticket_type_id": ticket["id"], "quantity": 1,
+            "attendee_name": "Budget", "attendee_email": "user@eventhive.com",
+        })).json()["booking_id"])
+    # Each ticket type is reserved with its own conditional UPDATE, by design
+    await budget.check(client, 5 + args.rows, "POST", "/api/bookings/orders", headers=attendee, json={
+        "event_id": event_id, "items": [{"ticket_type_id": t["id"], "quantity": 1} for t in event_data["tickets"]],
+        "attendee_name": "Budget", "attendee_email": "user@eventhive.com",
+    })
+
+    await budget.check(client, 1, "GET", "/api/events/categories")
+    await budget.check(client, 2, "GET", "/api/events/?limit=50")
+    await budget.check(client, 3, "GET", "/api/events/?search=budget")
+    await budget.check(client, 2, "GET", "/api/events/featured")
+    await budget.check(client, 2, "GET", "/api/events/my-events", headers=organizer)
+    await budget.check(client, 1, "GET", f"/api/events/{event_id}")
+    await budget.check(client, 1, "GET", "/api/bookings/my-bookings", headers=attendee)
+    await budget.check(client, 1, "GET", f"/api/bookings/{bookings[0]}", headers=attendee)
+    await budget.check(client, 5, "POST", f"/api/bookings/check-in/{bookings[0]}", headers=admin)
+    await budget.check(client, 5, "POST", "/api/bookings/check-in/batch", headers=admin, json={
+        "event_id": event_id, "booking_ids": bookings[1:],
+    })
+    await budget.check(client, 3, "GET", f"/api/bookings/check-in/manifest/{event_id}", headers=admin)
+    await budget.check(client, 2, "GET", f"/api/analytics/events/{event_id}", headers=admin)
+    await budget.check(client, 1, "GET", "/api/analytics/organizer", headers=organizer)
+
+    # Seat holds: the sale reaches the rollups on confirm, not on the hold
+    settings.BOOKING_HOLD_SECONDS = 600
+    holds = [(await budget.check(client, 6, "POST", "/api/bookings/", headers=attendee, json={
+        "event_id": event_id, "ticket_type_id": event_data["tickets"][0]["id"], "quantity": 1,
+        "attendee_name": "Budget", "attendee_email": "user@eventhive.com",
+    })).json() for _ in range(2)]
+    settings.BOOKING_HOLD_SECONDS = 0
+    await budget.check(client, 3, "POST", f"/api/bookings/holds/{holds[0]['hold_id']}/confirm", headers=attendee)
+    await budget.check(client, 5, "POST", f"/api/bookings/holds/{holds[1]['hold_id']}/release", headers=attendee)
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    budget = QueryBudget(get_async_engine())
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget") as client:
+        await exercise(client, budget)
+
+    seen = set()
+    for endpoint, statements, limit in budget.results:
+        if (endpoint, statements) not in seen:
+            seen.add((endpoint, statements))
+            print(f"{'FAIL' if statements > limit else 'ok  '} {endpoint:<45}{statements:>4} / {limit}")
+    violations = budget.violations()
+    print(f"{get_async_engine().dialect.name}: {len(budget.results)} requests, {len(violations)} over budget")
+    await get_async_engine().dispose()
+    return 1 if violations else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,127 @@
+"""Event search benchmark: leading-wildcard ILIKE vs the full-text search backend.
+
+Migrates a database, bulk-loads synthetic events (the search index is kept
+up to date while loading) and times the same searches through both paths.
+
+    python -m benchmarks.search_events --events 1000000
+    python -m benchmarks.search_events --database-url postgresql://... --events 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import string
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/search.db"
+os.environ["DATABASE_URL"] = args.database_url
+
+from sqlalchemy import create_engine, insert, select, or_
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.core.database import get_async_url
+from app.core.migrations import upgrade_database
+from app.models.models import Event, EventStatus
+from app.services.search import search_subquery
+
+TOPICS = ["python", "jazz", "marathon", "hackathon", "startup", "photography", "yoga", "robotics",
+          "comedy", "cricket", "design", "blockchain", "poetry", "cooking", "astronomy", "chess"]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Pune", "Chennai", "Kolkata", "Hyderabad", "Jaipur"]
+
+def random_word(rng):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+
+def load(engine, rng):
+    vocabulary = [random_word(rng) for _ in range(20000)]
+    now = datetime.now()
+    batch = []
+    with engine.begin() as conn:
+        for i in range(args.events):
+            topic = rng.choice(TOPICS)
+            batch.append({
+                "organizer_id": 1,
+                "category_id": 1,
+                "title": f"{topic.title()} {' '.join(rng.choices(vocabulary, k=3))}",
+                "description": " ".join(rng.choices(vocabulary, k=20) + [topic]),
+                "location": rng.choice(CITIES),
+                "start_date": now + timedelta(days=rng.randint(1, 365)),
+                "end_date": now + timedelta(days=rng.randint(366, 400)),
+                "status": EventStatus.PUBLISHED,
+                "featured": False,
+                "created_at": now - timedelta(seconds=i),
+            })
+            if len(batch) == 50000:
+                conn.execute(insert(Event), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Event), batch)
+    return vocabulary
+
+async def timed(fn):
+    samples = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        rows = await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000, len(rows)
+
+async def main():
+    rng = random.Random(args.seed)
+    upgrade_database(args.database_url)
+    engine = create_engine(args.database_url)
+
+    start = time.perf_counter()
+    vocabulary = load(engine, rng)
+    loaded = time.perf_counter() - start
+    print(f"database: {engine.dialect.name}, events: {args.events}, load + index: {loaded:.1f}s")
+
+    rare = rng.choice(vocabulary)
+    searches = [
+        ("common word", "python"),
+        ("rare word", rare),
+        ("prefix", "robot"),
+        ("two words", "jazz " + rare),
+        ("typo", "marathn"),
+    ]
+
+    async_engine = create_async_engine(get_async_url(args.database_url))
+    Session = async_sessionmaker(async_engine)
+    print(f"{'query':<14}{'term':<22}{'ILIKE':>14}{'full-text':>16}")
+    async with Session() as db:
+        for label, term in searches:
+            async def ilike():
+                result = await db.execute(
+                    select(Event.id).filter(Event.status == EventStatus.PUBLISHED).filter(or_(
+                        Event.title.ilike(f"%{term}%"), Event.description.ilike(f"%{term}%")
+                    )).order_by(Event.created_at.desc()).limit(20)
+                )
+                return result.all()
+
+            async def fulltext():
+                matches = await search_subquery(db, search=term)
+                result = await db.execute(
+                    select(Event.id).join(matches, matches.c.id == Event.id)
+                    .filter(Event.status == EventStatus.PUBLISHED)
+                    .order_by(matches.c.rank.desc(), Event.created_at.desc()).limit(20)
+                )
+                return result.all()
+
+            ilike_ms, ilike_rows = await timed(ilike)
+            fts_ms, fts_rows = await timed(fulltext)
+            print(f"{label:<14}{term:<22}{ilike_ms:>9.1f}ms ({ilike_rows:>2}){fts_ms:>11.1f}ms ({fts_rows:>2})")
+    await async_engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Worker startup benchmark.
+
+Measures, in fresh interpreters, how long `import app.api.main` takes and how
+long a uvicorn worker takes from spawn to answering its first request.
+
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --database-url postgresql://... --redis-url redis://...
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--redis-url", default="", help="empty runs without Redis")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/events/", help="first request to time")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args()
+
+def child_env(args):
+    env = dict(os.environ, DATABASE_URL=args.database_url, REDIS_URL=args.redis_url)
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def time_import(env):
+    code = "import time; t = time.perf_counter(); import app.api.main; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_first_request(env, path, timeout):
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.api.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise SystemExit(f"uvicorn exited with {server.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=timeout) as response:
+                    response.read()
+                    return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise SystemExit(f"no response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def main():
+    args = parse_args()
+    if not args.database_url:
+        args.database_url = f"sqlite:///{tempfile.mkdtemp()}/startup.db"
+    env = child_env(args)
+    subprocess.run([sys.executable, os.path.join(BACKEND_DIR, "manage.py"), "migrate"], env=env,
+                   check=True, capture_output=True)
+    subprocess.run([sys.executable, os.path.join(BACKEND_DIR, "manage.py"), "seed"], env=env,
+                   check=True, capture_output=True)
+
+    imports = [time_import(env) for _ in range(args.runs)]
+    first_requests = [time_first_request(env, args.path, args.timeout) for _ in range(args.runs)]
+    results = {
+        "runs": args.runs,
+        "import_ms": {"median": statistics.median(imports) * 1000, "min": min(imports) * 1000},
+        "first_request_ms": {"median": statistics.median(first_requests) * 1000,
+                             "min": min(first_requests) * 1000},
+    }
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"import app.api.main: median {results['import_ms']['median']:.0f}ms, "
+              f"min {results['import_ms']['min']:.0f}ms")
+        print(f"spawn -> first {args.path}: median {results['first_request_ms']['median']:.0f}ms, "
+              f"min {results['first_request_ms']['min']:.0f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Flash-sale load test: a burst of buyers booking the same event at once,
+first straight into POST /api/bookings/, then through the event's waiting
+room (join, poll, book with the admission token).
+
+Runs the real app in-process and reports booking endpoint latency for both
+runs; with the waiting room it should stay flat however large the burst.
+
+    python -m benchmarks.waiting_room --buyers 500 --rate 50
+    python -m benchmarks.waiting_room --database-url postgresql://... --redis-url redis://...
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=None, help="defaults to a throwaway SQLite file")
+    parser.add_argument("--redis-url", default="", help="empty uses the in-process queue")
+    parser.add_argument("--buyers", type=int, default=500, help="buyers arriving at once")
+    parser.add_argument("--rate", type=int, default=50, help="waiting room admissions per second")
+    return parser.parse_args()
+
+args = parse_args()
+if not args.database_url:
+    args.database_url = f"sqlite:///{tempfile.mkdtemp()}/waiting_room.db"
+os.environ["DATABASE_URL"] = args.database_url
+os.environ["REDIS_URL"] = args.redis_url
+
+import httpx
+from sqlalchemy import insert, select
+from app.api.main import app
+from app.core.database import get_session_local
+from app.core.migrations import upgrade_database
+from app.core.redis import connect_redis
+from app.core.security import create_access_token
+from app.models.models import User, UserRole
+from seed import create_seed_data
+
+def create_buyers():
+    # Buyers are inserted directly and given minted tokens: logging in 500
+    # users through bcrypt would dominate the run
+    tag = int(time.time())
+    with get_session_local()() as db:
+        db.execute(insert(User), [{
+            "email": f"buyer{tag}-{i}@bench.eventhive.com", "password_hash": "!", "full_name": f"Buyer {i}",
+            "role": UserRole.ATTENDEE, "is_active": True,
+        } for i in range(args.buyers)])
+        db.commit()
+        ids = db.execute(select(User.id).filter(User.email.like(f"buyer{tag}-%"))).scalars().all()
+    return [{"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"} for user_id in ids]
+
+async def create_event(client, organizer, title, rate=None):
+    response = await client.post("/api/events/", headers=organizer, json={
+        "title": title, "location": "Bench", "category_id": 1,
+        "start_date": "2030-01-01T10:00:00", "end_date": "2030-01-01T18:00:00",
+        "tickets": [{"name": "GA", "price": 50, "max_quantity": args.buyers}],
+    })
+    response.raise_for_status()
+    created = response.json()
+    (await client.put(f"/api/events/{created['id']}/publish", headers=organizer)).raise_for_status()
+    if rate:
+        (await client.put(f"/api/events/{created['id']}/waiting-room", headers=organizer,
+                          json={"enabled": True, "admit_rate": rate})).raise_for_status()
+    return created["id"], created["tickets"][0]["id"]
+
+async def book(client, headers, event_id, ticket_id, latencies):
+    start = time.perf_counter()
+    response = await client.post("/api/bookings/", headers=headers, json={
+        "event_id": event_id, "ticket_type_id": ticket_id, "quantity": 1,
+        "attendee_name": "Bench", "attendee_email": "bench@eventhive.com",
+    })
+    latencies.append(time.perf_counter() - start)
+    response.raise_for_status()
+
+async def queue_then_book(client, headers, event_id, ticket_id, latencies, polls):
+    while True:
+        start = time.perf_counter()
+        response = await client.post(f"/api/events/{event_id}/queue", headers=headers)
+        polls.append(time.perf_counter() - start)
+        response.raise_for_status()
+        status = response.json()
+        if status["admitted"]:
+            break
+        # Poll no faster than the buyer's share of the admit rate
+        await asyncio.sleep(min(status["position"] / args.rate, status["retry_after"]))
+    await book(client, {**headers, "X-Admission-Token": status["admission_token"]}, event_id, ticket_id, latencies)
+
+def percentiles(latencies):
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+    return statistics.median(latencies) * 1000, pick(0.95), pick(0.99)
+
+async def main():
+    upgrade_database()
+    create_seed_data()
+    buyers = create_buyers()
+    app.state.redis = await connect_redis()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        response = await client.post("/api/auth/login",
+                                     json={"email": "organizer@eventhive.com", "password": "organizer123"})
+        organizer = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        rows = []
+        event_id, ticket_id = await create_event(client, organizer, "Flash Sale (direct)")
+        direct = []
+        start = time.perf_counter()
+        await asyncio.gather(*(book(client, headers, event_id, ticket_id, direct) for headers in buyers))
+        rows.append(("direct", direct, time.perf_counter() - start))
+
+        event_id, ticket_id = await create_event(client, organizer, "Flash Sale (waiting room)", args.rate)
+        queued, polls = [], []
+        start = time.perf_counter()
+        await asyncio.gather(*(queue_then_book(client, headers, event_id, ticket_id, queued, polls)
+                               for headers in buyers))
+        rows.append((f"waiting room @{args.rate}/s", queued, time.perf_counter() - start))
+
+    print(f"buyers: {args.buyers}, queue backend: {'redis' if app.state.redis else 'in-process'}")
+    print(f"{'POST /api/bookings/':<28}{'p50':>10}{'p95':>10}{'p99':>10}{'total':>10}")
+    for label, latencies, elapsed in rows:
+        p50, p95, p99 = percentiles(latencies)
+        print(f"{label:<28}{p50:>8.1f}ms{p95:>8.1f}ms{p99:>8.1f}ms{elapsed:>9.1f}s")
+    p50, p95, p99 = percentiles(polls)
+    print(f"queue polls: {len(polls)}, p50 {p50:.1f}ms, p95 {p95:.1f}ms, p99 {p99:.1f}ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
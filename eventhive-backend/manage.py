@@ -0,0 +1,82 @@
+"""EventHive management commands.
+
+Run once per deploy (not per worker) before starting the API:
+
+    python manage.py migrate            # apply database migrations
+    python manage.py seed               # load demo categories, users and events
+
+Maintenance:
+
+    python manage.py rebuild-analytics  # recompute sales rollups from bookings
+
+Data:
+
+    python manage.py import-events events.csv --organizer organizer@eventhive.com
+"""
+import argparse
+import asyncio
+import json
+
+def migrate(args):
+    from app.core.migrations import upgrade_database
+    upgrade_database(revision=args.revision)
+
+def seed(args):
+    from seed import create_seed_data
+    create_seed_data()
+
+def rebuild_analytics(args):
+    from app.core.database import get_session_local
+    from app.services.analytics import rebuild_analytics as rebuild
+    with get_session_local()() as db:
+        ticket_rows, hour_rows = rebuild(db, args.event_id)
+    print(f"Rebuilt analytics: {ticket_rows} ticket type rows, {hour_rows} hourly rows")
+
+def import_events(args):
+    from sqlalchemy import select
+    from app.core.database import get_async_session_local, dispose_engines
+    from app.models.models import User
+    from app.services.event_import import import_events as run_import, parse_csv, parse_json
+
+    with open(args.file, encoding="utf-8-sig") as f:
+        rows = parse_csv(f.read()) if args.file.lower().endswith(".csv") else parse_json(json.load(f))
+
+    async def run():
+        async with get_async_session_local()() as db:
+            organizer_id = (await db.execute(select(User.id).filter(User.email == args.organizer))).scalar()
+            if organizer_id is None:
+                raise SystemExit(f"No user with email {args.organizer}")
+            result = await run_import(db, organizer_id, rows)
+        await dispose_engines()
+        return result
+
+    result = asyncio.run(run())
+    for error in result["errors"]:
+        print(f"Row {error['row']}: {'; '.join(error['errors'])}")
+    print(f"Imported {result['created']} events, {result['failed']} rows failed")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="apply database migrations")
+    migrate_parser.add_argument("--revision", default="head")
+    migrate_parser.set_defaults(func=migrate)
+
+    seed_parser = commands.add_parser("seed", help="load demo data")
+    seed_parser.set_defaults(func=seed)
+
+    rebuild_parser = commands.add_parser("rebuild-analytics", help="recompute sales rollups from bookings")
+    rebuild_parser.add_argument("--event-id", type=int, default=None, help="only this event")
+    rebuild_parser.set_defaults(func=rebuild_analytics)
+
+    import_parser = commands.add_parser("import-events", help="bulk create events from a JSON or CSV file")
+    import_parser.add_argument("file", help="*.csv, otherwise JSON")
+    import_parser.add_argument("--organizer", required=True, help="email of the organizing user")
+    import_parser.set_defaults(func=import_events)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine, pool
+from app.core.database import Base, get_database_url
+import app.models.models  # noqa: F401  (registers tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+# Search objects created by raw SQL in 0002 rather than from the models;
+# autogenerate would otherwise propose dropping them
+EXTERNAL_INDEXES = {"ix_events_search_document", "ix_events_title_trgm", "ix_events_location_trgm"}
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith("events_fts"):
+        return False
+    if type_ == "index" and name in EXTERNAL_INDEXES:
+        return False
+    return True
+
+def get_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or get_database_url()
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_object=include_object,
+        render_as_batch=get_url().startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online() -> None:
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,125 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum("ADMIN", "ORGANIZER", "ATTENDEE", name="userrole")
+event_status = sa.Enum("DRAFT", "PUBLISHED", "CANCELLED", name="eventstatus")
+
+
+def upgrade() -> None:
+    # Databases created by the old Base.metadata.create_all at boot already have
+    # these tables; adopt them as-is and let later revisions add the rest.
+    if sa.inspect(op.get_bind()).has_table("events"):
+        return
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(255), nullable=False),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("role", user_role),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("loyalty_points", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "categories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("description", sa.Text()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_categories_id", "categories", ["id"])
+
+    op.create_table(
+        "events",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("organizer_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("categories.id"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("location", sa.String(255), nullable=False),
+        sa.Column("start_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("max_attendees", sa.Integer()),
+        sa.Column("status", event_status),
+        sa.Column("featured", sa.Boolean()),
+        sa.Column("image_url", sa.String(500)),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_events_id", "events", ["id"])
+    op.create_index("ix_events_title", "events", ["title"])
+
+    op.create_table(
+        "ticket_types",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("price", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("max_quantity", sa.Integer(), nullable=False),
+        sa.Column("sold_quantity", sa.Integer()),
+        sa.Column("sale_start", sa.DateTime(timezone=True)),
+        sa.Column("sale_end", sa.DateTime(timezone=True)),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_ticket_types_id", "ticket_types", ["id"])
+
+    op.create_table(
+        "bookings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("booking_id", sa.String(50), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=False),
+        sa.Column("ticket_type_id", sa.Integer(), sa.ForeignKey("ticket_types.id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("total_amount", sa.DECIMAL(10, 2), nullable=False),
+        sa.Column("attendee_name", sa.String(255), nullable=False),
+        sa.Column("attendee_email", sa.String(255), nullable=False),
+        sa.Column("attendee_phone", sa.String(20)),
+        sa.Column("payment_status", sa.String(50)),
+        sa.Column("booking_status", sa.String(50)),
+        sa.Column("qr_code", sa.Text()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_bookings_id", "bookings", ["id"])
+    op.create_index("ix_bookings_booking_id", "bookings", ["booking_id"], unique=True)
+
+    op.create_table(
+        "promo_codes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id")),
+        sa.Column("code", sa.String(50), nullable=False, unique=True),
+        sa.Column("discount_percent", sa.Integer()),
+        sa.Column("discount_amount", sa.DECIMAL(10, 2)),
+        sa.Column("max_uses", sa.Integer()),
+        sa.Column("used_count", sa.Integer()),
+        sa.Column("valid_until", sa.DateTime(timezone=True)),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_promo_codes_id", "promo_codes", ["id"])
+
+
+def downgrade() -> None:
+    for table in ["promo_codes", "bookings", "ticket_types", "events", "categories", "users"]:
+        op.drop_table(table)
+    if op.get_bind().dialect.name == "postgresql":
+        event_status.drop(op.get_bind(), checkfirst=True)
+        user_role.drop(op.get_bind(), checkfirst=True)
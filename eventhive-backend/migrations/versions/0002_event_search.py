@@ -0,0 +1,90 @@
+"""event full-text search
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# SQLite: an external-content FTS5 index over events, kept in sync by triggers,
+# plus a vocabulary view used for typo correction.
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, description, location,
+        content='events', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts_vocab USING fts5vocab(events_fts, 'row')",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF title, description, location ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, title, description, location)
+        VALUES ('delete', old.id, old.title, old.description, old.location);
+        INSERT INTO events_fts(rowid, title, description, location)
+        VALUES (new.id, new.title, new.description, new.location);
+    END""",
+    "INSERT INTO events_fts(events_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS events_fts_au",
+    "DROP TRIGGER IF EXISTS events_fts_ad",
+    "DROP TRIGGER IF EXISTS events_fts_ai",
+    "DROP TABLE IF EXISTS events_fts_vocab",
+    "DROP TABLE IF EXISTS events_fts",
+]
+
+# PostgreSQL: a GIN index on the weighted tsvector expression, and trigram
+# indexes for typo-tolerant title matches and location ILIKE. An expression
+# index rather than a stored generated column: adding that column rewrites
+# events under an ACCESS EXCLUSIVE lock, while these all build CONCURRENTLY.
+# The expression must match SEARCH_DOCUMENT in app/services/search.py for the
+# planner to use the index.
+POSTGRES_UPGRADE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+]
+
+POSTGRES_INDEXES = [
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_search_document ON events USING GIN ((
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')
+    ))""",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_title_trgm ON events USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_location_trgm ON events USING GIN (location gin_trgm_ops)",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        for statement in POSTGRES_UPGRADE:
+            op.execute(statement)
+        # CONCURRENTLY keeps events writable during the build but cannot run
+        # inside a transaction.
+        with op.get_context().autocommit_block():
+            for statement in POSTGRES_INDEXES:
+                op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            for name in ["ix_events_location_trgm", "ix_events_title_trgm", "ix_events_search_document"]:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
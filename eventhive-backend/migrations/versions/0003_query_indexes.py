@@ -0,0 +1,40 @@
+"""composite indexes for the hot query filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # Event lists: published (optionally featured) and organizer dashboards,
+    # newest first with id as the keyset tie-breaker
+    ("ix_events_status_created_at", "events", ["status", "created_at", "id"]),
+    ("ix_events_status_featured_created_at", "events", ["status", "featured", "created_at", "id"]),
+    ("ix_events_organizer_created_at", "events", ["organizer_id", "created_at", "id"]),
+    # My bookings, and per-event attendee lookups
+    ("ix_bookings_user_created_at", "bookings", ["user_id", "created_at", "id"]),
+    ("ix_bookings_event_id", "bookings", ["event_id"]),
+    # Ticket types of an event; promo code lookups
+    ("ix_ticket_types_event_active", "ticket_types", ["event_id", "is_active"]),
+    ("ix_promo_codes_code_active", "promo_codes", ["code", "is_active"]),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently on Postgres so bookings and events stay writable; each
+    # CREATE INDEX CONCURRENTLY has to run outside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
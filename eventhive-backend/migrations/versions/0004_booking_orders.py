@@ -0,0 +1,26 @@
+"""group bookings into multi-item orders
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("order_id", sa.String(50)))
+    with op.get_context().autocommit_block():
+        op.create_index("ix_bookings_order_id", "bookings", ["order_id"],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_order_id", table_name="bookings", if_exists=True, postgresql_concurrently=True)
+    op.drop_column("bookings", "order_id")
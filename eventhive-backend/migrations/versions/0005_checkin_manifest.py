@@ -0,0 +1,29 @@
+"""versioned check-in manifests
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("checkin_seq", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("bookings", sa.Column("checkin_version", sa.Integer(), nullable=False, server_default="0"))
+    with op.get_context().autocommit_block():
+        op.create_index("ix_bookings_event_checkin_version", "bookings", ["event_id", "checkin_version"],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_event_checkin_version", table_name="bookings",
+                      if_exists=True, postgresql_concurrently=True)
+    op.drop_column("bookings", "checkin_version")
+    op.drop_column("events", "checkin_seq")
@@ -0,0 +1,24 @@
+"""index promo codes by event for the active-code cache
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_promo_codes_event_active", "promo_codes", ["event_id", "is_active"],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_promo_codes_event_active", table_name="promo_codes",
+                      if_exists=True, postgresql_concurrently=True)
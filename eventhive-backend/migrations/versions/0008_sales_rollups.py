@@ -0,0 +1,42 @@
+"""sales rollup tables for organizer analytics
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+Populate existing data with `python manage.py rebuild-analytics`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticket_type_sales",
+        sa.Column("ticket_type_id", sa.Integer(), sa.ForeignKey("ticket_types.id"), primary_key=True),
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), nullable=False),
+        sa.Column("bookings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.DECIMAL(14, 2), nullable=False, server_default="0"),
+        sa.Column("checked_in", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_ticket_type_sales_event_id", "ticket_type_sales", ["event_id"])
+    op.create_table(
+        "hourly_sales",
+        sa.Column("event_id", sa.Integer(), sa.ForeignKey("events.id"), primary_key=True),
+        sa.Column("hour", sa.DateTime(timezone=True), primary_key=True),
+        sa.Column("bookings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.DECIMAL(14, 2), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("hourly_sales")
+    op.drop_index("ix_ticket_type_sales_event_id", table_name="ticket_type_sales")
+    op.drop_table("ticket_type_sales")
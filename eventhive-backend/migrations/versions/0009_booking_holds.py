@@ -0,0 +1,31 @@
+"""seat holds: booking hold expiry and the promo code a booking redeemed
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("bookings", sa.Column("hold_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("bookings", sa.Column("promo_code_id", sa.Integer(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index("ix_bookings_hold_expires_at", "bookings", ["hold_expires_at"],
+                        postgresql_where=sa.text("hold_expires_at IS NOT NULL"),
+                        sqlite_where=sa.text("hold_expires_at IS NOT NULL"),
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_bookings_hold_expires_at", table_name="bookings", if_exists=True,
+                      postgresql_concurrently=True)
+    op.drop_column("bookings", "promo_code_id")
+    op.drop_column("bookings", "hold_expires_at")
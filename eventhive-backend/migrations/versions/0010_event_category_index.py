@@ -0,0 +1,25 @@
+"""index published events by category for the category filter
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_events_status_category_created_at", "events",
+                        ["status", "category_id", "created_at", "id"],
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_events_status_category_created_at", table_name="events",
+                      if_exists=True, postgresql_concurrently=True)
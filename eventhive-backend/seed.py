@@ -1,14 +1,11 @@
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal, Base, engine
+from app.core.database import get_session_local
 from app.models.models import User, Category, Event, TicketType, UserRole, EventStatus
 from app.core.security import get_password_hash
 from datetime import datetime, timedelta
 
 def create_seed_data():
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    
-    db = SessionLocal()
+    db = get_session_local()()
     try:
         # Create categories
         categories = [
@@ -9,6 +9,12 @@ import { UserAvatar } from "@/components/user/user-avatar"
 import { AlertBanner } from "@/components/common/alert-banner"
 import { meReq, myBookingsReq, myEventsReq } from "@/lib/api"
 
+// Lists come one page at a time; with more pages left, show the count as "N+"
+function countLabel(page: any): string {
+  const count = Array.isArray(page?.items) ? page.items.length : 0
+  return page?.next_cursor ? `${count}+` : String(count)
+}
+
 type Me = {
   full_name: string
   email: string
@@ -19,8 +25,8 @@ type Me = {
 
 export default function ProfilePage() {
   const [me, setMe] = useState<Me | null>(null)
-  const [bookings, setBookings] = useState<number>(0)
-  const [events, setEvents] = useState<number>(0)
+  const [bookings, setBookings] = useState<string>("0")
+  const [events, setEvents] = useState<string>("0")
   const [error, setError] = useState<string | null>(null)
   const [isLoading, setIsLoading] = useState(true)
 
@@ -38,8 +44,8 @@ export default function ProfilePage() {
           role: meData.role,
           loyalty_points: meData.loyalty_points,
         })
-        setBookings(Array.isArray(bookingsData) ? bookingsData.length : 0)
-        setEvents(Array.isArray(eventsData) ? eventsData.length : 0)
+        setBookings(countLabel(bookingsData))
+        setEvents(countLabel(eventsData))
         setError(null)
       } catch (err: any) {
         if (cancelled) return
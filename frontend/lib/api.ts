@@ -89,10 +89,21 @@ export async function meReq() {
   }>("/api/auth/me")
 }
 
-export async function myBookingsReq() {
-  return apiFetch<any[]>("/api/bookings/my-bookings")
+export type Page<T> = {
+  items: T[]
+  next_cursor: string | null
 }
 
-export async function myEventsReq() {
-  return apiFetch<any[]>("/api/events/my-events")
+function withCursor(path: string, cursor?: string | null, limit = 100) {
+  const params = new URLSearchParams({ limit: String(limit) })
+  if (cursor) params.set("cursor", cursor)
+  return `${path}?${params.toString()}`
+}
+
+export async function myBookingsReq(cursor?: string | null) {
+  return apiFetch<Page<any>>(withCursor("/api/bookings/my-bookings", cursor))
+}
+
+export async function myEventsReq(cursor?: string | null) {
+  return apiFetch<Page<any>>(withCursor("/api/events/my-events", cursor))
 }